@@ -11,6 +11,22 @@ class Settings(BaseSettings):
     mongodb_url: str = "mongodb://localhost:27017"
     database_name: str = "news_analyzer_db"
     
+    # MongoDB Connection Pool (per worker process)
+    mongo_max_pool_size: int = 20
+    mongo_min_pool_size: int = 2  # Kept warm so the first requests after idle skip the handshake
+    mongo_max_idle_time_ms: int = 60000
+    mongo_wait_queue_timeout_ms: int = 5000  # Fail fast instead of queueing forever when the pool is exhausted
+    
+    # Startup
+    index_build_mode: str = "background"  # "background", "blocking" (reconcile before serving) or "off"
+    ready_timeout_seconds: float = 2.0  # MongoDB ping timeout for /ready
+    warmup_enabled: bool = True  # Prime pool, caches and serializers in the background after boot
+    
+    # Keep-Alive (self-ping through the public URL, e.g. on Render's free tier)
+    keep_alive_url: Optional[str] = None  # Disabled when unset
+    keep_alive_interval_seconds: float = 840  # Render sleeps after 15 minutes without inbound traffic
+    keep_alive_jitter_seconds: float = 60
+    
     # JWT
     secret_key: str = "your-super-secret-key-change-in-production-min-32-chars"
     algorithm: str = "HS256"
@@ -20,6 +36,7 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
     debug: bool = True
+    workers: int = 1  # Worker processes when running without --reload (see gunicorn.conf.py)
     
     # CORS
     frontend_url: str = "http://localhost:5173"
@@ -39,6 +56,92 @@ class Settings(BaseSettings):
     smtp_from_email: str = "noreply@replaceable.ai"
     smtp_from_name: str = "Replaceable.ai Reports"
     
+    # Bulk Import
+    import_batch_size: int = 500
+    import_max_record_bytes: int = 5242880  # 5MB per record
+    import_max_failures: int = 500  # Failures listed in the import report
+    
+    # Live Updates (Server-Sent Events)
+    sse_use_change_streams: bool = True  # Falls back to in-process events if unsupported
+    sse_client_queue_size: int = 100  # Pending events per client before it is dropped
+    sse_heartbeat_seconds: float = 15.0
+    sse_retry_ms: int = 5000  # Client reconnect delay sent in the stream
+    sse_batch_collapse_threshold: int = 20  # Larger batches (imports) are sent as one message per collection
+    
+    # Response Cache (public landing/featured/stats endpoints)
+    response_cache_ttl_seconds: float = 60.0  # 0 disables caching
+    
+    # Document Cache (get-by-id reads of news, reports and cards)
+    document_cache_ttl_seconds: float = 300.0  # 0 disables caching
+    document_cache_stale_seconds: float = 30.0  # Served while a background refresh runs after the TTL
+    document_cache_max_bytes: int = 33554432  # 32MB of BSON per worker, least recently used evicted first
+    
+    # Cache Invalidation Bus (keeps per-worker caches coherent across workers and instances)
+    cache_bus_enabled: bool = True
+    cache_bus_size_bytes: int = 1048576  # Capped collection size; the oldest messages are overwritten
+    
+    # Published Content Snapshot (file shared by all workers; fallback while MongoDB is unreachable)
+    snapshot_enabled: bool = True
+    snapshot_path: str = "snapshots/public_catalog.bin"
+    snapshot_rebuild_delay_seconds: float = 30.0  # Coalesce changes before rewriting the file (it is an outage fallback)
+    
+    # CDN (Surrogate-Key tagging of public reads and tag purges, see services/cdn.py)
+    cdn_s_maxage_seconds: int = 300  # Shared-cache lifetime of anonymous reads; 0 disables CDN headers
+    cdn_stale_while_revalidate_seconds: int = 60
+    cdn_purge_url: Optional[str] = None  # Batch purge endpoint; purges are only logged when unset
+    cdn_purge_token: Optional[str] = None
+    cdn_purge_token_header: str = "Fastly-Key"
+    cdn_purge_batch_size: int = 256  # Keys per purge call
+    cdn_purge_max_retries: int = 3  # With exponential backoff from 1s
+    cdn_purge_delay_ms: int = 100  # Collect a burst of writes into one purge
+    
+    # Delta Sync (GET /api/sync)
+    sync_tombstone_retention_days: int = 30  # Deletions are kept this long; older tokens get 410
+    sync_settle_seconds: float = 2.0  # Changes newer than this wait for the next call
+    
+    # Scheduled Publishing
+    scheduler_enabled: bool = True
+    scheduler_resync_seconds: int = 60  # Reload jobs scheduled by other workers
+    scheduler_coalesce_ms: int = 250  # Fire jobs due within this window together
+    scheduler_retry_seconds: int = 5  # Backoff before retrying jobs whose publish failed
+    
+    # Rate Limiting (auth, OTP, subscriptions and search; policies in services/rate_limit.py)
+    rate_limit_enabled: bool = True
+    rate_limit_store: str = "memory"  # "memory" (per worker) or "mongo" (shared between workers)
+    rate_limit_trust_forwarded: bool = False  # Key clients by X-Forwarded-For (only behind a trusted proxy)
+    
+    # Query Guardrails
+    query_max_time_ms: int = 5000  # Time budget for MongoDB work per API request (sent as maxTimeMS); 0 disables
+    query_max_pattern_length: int = 100  # Longest accepted search/filter text
+    max_ids_per_request: int = 100  # IDs accepted by the /by-ids endpoints
+    slow_query_ms: int = 500  # Log commands slower than this; 0 disables
+    slow_query_explain: bool = True  # Attach an explain (queryPlanner) summary per filter shape
+    slow_query_log_size: int = 200  # Recent entries kept for /api/diagnostics/slow-queries
+    
+    # Related Content
+    related_top_k: int = 10  # Neighbours stored per item for each content kind
+    related_max_feature_df: float = 0.2  # Features on a larger share of items only generate candidates as a fallback
+    related_max_candidates_per_feature: int = 500  # Most recent items taken from each feature's posting list
+    related_model_reload_seconds: int = 3600  # Full reload of each worker's resident model
+    
+    # Request Batching (POST /api/batch)
+    batch_max_requests: int = 20  # Sub-requests per batch
+    batch_max_response_bytes: int = 2097152  # 2MB of sub-response bodies per batch
+    
+    # Public Read Model (published-only public_feed collection, see services/public_feed.py)
+    public_feed_reads: bool = True  # Serve public list endpoints from the feed
+    public_feed_rebuild_lease_seconds: int = 600  # A worker's claim on rebuilding an unbuilt feed
+    public_feed_state_ttl_seconds: float = 1.0  # How long a worker trusts a feed's cached built/dirty state
+    
+    # Read Serialization
+    raw_json_reads: bool = False  # Skip response validation for public reads; fetch only response fields
+    
+    # Metrics (Prometheus text format on /metrics)
+    metrics_enabled: bool = True
+    metrics_trace_mongo: bool = True  # Time every MongoDB command by collection
+    metrics_dir: Optional[str] = None  # Shared by worker processes so /metrics covers all of them (set by gunicorn.conf.py)
+    metrics_share_interval_seconds: float = 5.0
+    
     @property
     def admin_domain_list(self) -> list:
         """Get list of allowed admin domains"""
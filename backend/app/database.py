@@ -1,8 +1,10 @@
 """
 MongoDB database connection and initialization
 """
+import asyncio
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import IndexModel, ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError
 from app.config import settings
 
 # MongoDB client instance
@@ -10,15 +12,41 @@ client = None
 database = None
 
 
-async def connect_to_mongo():
-    """Connect to MongoDB and initialize database"""
+async def connect_to_mongo(ensure_indexes: bool = True):
+    """
+    Connect to MongoDB and initialize database
+    
+    Args:
+        ensure_indexes: Reconcile indexes before returning. The API server
+            passes False and reconciles in the background (see main.py).
+    """
     global client, database
+    # Imported here to avoid a circular import via app.services
+    from app.services.metrics import MongoCommandTimer, MongoPoolMonitor
+    from app.services.slow_queries import slow_query_log
+    
+    event_listeners = []
+    if settings.metrics_enabled:
+        event_listeners.append(MongoPoolMonitor(settings.mongo_max_pool_size))
+        if settings.metrics_trace_mongo:
+            event_listeners.append(MongoCommandTimer())
+    if settings.slow_query_ms > 0:
+        event_listeners.append(slow_query_log)
     
-    client = AsyncIOMotorClient(settings.mongodb_url)
+    client = AsyncIOMotorClient(
+        settings.mongodb_url,
+        maxPoolSize=settings.mongo_max_pool_size,
+        minPoolSize=settings.mongo_min_pool_size,
+        maxIdleTimeMS=settings.mongo_max_idle_time_ms,
+        waitQueueTimeoutMS=settings.mongo_wait_queue_timeout_ms,
+        event_listeners=event_listeners
+    )
     database = client[settings.database_name]
+    slow_query_log.attach(database, asyncio.get_running_loop())
     
-    # Create indexes for better performance
-    await create_indexes()
+    # Create missing indexes for better performance
+    if ensure_indexes:
+        await create_indexes()
     
     print(f"✅ Connected to MongoDB: {settings.database_name}")
 
@@ -31,46 +59,96 @@ async def close_mongo_connection():
         print("❌ MongoDB connection closed")
 
 
-async def create_indexes():
-    """Create database indexes for optimal queries"""
-    # Users collection indexes
-    await database.users.create_indexes([
+# Index definitions per collection (reconciled against the server by name)
+INDEX_SPECS = {
+    "users": [
         IndexModel([("email", ASCENDING)], unique=True),
         IndexModel([("username", ASCENDING)], unique=True)
-    ])
-    
-    # News collection indexes
-    await database.news.create_indexes([
+    ],
+    "news": [
         IndexModel([("published_date", DESCENDING)]),
         IndexModel([("status", ASCENDING)]),
         IndexModel([("category", ASCENDING)]),
-        IndexModel([("created_at", DESCENDING)])
-    ])
-    
-    # Reports collection indexes
-    await database.reports.create_indexes([
+        IndexModel([("created_at", DESCENDING)]),
+        IndexModel([("updated_at", ASCENDING), ("_id", ASCENDING)])
+    ],
+    "reports": [
         IndexModel([("published_date", DESCENDING)]),
         IndexModel([("status", ASCENDING)]),
         IndexModel([("tags", ASCENDING)]),
-        IndexModel([("created_at", DESCENDING)])
-    ])
-    
-    # Intelligence Cards collection indexes
-    await database.intelligence_cards.create_indexes([
+        IndexModel([("created_at", DESCENDING)]),
+        IndexModel([("updated_at", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("slug", ASCENDING)], unique=True, sparse=True)
+    ],
+    "intelligence_cards": [
         IndexModel([("published_date", DESCENDING)]),
         IndexModel([("status", ASCENDING)]),
         IndexModel([("tier", ASCENDING)]),
         IndexModel([("company", ASCENDING)]),
         IndexModel([("is_featured", DESCENDING)]),
         IndexModel([("display_order", ASCENDING)]),
-        IndexModel([("created_at", DESCENDING)])
-    ])
-    
-    # Subscriptions collection indexes
-    await database.subscriptions.create_indexes([
+        IndexModel([("created_at", DESCENDING)]),
+        IndexModel([("updated_at", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("slug", ASCENDING)], unique=True, sparse=True)
+    ],
+    # Scheduler lock documents expire on their own
+    "scheduler_locks": [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0)
+    ],
+    # Maintained facet counts (see services/facets.py)
+    "facet_counts": [
+        IndexModel([("collection", ASCENDING), ("given_field", ASCENDING), ("given_value", ASCENDING)]),
+        IndexModel([("collection", ASCENDING), ("count", ASCENDING)])
+    ],
+    # Precomputed related items (see services/related.py)
+    "related_items": [
+        IndexModel([("neighbor_ids", ASCENDING)])
+    ],
+    # Published-only read model (see services/public_feed.py)
+    "public_feed": [
+        IndexModel([("kind", ASCENDING), ("published_date", DESCENDING)]),
+        IndexModel([("kind", ASCENDING), ("category", ASCENDING), ("published_date", DESCENDING)]),
+        IndexModel([("kind", ASCENDING), ("tier", ASCENDING), ("published_date", DESCENDING)]),
+        IndexModel([("kind", ASCENDING), ("tags", ASCENDING), ("published_date", DESCENDING)])
+    ],
+    # Deletions for delta sync (see services/sync.py), expiring after retention
+    "sync_tombstones": [
+        IndexModel([("updated_at", ASCENDING), ("kind", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0)
+    ],
+    # Shared rate limit buckets expire once they would have refilled
+    "rate_limits": [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0)
+    ],
+    "subscriptions": [
         IndexModel([("email", ASCENDING)], unique=True),
         IndexModel([("created_at", DESCENDING)])
-    ])
+    ]
+}
+
+
+async def create_indexes() -> int:
+    """
+    Create any missing indexes from INDEX_SPECS
+
+    Existing indexes are listed first and only missing ones (by name) are
+    created, so a warm database costs one round-trip per collection and no
+    index builds. Returns the number of indexes created.
+    """
+    created = 0
+    for collection_name, indexes in INDEX_SPECS.items():
+        collection = database[collection_name]
+        existing = await collection.index_information()
+        missing = [index for index in indexes if index.document["name"] not in existing]
+        if not missing:
+            continue
+        try:
+            await collection.create_indexes(missing)
+            created += len(missing)
+        except PyMongoError as e:
+            # e.g. an index with the same name but different options; keep going
+            print(f"⚠️ Index creation failed for {collection_name}: {str(e)}")
+    return created
 
 
 def get_database():
@@ -1,24 +1,41 @@
 """
 FastAPI Dependencies for authentication and authorization
 """
-from typing import Optional
-from fastapi import Depends, HTTPException, status
+from typing import Optional, Tuple
+import pymongo
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.utils.jwt import verify_token
 from app.services.auth_service import AuthService
 from app.models.user import UserRole
+from app.config import settings
 
 # Security scheme
 security = HTTPBearer()
 
 
+def _batch_user(request: Request, token: str) -> Tuple[bool, Optional[dict]]:
+    """
+    User already resolved for this token by POST /api/batch
+    
+    Returns (True, user) inside a batch sub-request carrying the same token,
+    (False, None) otherwise.
+    """
+    cached = request.scope.get("batch_auth")
+    if cached is not None and cached[0] == token:
+        return True, cached[1]
+    return False, None
+
+
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> dict:
     """
     Dependency to get current authenticated user from JWT token
     
     Args:
+        request: Incoming request (batch sub-requests reuse the batch's user)
         credentials: HTTP Bearer credentials
     
     Returns:
@@ -34,6 +51,12 @@ async def get_current_user(
     )
     
     token = credentials.credentials
+    resolved, user = _batch_user(request, token)
+    if resolved:
+        if user is None:
+            raise credentials_exception
+        return user
+    
     token_data = verify_token(token)
     
     if token_data is None:
@@ -94,6 +117,7 @@ async def get_admin_user(
 
 
 async def get_optional_user(
+    request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(
         HTTPBearer(auto_error=False)
     )
@@ -102,6 +126,7 @@ async def get_optional_user(
     Optional dependency to get current user (for public endpoints with optional auth)
     
     Args:
+        request: Incoming request (batch sub-requests reuse the batch's user)
         credentials: Optional HTTP Bearer credentials
     
     Returns:
@@ -110,6 +135,10 @@ async def get_optional_user(
     if credentials is None:
         return None
     
+    resolved, user = _batch_user(request, credentials.credentials)
+    if resolved:
+        return user
+    
     token_data = verify_token(credentials.credentials)
     
     if token_data is None:
@@ -117,3 +146,18 @@ async def get_optional_user(
     
     user = await AuthService.get_user_by_id(token_data.user_id)
     return user
+
+
+async def query_time_limit():
+    """
+    Dependency bounding all MongoDB work done while handling a request
+    
+    Operations inside the request share a `query_max_time_ms` deadline; the
+    driver sends the remaining time as maxTimeMS with every command and
+    raises a timeout error once it is spent (answered with 503, see main.py).
+    """
+    if settings.query_max_time_ms <= 0:
+        yield
+        return
+    with pymongo.timeout(settings.query_max_time_ms / 1000):
+        yield
@@ -2,21 +2,55 @@
 FastAPI Main Application
 News Analyzer Full Stack Application
 """
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request, status
+
+from app.utils.startup import startup_state  # First, so import time is measured
+from fastapi import Depends, FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from pydantic import ValidationError
+from pymongo.errors import ConnectionFailure, PyMongoError
 import os
+import tempfile
 
 from app.config import settings
-from app.database import connect_to_mongo, close_mongo_connection
+from app.database import connect_to_mongo, close_mongo_connection, create_indexes, get_database
+from app.dependencies import query_time_limit
 from app.services.auth_service import AuthService
+from app.services.cdn import SurrogateKeyMiddleware, cdn_purger
+from app.services.invalidation_bus import invalidation_bus
+from app.services.live_updates import live_updates
+from app.services.scheduler import publish_scheduler
+from app.services.snapshot import snapshot_store
+from app.services.warmup import build_keep_alive, deep_health, warm_up
+from app.services.metrics import MetricsMiddleware, prepare_shared_dir, registry as metrics_registry
 from app.routes import auth_router, news_router, reports_router
 from app.routes.intelligence_cards import router as intelligence_cards_router
 from app.routes.subscriptions import router as subscriptions_router
+from app.routes.imports import router as imports_router
+from app.routes.exports import router as exports_router
+from app.routes.stream import router as stream_router
+from app.routes.diagnostics import router as diagnostics_router
+from app.routes.related import router as related_router
+from app.routes.landing import router as landing_router
+from app.routes.batch import router as batch_router
+from app.routes.sync import router as sync_router
+
+
+async def reconcile_indexes():
+    """Create missing indexes, recording progress for /ready"""
+    startup_state.indexes = "running"
+    try:
+        startup_state.indexes_created = await create_indexes()
+        startup_state.indexes = "ready"
+        if startup_state.indexes_created:
+            print(f"🗂️ Created {startup_state.indexes_created} missing index(es)")
+    except Exception as e:
+        startup_state.indexes = "failed"
+        print(f"⚠️ Index reconciliation failed: {str(e)}")
 
 
 @asynccontextmanager
@@ -26,18 +60,79 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     print("🚀 Starting News Analyzer API...")
-    await connect_to_mongo()
-    await AuthService.seed_admin_user()
+    startup_state.mark_imported()
+    with startup_state.step("mongo_connect"):
+        await connect_to_mongo(ensure_indexes=False)
+    
+    # Index builds no longer block boot unless explicitly requested
+    index_task = None
+    if settings.index_build_mode == "blocking":
+        with startup_state.step("indexes"):
+            await reconcile_indexes()
+    elif settings.index_build_mode == "background":
+        index_task = asyncio.create_task(reconcile_indexes())
+    else:
+        startup_state.indexes = "skipped"
+    
+    with startup_state.step("seed_admin"):
+        await AuthService.seed_admin_user()
     
     # Ensure upload directory exists
     os.makedirs(settings.upload_dir, exist_ok=True)
     os.makedirs(os.path.join(settings.upload_dir, "images"), exist_ok=True)
     os.makedirs(os.path.join(settings.upload_dir, "pdfs"), exist_ok=True)
     
+    # Start live update broadcaster (SSE)
+    live_updates.start()
+    
+    # Share cache invalidations with the other workers
+    invalidation_bus.start()
+    
+    # Keep the shared published-content snapshot current
+    snapshot_store.start()
+    
+    # Purge CDN-cached responses affected by content changes
+    cdn_purger.start()
+    
+    # Start scheduled publishing
+    with startup_state.step("scheduler"):
+        await publish_scheduler.start()
+    
+    startup_state.mark_ready()
+    
+    # Warm pools and caches after we start serving
+    warmup_task = asyncio.create_task(warm_up()) if settings.warmup_enabled else None
+    keep_alive = build_keep_alive()
+    if keep_alive:
+        keep_alive.start()
+    
+    # Share this worker's metrics so any worker can answer /metrics for all
+    metrics_task = None
+    if settings.metrics_enabled and settings.metrics_dir:
+        metrics_task = asyncio.create_task(
+            metrics_registry.share(settings.metrics_dir, settings.metrics_share_interval_seconds)
+        )
+    
     yield
     
     # Shutdown
     print("👋 Shutting down News Analyzer API...")
+    for task in (index_task, warmup_task):
+        if task and not task.done():
+            task.cancel()
+    if keep_alive:
+        await keep_alive.stop()
+    await live_updates.stop()
+    await invalidation_bus.stop()
+    await snapshot_store.stop()
+    await cdn_purger.stop()
+    await publish_scheduler.stop()
+    if metrics_task:
+        metrics_task.cancel()
+        try:
+            await metrics_task
+        except asyncio.CancelledError:
+            pass
     await close_mongo_connection()
 
 
@@ -69,6 +164,9 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Surrogate-Key / Cache-Control headers for CDN caching of public reads (innermost)
+app.add_middleware(SurrogateKeyMiddleware)
+
 # Configure CORS - Allow all origins for production flexibility
 app.add_middleware(
     CORSMiddleware,
@@ -78,9 +176,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files for uploads
-if os.path.exists(settings.upload_dir):
-    app.mount("/uploads", StaticFiles(directory=settings.upload_dir), name="uploads")
+# Request latency / in-flight metrics (outermost, so CORS preflights are counted too)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
+# Mount static files for uploads (the directory is created during startup)
+app.mount("/uploads", StaticFiles(directory=settings.upload_dir, check_dir=False), name="uploads")
 
 # Custom exception handlers
 @app.exception_handler(RequestValidationError)
@@ -126,12 +227,46 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         content={"detail": "Validation error occurred. Please check your input data."}
     )
 
-# Include routers
-app.include_router(auth_router, prefix="/api")
-app.include_router(news_router, prefix="/api")
-app.include_router(reports_router, prefix="/api")
-app.include_router(intelligence_cards_router, prefix="/api")
-app.include_router(subscriptions_router, prefix="/api")
+
+@app.exception_handler(PyMongoError)
+async def mongo_timeout_handler(request: Request, exc: PyMongoError):
+    """
+    Answer queries that ran out of their time budget with 503
+    
+    While MongoDB is unreachable, public reads the published-content
+    snapshot can answer are served from it instead. Other database errors
+    keep propagating as 500s.
+    """
+    if isinstance(exc, ConnectionFailure):
+        fallback = snapshot_store.serve_fallback(request)
+        if fallback is not None:
+            print(f"[SNAPSHOT] Served {request.url.path} from snapshot ({type(exc).__name__})")
+            return fallback
+    if not exc.timeout:
+        raise exc
+    print(f"[QUERY TIMEOUT] {request.method} {request.url.path}: {str(exc)}")
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "The request took too long to process. Try narrowing your search."},
+        headers={"Retry-After": "5"}
+    )
+
+# Include routers (request-bound routes get a MongoDB time budget; imports,
+# exports and the live stream are long-running by design)
+time_limited = [Depends(query_time_limit)]
+app.include_router(auth_router, prefix="/api", dependencies=time_limited)
+app.include_router(news_router, prefix="/api", dependencies=time_limited)
+app.include_router(reports_router, prefix="/api", dependencies=time_limited)
+app.include_router(intelligence_cards_router, prefix="/api", dependencies=time_limited)
+app.include_router(subscriptions_router, prefix="/api", dependencies=time_limited)
+app.include_router(related_router, prefix="/api", dependencies=time_limited)
+app.include_router(landing_router, prefix="/api", dependencies=time_limited)
+app.include_router(batch_router, prefix="/api", dependencies=time_limited)
+app.include_router(sync_router, prefix="/api", dependencies=time_limited)
+app.include_router(diagnostics_router, prefix="/api")
+app.include_router(imports_router, prefix="/api")
+app.include_router(exports_router, prefix="/api")
+app.include_router(stream_router, prefix="/api")
 
 
 @app.get("/", tags=["Root"])
@@ -148,22 +283,92 @@ async def root():
 
 
 @app.get("/health", tags=["Health"])
-async def health_check():
+async def health_check(deep: bool = False):
     """
     Health check endpoint
+    
+    With `deep=1` MongoDB is pinged as well and its latency reported; the
+    response is 503 if the database cannot be reached.
     """
-    return {
+    result = {
         "status": "healthy",
         "service": "news-analyzer-api"
     }
+    if deep:
+        mongo = await deep_health(settings.ready_timeout_seconds)
+        result["mongo"] = mongo
+        if not mongo["ok"]:
+            result["status"] = "degraded"
+            return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=result)
+    return result
+
+
+@app.get("/ready", tags=["Health"])
+async def readiness_check():
+    """
+    Readiness probe: 200 once startup has finished and MongoDB answers a ping
+    
+    Unlike /health (liveness), this fails while the app is booting or the
+    database is unreachable. Startup timings are included in the response.
+    """
+    if not startup_state.ready:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "starting", **startup_state.as_dict()}
+        )
+    
+    try:
+        await asyncio.wait_for(get_database().command("ping"), timeout=settings.ready_timeout_seconds)
+    except Exception:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "unavailable", "detail": "MongoDB is not reachable", **startup_state.as_dict()}
+        )
+    
+    return {"status": "ready", **startup_state.as_dict()}
 
 
-# Run with uvicorn
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+async def metrics():
+    """
+    Prometheus scrape endpoint
+    """
+    if not settings.metrics_enabled:
+        return PlainTextResponse("metrics disabled\n", status_code=404)
+    if settings.metrics_dir:
+        body = await asyncio.to_thread(metrics_registry.render_shared, settings.metrics_dir)
+    else:
+        body = metrics_registry.render()
+    return PlainTextResponse(
+        body,
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+# Run with uvicorn (development: single process with reload; otherwise
+# settings.workers processes on uvloop/httptools - see also gunicorn.conf.py)
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(
-        "app.main:app",
-        host=settings.host,
-        port=settings.port,
-        reload=settings.debug
-    )
+    if settings.debug:
+        uvicorn.run(
+            "app.main:app",
+            host=settings.host,
+            port=settings.port,
+            reload=True
+        )
+    else:
+        if settings.workers > 1:
+            # Worker processes re-read settings, so the shared metrics directory goes through the environment
+            metrics_dir = settings.metrics_dir or os.path.join(tempfile.gettempdir(), "news-analyzer-metrics")
+            os.environ["METRICS_DIR"] = metrics_dir
+            prepare_shared_dir(metrics_dir)
+        uvicorn.run(
+            "app.main:app",
+            host=settings.host,
+            port=settings.port,
+            workers=settings.workers,
+            loop="uvloop",
+            http="httptools",
+            proxy_headers=True,
+            access_log=False
+        )
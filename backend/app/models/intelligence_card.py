@@ -14,6 +14,7 @@ class CardTier(str, Enum):
 
 class CardStatus(str, Enum):
     DRAFT = "draft"
+    SCHEDULED = "scheduled"  # Published automatically at published_date
     PUBLISHED = "published"
 
 
@@ -8,6 +8,7 @@ from enum import Enum
 
 class ReportStatus(str, Enum):
     DRAFT = "draft"
+    SCHEDULED = "scheduled"  # Published automatically at published_date
     PUBLISHED = "published"
 
 
@@ -16,12 +16,18 @@ from app.schemas.user import (
 from app.services.auth_service import AuthService
 from app.services.file_upload import file_upload_service
 from app.services.otp_service import otp_service
+from app.services.rate_limit import rate_limit, rate_limiter
 from app.dependencies import get_current_user, get_admin_user
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/register",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("register"))]
+)
 async def register(user_data: UserCreate):
     """
     Register a new user account
@@ -41,7 +47,7 @@ async def register(user_data: UserCreate):
     return user
 
 
-@router.post("/login", response_model=LoginResponse)
+@router.post("/login", response_model=LoginResponse, dependencies=[Depends(rate_limit("login"))])
 async def login(login_data: LoginRequest):
     """
     Login and get access token
@@ -78,7 +84,12 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
     return current_user
 
 
-@router.post("/admin/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/admin/register",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("register"))]
+)
 async def register_admin(admin_data: AdminCreate):
     """
     Register a new admin account (Self-registration with domain validation)
@@ -106,7 +117,11 @@ async def register_admin(admin_data: AdminCreate):
         )
 
 
-@router.post("/admin/login/request-otp", response_model=OTPRequestResponse)
+@router.post(
+    "/admin/login/request-otp",
+    response_model=OTPRequestResponse,
+    dependencies=[Depends(rate_limit("admin_otp"))]
+)
 async def request_admin_otp(otp_data: OTPRequest):
     """
     Request OTP for admin login
@@ -136,6 +151,9 @@ async def request_admin_otp(otp_data: OTPRequest):
             detail="This endpoint is for admin users only"
         )
     
+    # Cap emails per address too, whichever client asks
+    await rate_limiter.check("admin_otp_email", otp_data.email.lower())
+    
     # Generate and send OTP
     try:
         success = await otp_service.create_and_send_otp(otp_data.email, user)
@@ -159,7 +177,11 @@ async def request_admin_otp(otp_data: OTPRequest):
         )
 
 
-@router.post("/admin/login/verify-otp", response_model=OTPVerifyResponse)
+@router.post(
+    "/admin/login/verify-otp",
+    response_model=OTPVerifyResponse,
+    dependencies=[Depends(rate_limit("verify_otp"))]
+)
 async def verify_admin_otp(verify_data: OTPVerify):
     """
     Verify OTP and complete admin login
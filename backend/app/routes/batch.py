@@ -0,0 +1,56 @@
+"""
+Request batching - several API reads in one HTTP call
+"""
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from app.config import settings
+from app.dependencies import get_optional_user
+from app.schemas.batch import BatchRequest, BatchResponse
+from app.services.batch import run_batch
+from app.utils.serialization import json_bytes_response
+
+router = APIRouter(prefix="/batch", tags=["Batch"])
+
+
+@router.post("", response_model=BatchResponse)
+async def batch_requests(
+    batch: BatchRequest,
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
+    current_user: Optional[dict] = Depends(get_optional_user)
+):
+    """
+    Run up to `batch_max_requests` GET sub-requests concurrently
+
+    Sub-requests go through the same routes, auth and validation as direct
+    calls, using the caller's Authorization header (resolved once for the
+    whole batch). Each response carries its own `status` and `body`, in
+    request order. Bodies share a `batch_max_response_bytes` budget; a
+    sub-request that would exceed it gets status 413.
+    """
+    if len(batch.requests) > settings.batch_max_requests:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many sub-requests. Maximum is {settings.batch_max_requests}"
+        )
+    
+    auth = (credentials.credentials, current_user) if credentials else None
+    results = await run_batch(
+        request.app,
+        request.scope,
+        [item.path for item in batch.requests],
+        auth,
+        settings.batch_max_response_bytes
+    )
+    
+    # Bodies are already JSON; splice them in rather than decoding and re-encoding
+    parts = []
+    for item, result in zip(batch.requests, results):
+        parts.append(
+            b'{"id":' + json.dumps(item.id).encode()
+            + b',"status":' + str(result.status).encode()
+            + b',"body":' + result.body_json() + b"}"
+        )
+    return json_bytes_response(b'{"responses":[' + b",".join(parts) + b"]}")
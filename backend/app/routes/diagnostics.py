@@ -0,0 +1,38 @@
+"""
+Diagnostics routes (Admin only)
+"""
+from fastapi import APIRouter, Depends, Query
+from app.config import settings
+from app.dependencies import get_admin_user
+from app.services.invalidation_bus import invalidation_bus
+from app.services.slow_queries import slow_query_log
+
+router = APIRouter(prefix="/diagnostics", tags=["Diagnostics"])
+
+
+@router.get("/slow-queries")
+async def get_slow_queries(
+    limit: int = Query(50, ge=1, le=500),
+    admin_user: dict = Depends(get_admin_user)
+):
+    """
+    Recent slow MongoDB commands, newest first (Admin only)
+
+    Each entry has the collection, command, duration, filter shape and, once
+    available, a summary of the query plan.
+    """
+    return {
+        "threshold_ms": settings.slow_query_ms,
+        "items": slow_query_log.recent(limit)
+    }
+
+
+@router.get("/cache-bus")
+async def get_cache_bus_status(admin_user: dict = Depends(get_admin_user)):
+    """
+    Cache invalidation bus state for this worker (Admin only)
+
+    Includes messages published and applied, resyncs after missed messages
+    and the last/maximum propagation delay from another worker in ms.
+    """
+    return invalidation_bus.status()
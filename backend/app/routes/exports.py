@@ -0,0 +1,136 @@
+"""
+Export routes - stream full collections as NDJSON or CSV (Admin only)
+"""
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from app.database import (
+    get_database,
+    get_news_collection,
+    get_reports_collection,
+    get_intelligence_cards_collection
+)
+from app.models.news import NewsModel
+from app.models.report import ReportModel
+from app.models.intelligence_card import IntelligenceCardModel
+from app.schemas.news import NewsResponse
+from app.schemas.report import ReportResponse
+from app.schemas.intelligence_card import IntelligenceCardResponse
+from app.schemas.subscription import SubscriptionResponse
+from app.services.export_service import ExportService, EXPORT_MEDIA_TYPES
+from app.routes.subscriptions import subscription_helper
+from app.dependencies import get_admin_user
+from app.utils.queries import (
+    MATCH_MODES,
+    build_news_query,
+    build_reports_query,
+    build_cards_query,
+    build_cards_sort
+)
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+FORMAT_PATTERN = "^(ndjson|csv)$"
+
+
+def _export_response(fmt: str, name: str, cursor, transform, columns) -> StreamingResponse:
+    """Wrap a cursor in a chunked download response"""
+    extension = "csv" if fmt == "csv" else "ndjson"
+    filename = f"{name}-{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    return StreamingResponse(
+        ExportService.stream(fmt, cursor, transform, columns),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/news")
+async def export_news(
+    format: str = Query("ndjson", pattern=FORMAT_PATTERN),
+    category: Optional[str] = None,
+    tier: Optional[str] = None,
+    status: Optional[str] = Query(None, description="Filter by status (draft/published)"),
+    search: Optional[str] = None,
+    match: str = Query("literal", pattern=MATCH_MODES),
+    admin_user: dict = Depends(get_admin_user)
+):
+    """
+    Export news articles matching the same filters as GET /news (Admin only)
+    """
+    query = build_news_query(is_admin=True, status=status, category=category, tier=tier, search=search, match=match)
+    cursor = get_news_collection().find(query).sort("published_date", -1)
+    return _export_response(format, "news", cursor, NewsModel.from_db, list(NewsResponse.model_fields))
+
+
+@router.get("/reports")
+async def export_reports(
+    format: str = Query("ndjson", pattern=FORMAT_PATTERN),
+    tag: Optional[str] = None,
+    status: Optional[str] = Query(None, description="Filter by status (draft/published)"),
+    search: Optional[str] = None,
+    match: str = Query("literal", pattern=MATCH_MODES),
+    admin_user: dict = Depends(get_admin_user)
+):
+    """
+    Export reports matching the same filters as GET /reports (Admin only)
+    """
+    query = build_reports_query(is_admin=True, status=status, tag=tag, search=search, match=match)
+    cursor = get_reports_collection().find(query).sort("published_date", -1)
+    return _export_response(format, "reports", cursor, ReportModel.from_db, list(ReportResponse.model_fields))
+
+
+@router.get("/intelligence-cards")
+async def export_cards(
+    format: str = Query("ndjson", pattern=FORMAT_PATTERN),
+    company: Optional[str] = None,
+    tier: Optional[str] = None,
+    category: Optional[str] = None,
+    industry: Optional[str] = None,
+    date_filter: Optional[str] = None,
+    search: Optional[str] = None,
+    match: str = Query("literal", pattern=MATCH_MODES),
+    sort_by: Optional[str] = Query("newest", pattern="^(newest|oldest|rpi-high|rpi-low|jobs)$"),
+    status: Optional[str] = Query(None, description="Filter by status (draft/published)"),
+    admin_user: dict = Depends(get_admin_user)
+):
+    """
+    Export intelligence cards matching the same filters as GET /intelligence-cards (Admin only)
+    """
+    query = build_cards_query(
+        is_admin=True,
+        status=status,
+        company=company,
+        tier=tier,
+        category=category,
+        industry=industry,
+        date_filter=date_filter,
+        search=search,
+        match=match
+    )
+    cursor = get_intelligence_cards_collection().find(query).sort(build_cards_sort(sort_by))
+    return _export_response(
+        format,
+        "intelligence-cards",
+        cursor,
+        IntelligenceCardModel.from_db,
+        list(IntelligenceCardResponse.model_fields)
+    )
+
+
+@router.get("/subscriptions")
+async def export_subscriptions(
+    format: str = Query("ndjson", pattern=FORMAT_PATTERN),
+    admin_user: dict = Depends(get_admin_user)
+):
+    """
+    Export all newsletter subscriptions, newest first (Admin only)
+    """
+    cursor = get_database().subscriptions.find().sort("created_at", -1)
+    return _export_response(
+        format,
+        "subscriptions",
+        cursor,
+        subscription_helper,
+        list(SubscriptionResponse.model_fields)
+    )
@@ -0,0 +1,45 @@
+"""
+Bulk import routes - stream NDJSON / JSON arrays of reports and cards
+"""
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request
+from app.schemas.imports import ImportReportResponse
+from app.services.import_service import ImportService, IMPORT_KINDS
+from app.dependencies import get_admin_user
+
+router = APIRouter(prefix="/import", tags=["Import"])
+
+
+@router.post("/{kind}", response_model=ImportReportResponse)
+async def import_content(
+    kind: str,
+    request: Request,
+    dry_run: bool = Query(False, description="Validate only, do not write"),
+    admin_user: dict = Depends(get_admin_user)
+):
+    """
+    Bulk import reports or intelligence cards (Admin only)
+
+    - **kind**: `reports` or `intelligence-cards`
+    - **body**: NDJSON (one JSON object per line) or a JSON array of objects
+
+    Each record is validated against the create schema and upserted by its
+    `slug` (derived from the title when not provided). The body is parsed as
+    it streams in, so payload size is not limited by server memory.
+
+    Example:
+        curl -X POST -H "Authorization: Bearer $TOKEN" \\
+             -H "Content-Type: application/x-ndjson" \\
+             --data-binary @reports.ndjson /api/import/reports
+    """
+    if kind not in IMPORT_KINDS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown import kind. Allowed: {', '.join(IMPORT_KINDS)}"
+        )
+
+    return await ImportService.import_stream(
+        kind,
+        request.stream(),
+        created_by=str(admin_user["id"]),
+        dry_run=dry_run
+    )
@@ -1,45 +1,69 @@
 """
 Intelligence Cards routes - CRUD operations for landing page and archive cards
 """
+import asyncio
 from datetime import datetime
 from math import ceil
 from typing import Optional, List
 from fastapi import APIRouter, HTTPException, status, Depends, Query
 from bson import ObjectId
-from app.database import get_intelligence_cards_collection
+from app.config import settings
+from app.database import get_intelligence_cards_collection, get_reports_collection
 from app.models.intelligence_card import IntelligenceCardModel, CardStatus
+from app.models.report import ReportStatus
+from app.schemas.facets import FacetCountsResponse
 from app.schemas.intelligence_card import (
     IntelligenceCardCreate,
     IntelligenceCardUpdate,
     IntelligenceCardResponse,
     IntelligenceCardListResponse,
+    IntelligenceCardByIdsResponse,
+    IntelligenceCardExpandedResponse,
+    IntelligenceCardExpandedListResponse,
     PlatformStatsResponse,
     AdminStatsResponse
 )
 from app.dependencies import get_admin_user, get_optional_user
+from app.services.document_cache import document_cache
+from app.services.events import emit_content_event, update_and_emit
+from app.services import public_feed
+from app.services.facets import get_facets
+from app.services.import_service import insert_with_slug
+from app.services.rate_limit import rate_limit
+from app.services.scheduler import require_publish_date
+from app.services.cache import response_cache, MISS
+from app.services.cdn import add_surrogate_keys, item_key, tag_list
+from app.utils.queries import MATCH_MODES, build_cards_query, build_cards_sort, build_ids_query, order_by_ids, parse_id_list
+from app.utils.serialization import encode_json, json_bytes_response, json_response, read_projection
 
 router = APIRouter(prefix="/intelligence-cards", tags=["Intelligence Cards"])
 
+# Accepted values for the `expand` query parameter
+EXPAND_OPTIONS = "^report$"
+
+# Report fields embedded in cards with expand=report
+LINKED_REPORT_PROJECTION = {
+    "title": 1, "subtitle": 1, "label": 1, "tier": 1,
+    "reading_time": 1, "cover_image_url": 1, "published_date": 1
+}
+
 
 # ============ PUBLIC ENDPOINTS ============
 
-@router.get("/stats", response_model=PlatformStatsResponse)
-async def get_platform_stats():
-    """
-    Get platform statistics for the landing page hero section
-    """
+async def load_platform_stats() -> PlatformStatsResponse:
+    """Platform statistics (uncached; shared with the landing bundle)"""
     collection = get_intelligence_cards_collection()
     
-    # Count published cards
-    total_analyses = await collection.count_documents({"status": CardStatus.PUBLISHED.value})
-    
-    # Get unique companies
+    # Count published cards and unique companies concurrently
     pipeline = [
         {"$match": {"status": CardStatus.PUBLISHED.value}},
         {"$group": {"_id": "$company"}},
         {"$count": "total"}
     ]
-    companies_result = await collection.aggregate(pipeline).to_list(1)
+    total_analyses, companies_result = await asyncio.gather(
+        collection.count_documents({"status": CardStatus.PUBLISHED.value}),
+        collection.aggregate(pipeline).to_list(1)
+    )
     total_companies = companies_result[0]["total"] if companies_result else 0
     
     return PlatformStatsResponse(
@@ -52,6 +76,92 @@ async def get_platform_stats():
     )
 
 
+async def load_landing_cards(limit: int) -> List[dict]:
+    """Published cards for the landing feed (uncached; shared with the landing bundle)"""
+    collection = get_intelligence_cards_collection()
+    
+    cursor = collection.find(
+        {"status": CardStatus.PUBLISHED.value},
+        read_projection(IntelligenceCardResponse)
+    ).sort([
+        ("display_order", 1),
+        ("published_date", -1)
+    ]).limit(limit)
+    
+    cards = []
+    async for doc in cursor:
+        cards.append(IntelligenceCardModel.from_db(doc))
+    return cards
+
+
+async def load_featured_card() -> Optional[dict]:
+    """The featured card, else the latest published (uncached; shared with the landing bundle)"""
+    collection = get_intelligence_cards_collection()
+    
+    projection = read_projection(IntelligenceCardResponse)
+    doc = await collection.find_one({
+        "status": CardStatus.PUBLISHED.value,
+        "is_featured": True
+    }, projection)
+    
+    if not doc:
+        # Return the most recent if no featured
+        doc = await collection.find_one(
+            {"status": CardStatus.PUBLISHED.value},
+            projection,
+            sort=[("published_date", -1)]
+        )
+    return IntelligenceCardModel.from_db(doc)
+
+
+async def expand_reports(cards: List[Optional[dict]], include_unpublished: bool = False) -> List[Optional[dict]]:
+    """
+    Attach linked report summaries to cards (expand=report)
+    
+    All linked reports are fetched with one `$in` query. A card whose
+    report_id does not resolve to a visible report gets `report: None` and
+    `report_missing: True` instead of an error.
+    """
+    report_ids = list({str(card["report_id"]) for card in cards if card and card.get("report_id")})
+    query = build_ids_query(report_ids, None if include_unpublished else ReportStatus.PUBLISHED.value)
+    
+    reports = {}
+    if query["_id"]["$in"]:
+        async for doc in get_reports_collection().find(query, LINKED_REPORT_PROJECTION):
+            reports[str(doc["_id"])] = {**doc, "id": str(doc["_id"])}
+    
+    # Dangling links are tagged too, so publishing the report purges the card
+    add_surrogate_keys(*(item_key("reports", report_id) for report_id in report_ids))
+    
+    expanded = []
+    for card in cards:
+        if card is None:
+            expanded.append(None)
+            continue
+        report_id = str(card["report_id"]) if card.get("report_id") else None
+        expanded.append({
+            **card,
+            "report": reports.get(report_id),
+            "report_missing": report_id is not None and report_id not in reports
+        })
+    return expanded
+
+
+@router.get("/stats", response_model=PlatformStatsResponse)
+async def get_platform_stats():
+    """
+    Get platform statistics for the landing page hero section
+    """
+    add_surrogate_keys("cards")
+    cached = response_cache.get(("cards", "stats"))
+    if cached is not MISS:
+        return json_bytes_response(cached)
+    
+    body = encode_json(PlatformStatsResponse, await load_platform_stats())
+    response_cache.set(("cards", "stats"), body, tags=["intelligence_cards"])
+    return json_bytes_response(body)
+
+
 @router.get("/admin-stats", response_model=AdminStatsResponse)
 async def get_admin_stats(current_user: dict = Depends(get_admin_user)):
     """
@@ -63,67 +173,69 @@ async def get_admin_stats(current_user: dict = Depends(get_admin_user)):
     total_cards = await collection.count_documents({})
     published_cards = await collection.count_documents({"status": CardStatus.PUBLISHED.value})
     draft_cards = await collection.count_documents({"status": CardStatus.DRAFT.value})
+    scheduled_cards = await collection.count_documents({"status": CardStatus.SCHEDULED.value})
     featured_cards = await collection.count_documents({"is_featured": True})
     
     return AdminStatsResponse(
         total_cards=total_cards,
         published_cards=published_cards,
         draft_cards=draft_cards,
-        featured_cards=featured_cards
+        featured_cards=featured_cards,
+        scheduled_cards=scheduled_cards
     )
 
 
 @router.get("/landing", response_model=List[IntelligenceCardResponse])
 async def get_landing_cards(
-    limit: int = Query(8, ge=1, le=20)
+    limit: int = Query(8, ge=1, le=20),
+    expand: Optional[str] = Query(None, pattern=EXPAND_OPTIONS, description="`report` embeds the linked report's summary")
 ):
     """
     Get cards for the landing page news feed (horizontal scroll)
     Returns published cards ordered by display_order and published_date
     """
-    collection = get_intelligence_cards_collection()
-    
-    cursor = collection.find(
-        {"status": CardStatus.PUBLISHED.value}
-    ).sort([
-        ("display_order", 1),
-        ("published_date", -1)
-    ]).limit(limit)
-    
-    cards = []
-    async for doc in cursor:
-        cards.append(IntelligenceCardModel.from_db(doc))
-    
-    return [IntelligenceCardResponse(**c) for c in cards]
+    add_surrogate_keys("cards", *(["reports"] if expand else []))
+    cache_key = ("cards", "landing", limit, expand)
+    cached = response_cache.get(cache_key)
+    if cached is not MISS:
+        return json_bytes_response(cached)
+    
+    # Cache the encoded body so hits skip validation and encoding entirely
+    cards = await load_landing_cards(limit)
+    if expand:
+        body = encode_json(List[IntelligenceCardExpandedResponse], await expand_reports(cards))
+        response_cache.set(cache_key, body, tags=["intelligence_cards", "reports"])
+    else:
+        body = encode_json(List[IntelligenceCardResponse], cards)
+        response_cache.set(cache_key, body, tags=["intelligence_cards"])
+    return json_bytes_response(body)
 
 
 @router.get("/featured", response_model=Optional[IntelligenceCardResponse])
-async def get_featured_card():
+async def get_featured_card(
+    expand: Optional[str] = Query(None, pattern=EXPAND_OPTIONS, description="`report` embeds the linked report's summary")
+):
     """
     Get the featured card for the archive page banner
     """
-    collection = get_intelligence_cards_collection()
-    
-    doc = await collection.find_one({
-        "status": CardStatus.PUBLISHED.value,
-        "is_featured": True
-    })
-    
-    if not doc:
-        # Return the most recent if no featured
-        doc = await collection.find_one(
-            {"status": CardStatus.PUBLISHED.value},
-            sort=[("published_date", -1)]
-        )
-    
-    if doc:
-        card = IntelligenceCardModel.from_db(doc)
-        return IntelligenceCardResponse(**card)
-    
-    return None
+    add_surrogate_keys("cards", *(["reports"] if expand else []))
+    cache_key = ("cards", "featured", expand)
+    cached = response_cache.get(cache_key)
+    if cached is not MISS:
+        return json_bytes_response(cached)
+    
+    card = await load_featured_card()
+    if expand:
+        (card,) = await expand_reports([card])
+        body = encode_json(Optional[IntelligenceCardExpandedResponse], card)
+        response_cache.set(cache_key, body, tags=["intelligence_cards", "reports"])
+    else:
+        body = encode_json(Optional[IntelligenceCardResponse], card)
+        response_cache.set(cache_key, body, tags=["intelligence_cards"])
+    return json_bytes_response(body)
 
 
-@router.get("", response_model=IntelligenceCardListResponse)
+@router.get("", response_model=IntelligenceCardListResponse, dependencies=[Depends(rate_limit("search", query_param="search"))])
 async def get_all_cards(
     page: int = Query(1, ge=1),
     size: int = Query(12, ge=1, le=100),
@@ -133,8 +245,10 @@ async def get_all_cards(
     industry: Optional[str] = None,
     date_filter: Optional[str] = None,
     search: Optional[str] = None,
+    match: str = Query("literal", pattern=MATCH_MODES, description="How search/filter text is matched: literal or regex"),
     sort_by: Optional[str] = Query("newest", regex="^(newest|oldest|rpi-high|rpi-low|jobs)$"),
     status: Optional[str] = Query(None, description="Filter by status (draft/published)"),
+    expand: Optional[str] = Query(None, pattern=EXPAND_OPTIONS, description="`report` embeds the linked report's summary"),
     current_user: Optional[dict] = Depends(get_optional_user)
 ):
     """
@@ -142,92 +256,121 @@ async def get_all_cards(
     
     - Public users: Only see published cards
     - Admin users: Can filter by status
+    - `expand=report`: each card carries its linked report's summary
+      (`report`), resolved in one query; broken links set `report_missing`
     """
     collection = get_intelligence_cards_collection()
     
-    # Build query filter
-    query = {}
-    
     # Public users only see published cards
     is_admin = current_user and current_user.get("role") == "admin"
-    if not is_admin:
-        query["status"] = CardStatus.PUBLISHED.value
-    elif status:
-        query["status"] = status
-    
-    if company:
-        query["company"] = {"$regex": company, "$options": "i"}
-    
-    if tier:
-        query["tier"] = tier
-    
-    if category:
-        query["category"] = {"$regex": category, "$options": "i"}
-    
-    if industry:
-        query["industry"] = {"$regex": industry, "$options": "i"}
-    
-    # Date filter
-    if date_filter:
-        now = datetime.utcnow()
-        if date_filter == "7d":
-            from datetime import timedelta
-            query["published_date"] = {"$gte": now - timedelta(days=7)}
-        elif date_filter == "30d":
-            from datetime import timedelta
-            query["published_date"] = {"$gte": now - timedelta(days=30)}
-        elif date_filter == "90d":
-            from datetime import timedelta
-            query["published_date"] = {"$gte": now - timedelta(days=90)}
-        elif date_filter == "2026":
-            query["published_date"] = {
-                "$gte": datetime(2026, 1, 1),
-                "$lt": datetime(2027, 1, 1)
-            }
-        elif date_filter == "2025":
-            query["published_date"] = {
-                "$gte": datetime(2025, 1, 1),
-                "$lt": datetime(2026, 1, 1)
-            }
-    
-    if search:
-        query["$or"] = [
-            {"title": {"$regex": search, "$options": "i"}},
-            {"company": {"$regex": search, "$options": "i"}},
-            {"excerpt": {"$regex": search, "$options": "i"}},
-            {"category": {"$regex": search, "$options": "i"}}
-        ]
-    
-    # Determine sort order
-    sort_field = [("published_date", -1)]  # Default: newest first
-    if sort_by == "oldest":
-        sort_field = [("published_date", 1)]
-    elif sort_by == "rpi-high":
-        sort_field = [("rpi_score", -1), ("published_date", -1)]
-    elif sort_by == "rpi-low":
-        sort_field = [("rpi_score", 1), ("published_date", -1)]
-    elif sort_by == "jobs":
-        sort_field = [("jobs_affected", -1), ("published_date", -1)]
-    
-    # Get total count
-    total = await collection.count_documents(query)
-    pages = ceil(total / size) if total > 0 else 1
+    query = build_cards_query(
+        is_admin=bool(is_admin),
+        status=status,
+        company=company,
+        tier=tier,
+        category=category,
+        industry=industry,
+        date_filter=date_filter,
+        search=search,
+        match=match
+    )
+    sort_field = build_cards_sort(sort_by)
     
-    # Get paginated results
     skip = (page - 1) * size
-    cursor = collection.find(query).sort(sort_field).skip(skip).limit(size)
-    
-    cards = []
-    async for doc in cursor:
-        cards.append(IntelligenceCardModel.from_db(doc))
-    
-    return IntelligenceCardListResponse(
-        items=[IntelligenceCardResponse(**c) for c in cards],
-        total=total,
-        page=page,
-        size=size,
-        pages=pages
+    page_from_feed = None
+    if not is_admin and settings.public_feed_reads:
+        # Public reads come pre-shaped from the published-only read model (None while it is rebuilt)
+        page_from_feed = await public_feed.find_page("intelligence_cards", query, sort_field, skip, size)
+    if page_from_feed is not None:
+        cards, total = page_from_feed
+    else:
+        total = await collection.count_documents(query)
+        cursor = collection.find(query, read_projection(IntelligenceCardResponse)).sort(sort_field).skip(skip).limit(size)
+        cards = []
+        async for doc in cursor:
+            cards.append(IntelligenceCardModel.from_db(doc))
+    pages = ceil(total / size) if total > 0 else 1
+    tag_list("intelligence_cards", cards, {"tier": tier})
+    
+    if expand:
+        return json_response(IntelligenceCardExpandedListResponse, {
+            "items": await expand_reports(cards, include_unpublished=bool(is_admin)),
+            "total": total,
+            "page": page,
+            "size": size,
+            "pages": pages
+        })
+    
+    return json_response(IntelligenceCardListResponse, {
+        "items": cards,
+        "total": total,
+        "page": page,
+        "size": size,
+        "pages": pages
+    })
+
+
+@router.get("/facets", response_model=FacetCountsResponse, dependencies=[Depends(rate_limit("search", query_param="search"))])
+async def get_card_facets(
+    company: Optional[str] = None,
+    tier: Optional[str] = None,
+    category: Optional[str] = None,
+    industry: Optional[str] = None,
+    date_filter: Optional[str] = None,
+    search: Optional[str] = None,
+    match: str = Query("literal", pattern=MATCH_MODES, description="How search/filter text is matched: literal or regex")
+):
+    """
+    Company, tier, category and industry counts for published cards
+
+    Accepts the same filters as the card list, so counts drill down with the
+    Archive page filters.
+    """
+    query = build_cards_query(
+        is_admin=False,
+        company=company,
+        tier=tier,
+        category=category,
+        industry=industry,
+        date_filter=date_filter,
+        search=search,
+        match=match
     )
+    tag_list("intelligence_cards", [], {"tier": tier})
+    return await get_facets("intelligence_cards", query, {
+        "company": company,
+        "tier": tier,
+        "category": category,
+        "industry": industry,
+        "date_filter": date_filter,
+        "search": search
+    }, match)
+
+
+@router.get("/by-ids", response_model=IntelligenceCardByIdsResponse)
+async def get_cards_by_ids(
+    ids: str = Query(..., description="Comma-separated card IDs, returned in this order"),
+    current_user: Optional[dict] = Depends(get_optional_user)
+):
+    """
+    Get several intelligence cards by ID in one query
+    
+    - Public users: Only published cards
+    - Admin users: Any card
+    - IDs that do not exist, are malformed or are not visible are listed in `missing`
+    """
+    requested = parse_id_list(ids)
+    is_admin = current_user and current_user.get("role") == "admin"
+    query = build_ids_query(requested, None if is_admin else CardStatus.PUBLISHED.value)
+    
+    documents = await get_intelligence_cards_collection().find(query, read_projection(IntelligenceCardResponse)).to_list(length=None)
+    found, missing = order_by_ids(requested, documents)
+    # Missing IDs are tagged too: publishing one of them changes this response
+    add_surrogate_keys(*(item_key("intelligence_cards", card_id) for card_id in requested))
+    return json_response(IntelligenceCardByIdsResponse, {
+        "items": [IntelligenceCardModel.from_db(doc) for doc in found],
+        "missing": missing
+    })
 
 
 @router.get("/{card_id}", response_model=IntelligenceCardResponse)
@@ -244,13 +387,22 @@ async def get_card_by_id(
     collection = get_intelligence_cards_collection()
     
     try:
-        card = await collection.find_one({"_id": ObjectId(card_id)})
+        object_id = ObjectId(card_id)
     except:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid card ID format"
         )
     
+    add_surrogate_keys(item_key("intelligence_cards", str(object_id)))
+    
+    # Read-through cache; concurrent misses for the same ID share one query
+    card = await document_cache.get(
+        "intelligence_cards",
+        str(object_id),
+        lambda: collection.find_one({"_id": object_id}, read_projection(IntelligenceCardResponse))
+    )
+    
     if not card:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -265,7 +417,7 @@ async def get_card_by_id(
             detail="Card not found"
         )
     
-    return IntelligenceCardResponse(**IntelligenceCardModel.from_db(card))
+    return json_response(IntelligenceCardResponse, IntelligenceCardModel.from_db(card))
 
 
 # ============ ADMIN ENDPOINTS ============
@@ -280,6 +432,8 @@ async def create_card(
     """
     collection = get_intelligence_cards_collection()
     
+    require_publish_date(card_data.status, card_data.published_date)
+    
     document = IntelligenceCardModel.create_document(
         title=card_data.title,
         title_highlight=card_data.title_highlight,
@@ -314,8 +468,9 @@ async def create_card(
         tags=card_data.tags
     )
     
-    result = await collection.insert_one(document)
+    result = await insert_with_slug("intelligence-cards", collection, document)
     document["_id"] = result.inserted_id
+    await emit_content_event("intelligence_cards", document=document)
     
     return IntelligenceCardResponse(**IntelligenceCardModel.from_db(document))
 
@@ -368,14 +523,19 @@ async def update_card(
             "label": update_data.pop("stat3_label", existing.get("stat3", {}).get("label") if existing.get("stat3") else None)
         }
     
-    update_data["updated_at"] = datetime.utcnow()
-    
-    await collection.update_one(
-        {"_id": ObjectId(card_id)},
-        {"$set": update_data}
+    require_publish_date(
+        update_data.get("status", existing.get("status")),
+        update_data.get("published_date", existing.get("published_date"))
     )
     
-    updated = await collection.find_one({"_id": ObjectId(card_id)})
+    update_data["updated_at"] = datetime.utcnow()
+    
+    updated = await update_and_emit(collection, ObjectId(card_id), update_data)
+    if updated is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Card not found"
+        )
     return IntelligenceCardResponse(**IntelligenceCardModel.from_db(updated))
 
 
@@ -390,19 +550,21 @@ async def delete_card(
     collection = get_intelligence_cards_collection()
     
     try:
-        result = await collection.delete_one({"_id": ObjectId(card_id)})
+        deleted = await collection.find_one_and_delete({"_id": ObjectId(card_id)})
     except:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid card ID format"
         )
     
-    if result.deleted_count == 0:
+    if deleted is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Card not found"
         )
     
+    await emit_content_event("intelligence_cards", previous=deleted)
+    
     return {"message": "Card deleted successfully"}
 
 
@@ -432,18 +594,16 @@ async def toggle_card_status(
     
     new_status = CardStatus.PUBLISHED.value if card["status"] == CardStatus.DRAFT.value else CardStatus.DRAFT.value
     
-    await collection.update_one(
-        {"_id": ObjectId(card_id)},
-        {
-            "$set": {
-                "status": new_status,
-                "updated_at": datetime.utcnow(),
-                "published_date": datetime.utcnow() if new_status == CardStatus.PUBLISHED.value else card["published_date"]
-            }
-        }
-    )
-    
-    updated = await collection.find_one({"_id": ObjectId(card_id)})
+    updated = await update_and_emit(collection, ObjectId(card_id), {
+        "status": new_status,
+        "updated_at": datetime.utcnow(),
+        "published_date": datetime.utcnow() if new_status == CardStatus.PUBLISHED.value else card["published_date"]
+    })
+    if updated is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Card not found"
+        )
     return IntelligenceCardResponse(**IntelligenceCardModel.from_db(updated))
 
 
@@ -473,23 +633,30 @@ async def toggle_featured_status(
         )
     
     new_featured = not card.get("is_featured", False)
+    now = datetime.utcnow()
     
     # If setting as featured, unfeature all others
+    previously_featured = []
     if new_featured:
+        previously_featured = await collection.find(
+            {"_id": {"$ne": ObjectId(card_id)}, "is_featured": True}
+        ).to_list(length=None)
         await collection.update_many(
-            {"_id": {"$ne": ObjectId(card_id)}},
-            {"$set": {"is_featured": False}}
+            {"_id": {"$ne": ObjectId(card_id)}, "is_featured": True},
+            {"$set": {"is_featured": False, "updated_at": now}}
         )
     
-    await collection.update_one(
-        {"_id": ObjectId(card_id)},
-        {
-            "$set": {
-                "is_featured": new_featured,
-                "updated_at": datetime.utcnow()
-            }
-        }
-    )
+    for other in previously_featured:
+        await emit_content_event(
+            "intelligence_cards",
+            document={**other, "is_featured": False, "updated_at": now},
+            previous=other
+        )
     
-    updated = await collection.find_one({"_id": ObjectId(card_id)})
+    updated = await update_and_emit(collection, ObjectId(card_id), {"is_featured": new_featured, "updated_at": now})
+    if updated is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Card not found"
+        )
     return IntelligenceCardResponse(**IntelligenceCardModel.from_db(updated))
@@ -0,0 +1,46 @@
+"""
+Landing page bundle - everything the landing page needs in one request
+"""
+import asyncio
+from fastapi import APIRouter, Query
+from app.routes.intelligence_cards import load_featured_card, load_landing_cards, load_platform_stats
+from app.routes.news import load_latest_news
+from app.schemas.landing import LandingResponse
+from app.services.cache import response_cache, MISS
+from app.services.cdn import add_surrogate_keys
+from app.utils.serialization import encode_json, json_bytes_response
+
+router = APIRouter(prefix="/landing", tags=["Landing"])
+
+
+@router.get("", response_model=LandingResponse)
+async def get_landing(
+    cards_limit: int = Query(8, ge=1, le=20),
+    news_limit: int = Query(6, ge=1, le=20)
+):
+    """
+    Platform stats, landing cards, the featured card and the latest news
+
+    The sections are queried concurrently and the encoded payload is cached
+    as a unit until any card or news item changes.
+    """
+    add_surrogate_keys("cards", "news")
+    cache_key = ("landing", cards_limit, news_limit)
+    cached = response_cache.get(cache_key)
+    if cached is not MISS:
+        return json_bytes_response(cached)
+    
+    stats, cards, featured, news = await asyncio.gather(
+        load_platform_stats(),
+        load_landing_cards(cards_limit),
+        load_featured_card(),
+        load_latest_news(news_limit)
+    )
+    body = encode_json(LandingResponse, {
+        "stats": stats,
+        "cards": cards,
+        "featured": featured,
+        "news": news
+    })
+    response_cache.set(cache_key, body, tags=["intelligence_cards", "news"])
+    return json_bytes_response(body)
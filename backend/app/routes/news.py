@@ -6,22 +6,34 @@ from math import ceil
 from typing import Optional, List
 from fastapi import APIRouter, HTTPException, status, Depends, Query
 from bson import ObjectId
+from app.config import settings
 from app.database import get_news_collection
 from app.models.news import NewsModel, NewsStatus
+from app.schemas.facets import FacetCountsResponse
 from app.schemas.news import (
     NewsCreate,
     NewsUpdate,
     NewsResponse,
-    NewsListResponse
+    NewsListResponse,
+    NewsByIdsResponse
 )
 from app.dependencies import get_admin_user, get_optional_user
+from app.services.cdn import add_surrogate_keys, item_key, tag_list
+from app.services.document_cache import document_cache
+from app.services.events import emit_content_event, update_and_emit
+from app.services import public_feed
+from app.services.facets import get_facets
+from app.services.rate_limit import rate_limit
+from app.services.scheduler import require_publish_date
+from app.utils.queries import MATCH_MODES, build_ids_query, build_news_query, order_by_ids, parse_id_list
+from app.utils.serialization import json_response, read_projection
 
 router = APIRouter(prefix="/news", tags=["News"])
 
 
 # ============ PUBLIC ENDPOINTS ============
 
-@router.get("", response_model=NewsListResponse)
+@router.get("", response_model=NewsListResponse, dependencies=[Depends(rate_limit("search", query_param="search"))])
 async def get_all_news(
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=100),
@@ -29,6 +41,7 @@ async def get_all_news(
     tier: Optional[str] = None,
     status: Optional[str] = Query(None, description="Filter by status (draft/published)"),
     search: Optional[str] = None,
+    match: str = Query("literal", pattern=MATCH_MODES, description="How search/filter text is matched: literal or regex"),
     current_user: Optional[dict] = Depends(get_optional_user)
 ):
     """
@@ -39,48 +52,90 @@ async def get_all_news(
     """
     collection = get_news_collection()
     
-    # Build query filter
-    query = {}
-    
     # Public users only see published news
     is_admin = current_user and current_user.get("role") == "admin"
-    if not is_admin:
-        query["status"] = NewsStatus.PUBLISHED.value
-    elif status:
-        query["status"] = status
-    
-    if category:
-        query["category"] = category
-    
-    if tier:
-        query["tier"] = tier
-    
-    if search:
-        query["$or"] = [
-            {"title": {"$regex": search, "$options": "i"}},
-            {"description": {"$regex": search, "$options": "i"}},
-            {"summary": {"$regex": search, "$options": "i"}}
-        ]
-    
-    # Get total count
-    total = await collection.count_documents(query)
-    pages = ceil(total / size) if total > 0 else 1
+    query = build_news_query(
+        is_admin=bool(is_admin),
+        status=status,
+        category=category,
+        tier=tier,
+        search=search,
+        match=match
+    )
     
-    # Get paginated results
     skip = (page - 1) * size
-    cursor = collection.find(query).sort("published_date", -1).skip(skip).limit(size)
-    
-    news_list = []
-    async for doc in cursor:
-        news_list.append(NewsModel.from_db(doc))
-    
-    return NewsListResponse(
-        items=[NewsResponse(**n) for n in news_list],
-        total=total,
-        page=page,
-        size=size,
-        pages=pages
-    )
+    page_from_feed = None
+    if not is_admin and settings.public_feed_reads:
+        # Public reads come pre-shaped from the published-only read model (None while it is rebuilt)
+        page_from_feed = await public_feed.find_page("news", query, [("published_date", -1)], skip, size)
+    if page_from_feed is not None:
+        news_list, total = page_from_feed
+    else:
+        total = await collection.count_documents(query)
+        cursor = collection.find(query, read_projection(NewsResponse)).sort("published_date", -1).skip(skip).limit(size)
+        news_list = []
+        async for doc in cursor:
+            news_list.append(NewsModel.from_db(doc))
+    pages = ceil(total / size) if total > 0 else 1
+    tag_list("news", news_list, {"category": category, "tier": tier})
+    
+    return json_response(NewsListResponse, {
+        "items": news_list,
+        "total": total,
+        "page": page,
+        "size": size,
+        "pages": pages
+    })
+
+
+async def load_latest_news(limit: int) -> List[dict]:
+    """Most recent published news (uncached; used by the landing bundle)"""
+    cursor = get_news_collection().find(
+        {"status": NewsStatus.PUBLISHED.value},
+        read_projection(NewsResponse)
+    ).sort("published_date", -1).limit(limit)
+    return [NewsModel.from_db(doc) async for doc in cursor]
+
+
+@router.get("/facets", response_model=FacetCountsResponse, dependencies=[Depends(rate_limit("search", query_param="search"))])
+async def get_news_facets(
+    category: Optional[str] = None,
+    tier: Optional[str] = None,
+    search: Optional[str] = None,
+    match: str = Query("literal", pattern=MATCH_MODES, description="How search/filter text is matched: literal or regex")
+):
+    """
+    Category and tier counts for published news, narrowed by the active filters
+    """
+    query = build_news_query(is_admin=False, category=category, tier=tier, search=search, match=match)
+    tag_list("news", [], {"category": category, "tier": tier})
+    return await get_facets("news", query, {"category": category, "tier": tier, "search": search}, match)
+
+
+@router.get("/by-ids", response_model=NewsByIdsResponse)
+async def get_news_by_ids(
+    ids: str = Query(..., description="Comma-separated news IDs, returned in this order"),
+    current_user: Optional[dict] = Depends(get_optional_user)
+):
+    """
+    Get several news articles by ID in one query
+    
+    - Public users: Only published news articles
+    - Admin users: Any news
+    - IDs that do not exist, are malformed or are not visible are listed in `missing`
+    """
+    requested = parse_id_list(ids)
+    is_admin = current_user and current_user.get("role") == "admin"
+    query = build_ids_query(requested, None if is_admin else NewsStatus.PUBLISHED.value)
+    
+    documents = await get_news_collection().find(query, read_projection(NewsResponse)).to_list(length=None)
+    found, missing = order_by_ids(requested, documents)
+    # Missing IDs are tagged too: publishing one of them changes this response
+    add_surrogate_keys(*(item_key("news", doc_id) for doc_id in requested))
+    return json_response(NewsByIdsResponse, {
+        "items": [NewsModel.from_db(doc) for doc in found],
+        "missing": missing
+    })
 
 
 @router.get("/{news_id}", response_model=NewsResponse)
@@ -97,13 +152,22 @@ async def get_news_by_id(
     collection = get_news_collection()
     
     try:
-        news = await collection.find_one({"_id": ObjectId(news_id)})
+        object_id = ObjectId(news_id)
     except:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid news ID format"
         )
     
+    add_surrogate_keys(item_key("news", str(object_id)))
+    
+    # Read-through cache; concurrent misses for the same ID share one query
+    news = await document_cache.get(
+        "news",
+        str(object_id),
+        lambda: collection.find_one({"_id": object_id}, read_projection(NewsResponse))
+    )
+    
     if news is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -118,7 +182,7 @@ async def get_news_by_id(
             detail="News not found"
         )
     
-    return NewsResponse(**NewsModel.from_db(news))
+    return json_response(NewsResponse, NewsModel.from_db(news))
 
 
 # ============ ADMIN ENDPOINTS ============
@@ -133,6 +197,8 @@ async def create_news(
     """
     collection = get_news_collection()
     
+    require_publish_date(news_data.status, news_data.published_date)
+    
     news_doc = NewsModel.create_document(
         title=news_data.title,
         description=news_data.description,
@@ -156,6 +222,7 @@ async def create_news(
     
     result = await collection.insert_one(news_doc)
     news_doc["_id"] = result.inserted_id
+    await emit_content_event("news", document=news_doc)
     
     return NewsResponse(**NewsModel.from_db(news_doc))
 
@@ -208,14 +275,19 @@ async def update_news(
     if "status" in update_data and update_data["status"]:
         update_data["status"] = update_data["status"].value if hasattr(update_data["status"], "value") else update_data["status"]
     
-    update_data["updated_at"] = datetime.utcnow()
-    
-    await collection.update_one(
-        {"_id": ObjectId(news_id)},
-        {"$set": update_data}
+    require_publish_date(
+        update_data.get("status", existing.get("status")),
+        update_data.get("published_date", existing.get("published_date"))
     )
     
-    updated = await collection.find_one({"_id": ObjectId(news_id)})
+    update_data["updated_at"] = datetime.utcnow()
+    
+    updated = await update_and_emit(collection, ObjectId(news_id), update_data)
+    if updated is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="News not found"
+        )
     return NewsResponse(**NewsModel.from_db(updated))
 
 
@@ -230,18 +302,20 @@ async def delete_news(
     collection = get_news_collection()
     
     try:
-        result = await collection.delete_one({"_id": ObjectId(news_id)})
+        deleted = await collection.find_one_and_delete({"_id": ObjectId(news_id)})
     except:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid news ID format"
         )
     
-    if result.deleted_count == 0:
+    if deleted is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="News not found"
         )
+    
+    await emit_content_event("news", previous=deleted)
 
 
 @router.patch("/{news_id}/status")
@@ -272,20 +346,20 @@ async def toggle_news_status(
     current_status = news.get("status", NewsStatus.DRAFT.value)
     new_status = NewsStatus.PUBLISHED.value if current_status == NewsStatus.DRAFT.value else NewsStatus.DRAFT.value
     
-    await collection.update_one(
-        {"_id": ObjectId(news_id)},
-        {"$set": {"status": new_status, "updated_at": datetime.utcnow()}}
-    )
-    
-    updated = await collection.find_one({"_id": ObjectId(news_id)})
+    updated = await update_and_emit(collection, ObjectId(news_id), {"status": new_status, "updated_at": datetime.utcnow()})
+    if updated is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="News not found"
+        )
     return NewsResponse(**NewsModel.from_db(updated))
 
 
 @router.get("/categories/list")
 async def get_news_categories():
     """
-    Get list of all unique news categories
+    Get list of all categories used by published news
     """
-    collection = get_news_collection()
-    categories = await collection.distinct("category")
-    return {"categories": categories}
+    add_surrogate_keys("news")
+    facets = await get_facets("news", {}, {})
+    return {"categories": sorted(facets["facets"]["category"])}
@@ -0,0 +1,44 @@
+"""
+Related content routes
+"""
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, status
+from app.schemas.related import RelatedItemsResponse
+from app.services.cdn import add_surrogate_keys, related_key
+from app.services.related import RELATED_KINDS, get_related
+
+router = APIRouter(prefix="/related", tags=["Related Content"])
+
+
+@router.get("/{kind}/{item_id}", response_model=RelatedItemsResponse)
+async def get_related_items(
+    kind: str,
+    item_id: str,
+    limit: int = Query(6, ge=1, le=30),
+    kinds: Optional[str] = Query(None, description="Comma-separated kinds to include, e.g. reports,news")
+):
+    """
+    Published news, reports and cards related to an item
+
+    - **kind**: `news`, `reports` or `intelligence-cards`
+    - Ranked by shared companies, tags, industry, category and title words
+    """
+    collection = RELATED_KINDS.get(kind)
+    if collection is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown kind. Allowed: {', '.join(RELATED_KINDS)}"
+        )
+
+    include = None
+    if kinds:
+        include = [RELATED_KINDS.get(name.strip(), name.strip()) for name in kinds.split(",") if name.strip()]
+
+    add_surrogate_keys(related_key(collection, item_id))
+    items = await get_related(collection, item_id, limit, include)
+    if items is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Item not found"
+        )
+    return {"kind": collection, "id": item_id, "items": items}
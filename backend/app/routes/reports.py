@@ -6,17 +6,30 @@ from math import ceil
 from typing import Optional, List
 from fastapi import APIRouter, HTTPException, status, Depends, Query
 from bson import ObjectId
+from app.config import settings
 from app.database import get_reports_collection
 from app.models.report import ReportModel, ReportStatus
+from app.schemas.facets import FacetCountsResponse
 from app.schemas.report import (
     ReportCreate,
     ReportUpdate,
     ReportResponse,
     ReportListResponse,
+    ReportByIdsResponse,
     SendPreviewRequest,
     SendPreviewResponse
 )
 from app.dependencies import get_admin_user, get_optional_user
+from app.services.cdn import add_surrogate_keys, item_key, tag_list
+from app.services.document_cache import document_cache
+from app.services.events import emit_content_event, update_and_emit
+from app.services import public_feed
+from app.services.facets import get_facets
+from app.services.import_service import insert_with_slug
+from app.services.rate_limit import rate_limit
+from app.services.scheduler import require_publish_date
+from app.utils.queries import MATCH_MODES, build_ids_query, build_reports_query, order_by_ids, parse_id_list
+from app.utils.serialization import json_response, read_projection
 from app.services.email_service import email_service
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
@@ -24,13 +37,14 @@ router = APIRouter(prefix="/reports", tags=["Reports"])
 
 # ============ PUBLIC ENDPOINTS ============
 
-@router.get("", response_model=ReportListResponse)
+@router.get("", response_model=ReportListResponse, dependencies=[Depends(rate_limit("search", query_param="search"))])
 async def get_all_reports(
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=100),
     tag: Optional[str] = None,
     status: Optional[str] = Query(None, description="Filter by status (draft/published)"),
     search: Optional[str] = None,
+    match: str = Query("literal", pattern=MATCH_MODES, description="How search/filter text is matched: literal or regex"),
     current_user: Optional[dict] = Depends(get_optional_user)
 ):
     """
@@ -41,45 +55,79 @@ async def get_all_reports(
     """
     collection = get_reports_collection()
     
-    # Build query filter
-    query = {}
-    
     # Public users only see published reports
     is_admin = current_user and current_user.get("role") == "admin"
-    if not is_admin:
-        query["status"] = ReportStatus.PUBLISHED.value
-    elif status:
-        query["status"] = status
-    
-    if tag:
-        query["tags"] = tag
-    
-    if search:
-        query["$or"] = [
-            {"title": {"$regex": search, "$options": "i"}},
-            {"summary": {"$regex": search, "$options": "i"}},
-            {"content": {"$regex": search, "$options": "i"}}
-        ]
-    
-    # Get total count
-    total = await collection.count_documents(query)
-    pages = ceil(total / size) if total > 0 else 1
+    query = build_reports_query(
+        is_admin=bool(is_admin),
+        status=status,
+        tag=tag,
+        search=search,
+        match=match
+    )
     
-    # Get paginated results
     skip = (page - 1) * size
-    cursor = collection.find(query).sort("published_date", -1).skip(skip).limit(size)
-    
-    report_list = []
-    async for doc in cursor:
-        report_list.append(ReportModel.from_db(doc))
-    
-    return ReportListResponse(
-        items=[ReportResponse(**r) for r in report_list],
-        total=total,
-        page=page,
-        size=size,
-        pages=pages
-    )
+    page_from_feed = None
+    if not is_admin and settings.public_feed_reads:
+        # Public reads come pre-shaped from the published-only read model (None while it is rebuilt)
+        page_from_feed = await public_feed.find_page("reports", query, [("published_date", -1)], skip, size)
+    if page_from_feed is not None:
+        report_list, total = page_from_feed
+    else:
+        total = await collection.count_documents(query)
+        cursor = collection.find(query, read_projection(ReportResponse)).sort("published_date", -1).skip(skip).limit(size)
+        report_list = []
+        async for doc in cursor:
+            report_list.append(ReportModel.from_db(doc))
+    pages = ceil(total / size) if total > 0 else 1
+    tag_list("reports", report_list, {"tags": tag})
+    
+    return json_response(ReportListResponse, {
+        "items": report_list,
+        "total": total,
+        "page": page,
+        "size": size,
+        "pages": pages
+    })
+
+
+@router.get("/facets", response_model=FacetCountsResponse, dependencies=[Depends(rate_limit("search", query_param="search"))])
+async def get_report_facets(
+    tag: Optional[str] = None,
+    search: Optional[str] = None,
+    match: str = Query("literal", pattern=MATCH_MODES, description="How search/filter text is matched: literal or regex")
+):
+    """
+    Tag counts for published reports, narrowed by the active filters
+    """
+    query = build_reports_query(is_admin=False, tag=tag, search=search, match=match)
+    tag_list("reports", [], {"tags": tag})
+    return await get_facets("reports", query, {"tags": tag, "search": search}, match)
+
+
+@router.get("/by-ids", response_model=ReportByIdsResponse)
+async def get_reports_by_ids(
+    ids: str = Query(..., description="Comma-separated report IDs, returned in this order"),
+    current_user: Optional[dict] = Depends(get_optional_user)
+):
+    """
+    Get several reports by ID in one query
+    
+    - Public users: Only published reports
+    - Admin users: Any report
+    - IDs that do not exist, are malformed or are not visible are listed in `missing`
+    """
+    requested = parse_id_list(ids)
+    is_admin = current_user and current_user.get("role") == "admin"
+    query = build_ids_query(requested, None if is_admin else ReportStatus.PUBLISHED.value)
+    
+    documents = await get_reports_collection().find(query, read_projection(ReportResponse)).to_list(length=None)
+    found, missing = order_by_ids(requested, documents)
+    # Missing IDs are tagged too: publishing one of them changes this response
+    add_surrogate_keys(*(item_key("reports", doc_id) for doc_id in requested))
+    return json_response(ReportByIdsResponse, {
+        "items": [ReportModel.from_db(doc) for doc in found],
+        "missing": missing
+    })
 
 
 @router.get("/{report_id}", response_model=ReportResponse)
@@ -96,13 +144,22 @@ async def get_report_by_id(
     collection = get_reports_collection()
     
     try:
-        report = await collection.find_one({"_id": ObjectId(report_id)})
+        object_id = ObjectId(report_id)
     except:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid report ID format"
         )
     
+    add_surrogate_keys(item_key("reports", str(object_id)))
+    
+    # Read-through cache; concurrent misses for the same ID share one query
+    report = await document_cache.get(
+        "reports",
+        str(object_id),
+        lambda: collection.find_one({"_id": object_id}, read_projection(ReportResponse))
+    )
+    
     if report is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -117,7 +174,7 @@ async def get_report_by_id(
             detail="Report not found"
         )
     
-    return ReportResponse(**ReportModel.from_db(report))
+    return json_response(ReportResponse, ReportModel.from_db(report))
 
 
 # ============ ADMIN ENDPOINTS ============
@@ -132,6 +189,8 @@ async def create_report(
     """
     collection = get_reports_collection()
     
+    require_publish_date(report_data.status, report_data.published_date)
+    
     report_doc = ReportModel.create_document(
         title=report_data.title,
         summary=report_data.summary,
@@ -172,8 +231,9 @@ async def create_report(
         insight_block=report_data.insight_block
     )
     
-    result = await collection.insert_one(report_doc)
+    result = await insert_with_slug("reports", collection, report_doc)
     report_doc["_id"] = result.inserted_id
+    await emit_content_event("reports", document=report_doc)
     
     return ReportResponse(**ReportModel.from_db(report_doc))
 
@@ -210,14 +270,19 @@ async def update_report(
     if "status" in update_data and update_data["status"]:
         update_data["status"] = update_data["status"].value if hasattr(update_data["status"], "value") else update_data["status"]
     
-    update_data["updated_at"] = datetime.utcnow()
-    
-    await collection.update_one(
-        {"_id": ObjectId(report_id)},
-        {"$set": update_data}
+    require_publish_date(
+        update_data.get("status", existing.get("status")),
+        update_data.get("published_date", existing.get("published_date"))
     )
     
-    updated = await collection.find_one({"_id": ObjectId(report_id)})
+    update_data["updated_at"] = datetime.utcnow()
+    
+    updated = await update_and_emit(collection, ObjectId(report_id), update_data)
+    if updated is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report not found"
+        )
     return ReportResponse(**ReportModel.from_db(updated))
 
 
@@ -232,18 +297,20 @@ async def delete_report(
     collection = get_reports_collection()
     
     try:
-        result = await collection.delete_one({"_id": ObjectId(report_id)})
+        deleted = await collection.find_one_and_delete({"_id": ObjectId(report_id)})
     except:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid report ID format"
         )
     
-    if result.deleted_count == 0:
+    if deleted is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Report not found"
         )
+    
+    await emit_content_event("reports", previous=deleted)
 
 
 @router.patch("/{report_id}/status")
@@ -274,23 +341,23 @@ async def toggle_report_status(
     current_status = report.get("status", ReportStatus.DRAFT.value)
     new_status = ReportStatus.PUBLISHED.value if current_status == ReportStatus.DRAFT.value else ReportStatus.DRAFT.value
     
-    await collection.update_one(
-        {"_id": ObjectId(report_id)},
-        {"$set": {"status": new_status, "updated_at": datetime.utcnow()}}
-    )
-    
-    updated = await collection.find_one({"_id": ObjectId(report_id)})
+    updated = await update_and_emit(collection, ObjectId(report_id), {"status": new_status, "updated_at": datetime.utcnow()})
+    if updated is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report not found"
+        )
     return ReportResponse(**ReportModel.from_db(updated))
 
 
 @router.get("/tags/list")
 async def get_report_tags():
     """
-    Get list of all unique report tags
+    Get list of all tags used by published reports
     """
-    collection = get_reports_collection()
-    tags = await collection.distinct("tags")
-    return {"tags": tags}
+    add_surrogate_keys("reports")
+    facets = await get_facets("reports", {}, {})
+    return {"tags": sorted(facets["facets"]["tags"])}
 
 
 @router.post("/send-preview", response_model=SendPreviewResponse)
@@ -0,0 +1,45 @@
+"""
+Live update stream - Server-Sent Events for content changes
+"""
+from typing import Optional
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+from app.services.live_updates import live_updates, WATCHED_COLLECTIONS
+
+router = APIRouter(prefix="/stream", tags=["Live Updates"])
+
+
+@router.get("")
+async def stream_updates(collections: Optional[str] = None):
+    """
+    Subscribe to live content updates (Server-Sent Events)
+
+    - **collections**: Optional comma-separated filter
+      (`intelligence_cards`, `news`, `reports`); defaults to all, unknown
+      names are rejected with 400
+
+    Each event is named after its action (`publish`, `unpublish`, `feature`,
+    `unfeature`, `update`, `create`, `delete`) and carries
+    `{"type", "collection", "id", "status", "is_featured", "ts", "seq"}`.
+    Only changes visible to public readers are sent; clients refetch the
+    affected lists or items.
+    """
+    wanted = None
+    if collections:
+        wanted = {c.strip() for c in collections.split(",") if c.strip()}
+        unknown = wanted - set(WATCHED_COLLECTIONS)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown collections: {', '.join(sorted(unknown))}. Allowed: {', '.join(WATCHED_COLLECTIONS)}"
+            )
+
+    subscriber = live_updates.subscribe(wanted)
+    return StreamingResponse(
+        live_updates.event_stream(subscriber),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Disable proxy buffering
+        }
+    )
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from typing import List
 from datetime import datetime
 from bson import ObjectId
 
 from ..database import get_database
 from ..schemas.subscription import SubscriptionCreate, SubscriptionResponse
+from ..services.rate_limit import rate_limit
 
 router = APIRouter(prefix="/subscriptions", tags=["subscriptions"])
 
@@ -19,7 +20,7 @@ def subscription_helper(subscription) -> dict:
         "updated_at": subscription.get("updated_at")
     }
 
-@router.post("", response_model=SubscriptionResponse, status_code=201)
+@router.post("", response_model=SubscriptionResponse, status_code=201, dependencies=[Depends(rate_limit("subscribe"))])
 async def create_subscription(subscription_data: SubscriptionCreate):
     """Create a new subscription"""
     db = get_database()
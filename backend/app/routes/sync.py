@@ -0,0 +1,56 @@
+"""
+Delta sync - changes since a token, for incremental client and mirror refresh
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.dependencies import get_optional_user
+from app.schemas.sync import SyncResponse
+from app.services.related import RELATED_KINDS
+from app.services.sync import InvalidSyncToken, changes_since
+from app.utils.serialization import json_response
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+
+@router.get("", response_model=SyncResponse)
+async def sync_changes(
+    since: Optional[str] = Query(None, max_length=200, description="`next` from the previous call; omit for a full sync"),
+    kinds: Optional[str] = Query(None, description="Comma-separated kinds to include, e.g. news,reports"),
+    limit: int = Query(200, ge=1, le=1000),
+    current_user: Optional[dict] = Depends(get_optional_user)
+):
+    """
+    Documents created, updated, unpublished or deleted since `since`
+
+    - Call with the returned `next` until `has_more` is false, then poll with it
+    - Public users: published documents are upserts; unpublished and deleted
+      ones are removals
+    - Admin users: every document is an upsert; deleted ones are removals
+    - **410**: the token is older than tombstone retention; discard local
+      data and sync again without `since`
+    """
+    collections = list(RELATED_KINDS.values())
+    if kinds:
+        names = [name.strip() for name in kinds.split(",") if name.strip()]
+        unknown = [name for name in names if name not in RELATED_KINDS]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown kind. Allowed: {', '.join(RELATED_KINDS)}"
+            )
+        collections = [RELATED_KINDS[name] for name in dict.fromkeys(names)]
+    
+    is_admin = current_user and current_user.get("role") == "admin"
+    try:
+        result = await changes_since(since, collections, limit, is_admin=bool(is_admin))
+    except InvalidSyncToken:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid sync token"
+        )
+    except LookupError as e:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail=str(e)
+        )
+    return json_response(SyncResponse, result)
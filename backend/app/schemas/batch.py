@@ -0,0 +1,25 @@
+"""
+Request batching schemas
+"""
+from typing import Any, List, Literal, Optional
+from pydantic import BaseModel, Field
+
+
+class BatchSubRequest(BaseModel):
+    id: Optional[str] = Field(None, max_length=100)  # Echoed back to match responses
+    method: Literal["GET"] = "GET"
+    path: str = Field(..., min_length=1, max_length=2048)  # e.g. "/api/news?limit=5"
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest] = Field(..., min_length=1)
+
+
+class BatchSubResponse(BaseModel):
+    id: Optional[str] = None
+    status: int
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    responses: List[BatchSubResponse]
@@ -0,0 +1,11 @@
+"""
+Facet count schemas
+"""
+from typing import Dict
+from pydantic import BaseModel
+
+
+class FacetCountsResponse(BaseModel):
+    total: int = 0  # Published documents matching the filters
+    facets: Dict[str, Dict[str, int]] = {}  # field -> value -> count, most common first
+    source: str = "index"  # "index" (maintained counts) or "aggregate" (computed for these filters)
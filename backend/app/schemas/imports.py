@@ -0,0 +1,22 @@
+"""
+Bulk import schemas
+"""
+from typing import List
+from pydantic import BaseModel
+
+
+class ImportFailure(BaseModel):
+    line: int
+    slug: str = ""
+    error: str
+
+
+class ImportReportResponse(BaseModel):
+    kind: str
+    dry_run: bool = False
+    processed: int = 0
+    inserted: int = 0
+    updated: int = 0
+    failed: int = 0
+    failures: List[ImportFailure] = []
+    failures_truncated: bool = False
@@ -149,6 +149,36 @@ class IntelligenceCardListResponse(BaseModel):
     pages: int
 
 
+# Linked report summary embedded with expand=report
+class LinkedReportSummary(BaseModel):
+    id: str
+    title: str
+    subtitle: Optional[str] = None
+    label: Optional[str] = None
+    tier: Optional[str] = None
+    reading_time: Optional[int] = None
+    cover_image_url: Optional[str] = None
+    published_date: Optional[datetime] = None
+
+
+class IntelligenceCardExpandedResponse(IntelligenceCardResponse):
+    report: Optional[LinkedReportSummary] = None
+    report_missing: bool = False  # report_id is set but the report does not exist (or is not visible)
+
+
+class IntelligenceCardExpandedListResponse(BaseModel):
+    items: List[IntelligenceCardExpandedResponse]
+    total: int
+    page: int
+    size: int
+    pages: int
+
+
+class IntelligenceCardByIdsResponse(BaseModel):
+    items: List[IntelligenceCardResponse]  # In requested order
+    missing: List[str] = []  # Requested IDs not found (or not visible)
+
+
 # Platform statistics response
 class PlatformStatsResponse(BaseModel):
     total_analyses: int
@@ -165,3 +195,4 @@ class AdminStatsResponse(BaseModel):
     published_cards: int
     draft_cards: int
     featured_cards: int
+    scheduled_cards: int = 0
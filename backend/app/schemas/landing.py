@@ -0,0 +1,14 @@
+"""
+Landing page bundle schema
+"""
+from typing import List, Optional
+from pydantic import BaseModel
+from app.schemas.intelligence_card import IntelligenceCardResponse, PlatformStatsResponse
+from app.schemas.news import NewsResponse
+
+
+class LandingResponse(BaseModel):
+    stats: PlatformStatsResponse
+    cards: List[IntelligenceCardResponse]
+    featured: Optional[IntelligenceCardResponse] = None
+    news: List[NewsResponse]
@@ -91,3 +91,8 @@ class NewsListResponse(BaseModel):
     page: int
     size: int
     pages: int
+
+
+class NewsByIdsResponse(BaseModel):
+    items: List[NewsResponse]  # In requested order
+    missing: List[str] = []  # Requested IDs not found (or not visible)
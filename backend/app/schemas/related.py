@@ -0,0 +1,24 @@
+"""
+Related content schemas
+"""
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class RelatedItem(BaseModel):
+    kind: str  # "news", "reports" or "intelligence_cards"
+    id: str
+    title: str
+    slug: Optional[str] = None
+    company: Optional[str] = None
+    category: Optional[str] = None
+    tier: Optional[str] = None
+    published_date: Optional[datetime] = None
+    score: float
+
+
+class RelatedItemsResponse(BaseModel):
+    kind: str
+    id: str
+    items: List[RelatedItem] = []
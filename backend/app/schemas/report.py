@@ -148,6 +148,11 @@ class ReportListResponse(BaseModel):
     pages: int
 
 
+class ReportByIdsResponse(BaseModel):
+    items: List[ReportResponse]  # In requested order
+    missing: List[str] = []  # Requested IDs not found (or not visible)
+
+
 # Send Preview Schema
 class SendPreviewRequest(BaseModel):
     to_email: str = Field(..., description="Manager's email address")
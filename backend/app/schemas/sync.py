@@ -0,0 +1,21 @@
+"""
+Delta sync schemas
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel
+
+
+class SyncChange(BaseModel):
+    kind: str  # "news", "reports" or "intelligence_cards"
+    id: str
+    updated_at: datetime
+    action: Literal["upsert", "remove"]
+    reason: Optional[Literal["unpublished", "deleted"]] = None  # Set for removals
+    item: Optional[Dict[str, Any]] = None  # The document as its get-by-id endpoint returns it (upserts)
+
+
+class SyncResponse(BaseModel):
+    changes: List[SyncChange]
+    next: str  # Pass as `since` on the next call
+    has_more: bool  # More changes are ready; call again right away
@@ -0,0 +1,173 @@
+"""
+In-process execution of batched API reads
+
+Each sub-request of POST /api/batch is dispatched through the application's
+own ASGI stack (middleware, exception handlers, routing, dependencies) with
+a synthetic scope, so it behaves exactly like the same GET sent over HTTP.
+Nothing goes over the network and the sub-requests run concurrently.
+
+The caller's Authorization header is forwarded, and the user it resolved
+to is attached to the scope (`batch_auth`) so the auth dependencies skip
+the token check and user lookup for every sub-request (see
+dependencies.py). Response bodies count against one byte budget shared by
+the whole batch; a sub-request whose body would overrun it is cut off and
+reported as 413.
+"""
+import asyncio
+import json
+import posixpath
+from dataclasses import dataclass, field
+from typing import List, Optional
+from urllib.parse import unquote, urlsplit
+from fastapi import status
+
+# Streaming and nested batch endpoints cannot be batched
+BLOCKED_PREFIXES = ("/api/batch", "/api/stream", "/api/export")
+
+# Caller headers passed on to sub-requests
+FORWARDED_HEADERS = (b"authorization", b"host", b"user-agent", b"x-forwarded-for", b"accept-language")
+
+
+class ResponseTooLarge(Exception):
+    """A sub-response overran the batch byte budget"""
+
+
+@dataclass
+class ByteBudget:
+    """Response bytes the batch may still return"""
+    remaining: int
+
+    def take(self, size: int):
+        if size > self.remaining:
+            self.remaining = 0
+            raise ResponseTooLarge()
+        self.remaining -= size
+
+
+@dataclass
+class SubResponse:
+    status: int
+    content_type: str = ""
+    chunks: List[bytes] = field(default_factory=list)
+
+    @property
+    def body(self) -> bytes:
+        return b"".join(self.chunks)
+
+    def body_json(self) -> bytes:
+        """The body as a JSON value: spliced as-is if it is JSON, else a string"""
+        body = self.body
+        if self.content_type.startswith("application/json") and body:
+            return body
+        return json.dumps(body.decode("utf-8", "replace")).encode()
+
+
+def _error(status_code: int, detail: str) -> SubResponse:
+    return SubResponse(status_code, "application/json", [json.dumps({"detail": detail}, separators=(",", ":")).encode()])
+
+
+def validate_path(path: str) -> Optional[str]:
+    """
+    Reason a sub-request path cannot be batched, or None if it can
+
+    The blocklist is checked against the decoded, normalised path, i.e.
+    what routing will see (e.g. /api/%73tream and /api/news/../stream are
+    /api/stream).
+    """
+    parts = urlsplit(path)
+    decoded = unquote(parts.path)
+    normalised = posixpath.normpath(decoded)
+    if parts.scheme or parts.netloc or not decoded.startswith("/api/") or not normalised.startswith("/api/"):
+        return "Sub-request paths must be relative /api/ paths"
+    if any(
+        candidate == prefix or candidate.startswith(prefix + "/")
+        for candidate in (decoded, normalised)
+        for prefix in BLOCKED_PREFIXES
+    ):
+        return "This endpoint cannot be batched"
+    return None
+
+
+def _sub_scope(parent: dict, path: str, auth: Optional[tuple]) -> dict:
+    parts = urlsplit(path)
+    headers = [(name, value) for name, value in parent["headers"] if name in FORWARDED_HEADERS]
+    headers.append((b"accept", b"application/json"))
+    scope = {
+        "type": "http",
+        "asgi": parent.get("asgi", {"version": "3.0"}),
+        "http_version": parent.get("http_version", "1.1"),
+        "method": "GET",
+        "scheme": parent.get("scheme", "http"),
+        "server": parent.get("server"),
+        "client": parent.get("client"),
+        "root_path": parent.get("root_path", ""),
+        "path": unquote(parts.path),
+        "raw_path": parts.path.encode(),
+        "query_string": parts.query.encode(),
+        "headers": headers,
+        "state": {},
+    }
+    if auth is not None:
+        scope["batch_auth"] = auth
+    return scope
+
+
+async def run_sub_request(app, parent_scope: dict, path: str, auth: Optional[tuple], budget: ByteBudget) -> SubResponse:
+    """
+    Dispatch a GET for `path` through `app` and collect its response
+
+    Args:
+        app: The ASGI application (request.app)
+        parent_scope: Scope of the batch request (client, server, headers)
+        path: Path with query string, e.g. "/api/news?limit=5"
+        auth: (token, user) resolved for the caller, or None
+        budget: Shared response byte budget
+    """
+    invalid = validate_path(path)
+    if invalid:
+        return _error(status.HTTP_400_BAD_REQUEST, invalid)
+
+    response = SubResponse(status.HTTP_500_INTERNAL_SERVER_ERROR)
+    finished = asyncio.Event()
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response.status = message["status"]
+            for name, value in message.get("headers", []):
+                if name.lower() == b"content-type":
+                    response.content_type = value.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            chunk = message.get("body", b"")
+            budget.take(len(chunk))
+            response.chunks.append(chunk)
+            if not message.get("more_body", False):
+                finished.set()
+
+    try:
+        await app(_sub_scope(parent_scope, path, auth), receive, send)
+    except ResponseTooLarge:
+        return _error(status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, "Batch response size limit reached")
+    except Exception as e:
+        # The server error middleware re-raises after answering 500
+        print(f"[BATCH] Sub-request {path} failed: {str(e)}")
+        return _error(status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal server error")
+    finally:
+        finished.set()
+    return response
+
+
+async def run_batch(app, parent_scope: dict, paths: List[str], auth: Optional[tuple], max_bytes: int) -> List[SubResponse]:
+    """Run sub-requests concurrently; responses come back in request order"""
+    budget = ByteBudget(max_bytes)
+    return await asyncio.gather(*(
+        run_sub_request(app, parent_scope, path, auth, budget) for path in paths
+    ))
@@ -0,0 +1,68 @@
+"""
+In-process response cache for public read endpoints
+
+Entries are tagged with the collections they were built from and dropped
+when a content event touches any of those collections. Invalidation is
+registered as a batch listener, so a batch of changes (e.g. a scheduler
+run publishing many cards) clears each tag once.
+"""
+import time
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+from app.config import settings
+from app.services.events import ContentEvent, content_events
+
+# Sentinel for cache misses (None is a valid cached value, e.g. no featured card)
+MISS = object()
+
+
+class ResponseCache:
+    """TTL cache with tag-based invalidation"""
+
+    def __init__(self):
+        self._store: Dict[Hashable, Tuple[float, Any]] = {}
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or MISS if absent or expired"""
+        entry = self._store.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self.misses += 1
+            return MISS
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[str], ttl: Optional[float] = None):
+        """Store a value under `key`, invalidated by any of `tags`"""
+        ttl = settings.response_cache_ttl_seconds if ttl is None else ttl
+        if ttl <= 0:
+            return
+        self._store[key] = (time.monotonic() + ttl, value)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """Drop every entry carrying one of `tags`; returns the number removed"""
+        removed = 0
+        for tag in set(tags):
+            for key in self._tags.pop(tag, ()):
+                if self._store.pop(key, None) is not None:
+                    removed += 1
+        return removed
+
+    def clear(self):
+        self._store.clear()
+        self._tags.clear()
+
+
+# Global cache instance
+response_cache = ResponseCache()
+
+
+def _invalidate_on_change(events: List[ContentEvent]):
+    """Batch listener: invalidate each touched collection once"""
+    response_cache.invalidate({event.collection for event in events})
+
+
+content_events.register_batch(_invalidate_on_change)
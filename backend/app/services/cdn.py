@@ -0,0 +1,275 @@
+"""
+CDN cache tags (Surrogate-Key) and purges
+
+Public read routes register the surrogate keys their response depends on
+with `add_surrogate_keys()`. For anonymous 2xx GET responses that have
+keys, `SurrogateKeyMiddleware` adds a `Surrogate-Key` header and a
+`Cache-Control` that lets shared caches keep the response for
+`cdn_s_maxage_seconds` and serve it stale while revalidating. Requests
+with an Authorization header (admins see drafts) are marked private.
+
+Keys:
+    news / reports / cards        every list whose membership any change may affect
+    news:<id> / report:<id> / card:<id>   responses containing that item
+    related:<item key>            an item's related-content list
+    <field>:<value>               lists filtered on an exact-match field (e.g. tier:tier_1);
+                                  these are not tagged with the kind key
+
+A change to a published (or previously published) item purges its item
+key, its kind key and the <field>:<value> keys of its old and new values,
+which are exactly the responses it may appear in or be missing from
+(the field keys are skipped when only LIST_NEUTRAL_FIELDS changed, e.g.
+toggling the featured card).
+Draft-only edits purge nothing. Related lists are recomputed in the
+background, so services/related.py purges them once they are rewritten. Purges are queued by `cdn_purger`,
+flushed in batches and retried with backoff through a pluggable client:
+`HttpPurgeClient` (Fastly-style JSON batch purge, or any local stand-in
+listening on `cdn_purge_url`) or `LoggingPurgeClient` when no URL is set.
+"""
+import asyncio
+import contextvars
+from typing import Iterable, List, Optional, Set
+import httpx
+from app.config import settings
+from app.services.events import ContentEvent, PUBLISHED_STATUS, content_events
+from app.services.facets import EXACT_FILTER_FIELDS
+
+# Collection -> list key and item key prefix
+KIND_KEYS = {"news": "news", "reports": "reports", "intelligence_cards": "cards"}
+ITEM_PREFIXES = {"news": "news", "reports": "report", "intelligence_cards": "card"}
+
+# Fields no filtered list selects or sorts on (featured flag, landing order):
+# changing only these purges the item and list keys but no <field>:<value> keys
+LIST_NEUTRAL_FIELDS = {"is_featured", "display_order", "updated_at"}
+
+# Fastly rejects Surrogate-Key headers above 16KB
+MAX_HEADER_LENGTH = 16384
+
+_request_keys: contextvars.ContextVar[Optional[Set[str]]] = contextvars.ContextVar("surrogate_keys", default=None)
+
+
+def item_key(collection: str, doc_id: str) -> str:
+    return f"{ITEM_PREFIXES[collection]}:{doc_id}"
+
+
+def related_key(collection: str, doc_id: str) -> str:
+    """Key of an item's related-content list (purged when the stored list is rewritten)"""
+    return f"related:{item_key(collection, doc_id)}"
+
+
+def add_surrogate_keys(*keys: str):
+    """Record keys for the current response (no-op outside a request)"""
+    current = _request_keys.get()
+    if current is not None:
+        current.update(keys)
+
+
+def tag_items(collection: str, items: Iterable[Optional[dict]]):
+    """Tag a response with the item keys of response-shaped documents"""
+    add_surrogate_keys(*(item_key(collection, item["id"]) for item in items if item))
+
+
+def tag_list(collection: str, items: Iterable[Optional[dict]], filters: Optional[dict] = None):
+    """
+    Tag a list response: its items, plus its exact-filter keys or, when it
+    has none, the collection's list key
+    """
+    filters = filters or {}
+    exact = [f"{field}:{filters[field]}" for field in EXACT_FILTER_FIELDS.get(collection, []) if filters.get(field)]
+    add_surrogate_keys(*(exact or [KIND_KEYS[collection]]))
+    tag_items(collection, items)
+
+
+def _field_values(document: dict, field: str) -> List[str]:
+    value = document.get(field)
+    values = value if isinstance(value, list) else [value]
+    return [str(item) for item in values if item not in (None, "")]
+
+
+def purge_keys(event: ContentEvent) -> Set[str]:
+    """Keys whose responses may change with `event`"""
+    if event.collection not in KIND_KEYS or not event.is_public:
+        return set()
+    keys = {item_key(event.collection, event.id), KIND_KEYS[event.collection]}
+    if event.previous and event.document:
+        changed = {
+            name for name in set(event.previous) | set(event.document)
+            if event.previous.get(name) != event.document.get(name)
+        }
+        if changed <= LIST_NEUTRAL_FIELDS:
+            return keys
+    for document in (event.previous, event.document):
+        if document and document.get("status") == PUBLISHED_STATUS:
+            for field in EXACT_FILTER_FIELDS.get(event.collection, []):
+                keys.update(f"{field}:{value}" for value in _field_values(document, field))
+    return keys
+
+
+class SurrogateKeyMiddleware:
+    """Pure ASGI middleware adding CDN headers to tagged public GET responses"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD") or settings.cdn_s_maxage_seconds <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        keys: Set[str] = set()
+        token = _request_keys.set(keys)
+        authenticated = any(name == b"authorization" for name, _ in scope["headers"])
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and keys and 200 <= message["status"] < 300 and not _no_store(message):
+                headers = [(name, value) for name, value in message.get("headers", []) if name.lower() != b"cache-control"]
+                if authenticated:
+                    headers.append((b"cache-control", b"private, no-store"))
+                else:
+                    headers.append((b"cache-control", (
+                        f"public, max-age=0, s-maxage={settings.cdn_s_maxage_seconds}, "
+                        f"stale-while-revalidate={settings.cdn_stale_while_revalidate_seconds}"
+                    ).encode()))
+                    headers.append((b"surrogate-key", _header_value(keys).encode()))
+                    headers.append((b"vary", b"Authorization"))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_keys.reset(token)
+
+
+def _no_store(message) -> bool:
+    """True if the app already marked the response uncacheable (e.g. a snapshot fallback)"""
+    return any(
+        name.lower() == b"cache-control" and b"no-store" in value.lower()
+        for name, value in message.get("headers", [])
+    )
+
+
+def _header_value(keys: Set[str]) -> str:
+    value = " ".join(sorted(keys))
+    if len(value) > MAX_HEADER_LENGTH:
+        # Too many item keys: keep the list and filter keys, which still cover every purge
+        value = " ".join(sorted(key for key in keys if key.split(":", 1)[0] not in ITEM_PREFIXES.values()))
+    return value
+
+
+# ============ PURGING ============
+
+class LoggingPurgeClient:
+    """Purge client used when no CDN is configured: logs what would be purged"""
+
+    async def purge(self, keys: List[str]):
+        print(f"[CDN] Purge (no CDN configured): {' '.join(keys)}")
+
+
+class HttpPurgeClient:
+    """
+    Batch purge over HTTP
+
+    POSTs {"surrogate_keys": [...]} to `url`, the format of Fastly's batch
+    surrogate-key purge, with the API token in `token_header`.
+    """
+
+    def __init__(self, url: str, token: Optional[str] = None, token_header: str = "Fastly-Key", timeout: float = 10.0):
+        self.url = url
+        self.headers = {token_header: token} if token else {}
+        self.timeout = timeout
+
+    async def purge(self, keys: List[str]):
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.post(self.url, json={"surrogate_keys": keys}, headers=self.headers)
+            response.raise_for_status()
+
+
+def build_purge_client():
+    if settings.cdn_purge_url:
+        return HttpPurgeClient(settings.cdn_purge_url, settings.cdn_purge_token, settings.cdn_purge_token_header)
+    return LoggingPurgeClient()
+
+
+class CdnPurger:
+    """Queues purge keys from content events and flushes them in retried batches"""
+
+    def __init__(self, client=None):
+        self.client = client
+        self._pending: Set[str] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.purged = 0
+        self.failed = 0
+
+    def queue(self, keys: Iterable[str]):
+        if self._wakeup is None:
+            return
+        self._pending.update(keys)
+        if self._pending:
+            self._wakeup.set()
+
+    def on_content_events(self, events: List[ContentEvent]):
+        """Batch listener: purge what the changes affect"""
+        for event in events:
+            self.queue(purge_keys(event))
+
+    async def _send(self, keys: List[str]) -> bool:
+        delay = 1.0
+        for attempt in range(settings.cdn_purge_max_retries + 1):
+            try:
+                await self.client.purge(keys)
+                return True
+            except Exception as e:
+                if attempt == settings.cdn_purge_max_retries:
+                    print(f"[CDN] Purge of {len(keys)} key(s) failed, giving up: {str(e)}")
+                    return False
+                print(f"[CDN] Purge failed, retrying in {delay:.0f}s: {str(e)}")
+                await asyncio.sleep(delay)
+                delay *= 2
+        return False
+
+    async def flush(self):
+        """Send every pending key, `cdn_purge_batch_size` keys per call"""
+        keys = sorted(self._pending)
+        self._pending.clear()
+        for start in range(0, len(keys), settings.cdn_purge_batch_size):
+            batch = keys[start:start + settings.cdn_purge_batch_size]
+            if await self._send(batch):
+                self.purged += len(batch)
+            else:
+                self.failed += len(batch)
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            # Let the rest of a burst of writes join this batch
+            await asyncio.sleep(settings.cdn_purge_delay_ms / 1000)
+            await self.flush()
+
+    def start(self):
+        if self._task is not None:
+            return
+        if self.client is None:
+            self.client = build_purge_client()
+        self._wakeup = asyncio.Event()
+        content_events.register_batch(self.on_content_events)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        content_events.unregister(self.on_content_events)
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pending:
+            await self.flush()
+        self._wakeup = None
+
+
+# Global purger (started in the app lifespan)
+cdn_purger = CdnPurger()
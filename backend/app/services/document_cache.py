@@ -0,0 +1,168 @@
+"""
+Read-through cache for single documents fetched by ID
+
+Get-by-id endpoints load documents through `document_cache.get()`, keyed by
+collection and `_id`. Entries are fresh for `document_cache_ttl_seconds`;
+for `document_cache_stale_seconds` after that a lookup still returns the
+old document immediately and refreshes it in the background. Concurrent
+misses for the same key share one MongoDB read (single flight), which is
+what absorbs the burst of requests for a freshly published report.
+
+The cache is an LRU bounded by the BSON size of its documents
+(`document_cache_max_bytes`). Every content event drops the entry for the
+changed document, and a load that was in flight when its document changed
+is not stored, so a write is visible to the next read in this process.
+
+Callers receive the cached dict itself and must not modify it.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+import bson
+from app.config import settings
+from app.services.events import ContentEvent, content_events
+from app.services.metrics import document_cache_bytes, document_cache_requests_total
+from app.utils.background import query_budget, spawn_background
+
+CacheKey = Tuple[str, str]  # (collection, document id)
+Loader = Callable[[], Awaitable[Optional[dict]]]
+
+
+async def _with_query_budget(loader: Loader) -> Optional[dict]:
+    with query_budget():
+        return await loader()
+
+
+class _Entry:
+    __slots__ = ("document", "size", "fresh_until", "stale_until")
+
+    def __init__(self, document: dict, size: int, fresh_until: float, stale_until: float):
+        self.document = document
+        self.size = size
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class DocumentCache:
+    """Byte-bounded LRU of documents with TTL, single-flight loads and stale-while-revalidate"""
+
+    def __init__(self):
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, collection: str, doc_id: str, loader: Loader) -> Optional[dict]:
+        """
+        Return the document for (`collection`, `doc_id`), loading it on a miss
+
+        Args:
+            collection: Collection name (the invalidation key)
+            doc_id: Canonical document ID string
+            loader: Coroutine function reading the document from MongoDB;
+                None results (not found) are returned but not cached
+        """
+        if settings.document_cache_ttl_seconds <= 0:
+            return await loader()
+
+        key = (collection, doc_id)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if now < entry.fresh_until:
+                self._entries.move_to_end(key)
+                document_cache_requests_total.inc(collection, "hit")
+                return entry.document
+            if now < entry.stale_until:
+                # Serve the old copy now; one background load replaces it
+                self._entries.move_to_end(key)
+                document_cache_requests_total.inc(collection, "stale")
+                if key not in self._inflight:
+                    self._start_load(key, loader, background=True)
+                return entry.document
+            self._remove(key)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            document_cache_requests_total.inc(collection, "coalesced")
+            return await asyncio.shield(inflight)
+        document_cache_requests_total.inc(collection, "miss")
+        return await asyncio.shield(self._start_load(key, loader))
+
+    def _start_load(self, key: CacheKey, loader: Loader, background: bool = False) -> asyncio.Future:
+        if background:
+            # Outlives the request that noticed the stale entry: give it its own time budget
+            future = spawn_background(_with_query_budget(loader))
+        else:
+            future = asyncio.ensure_future(loader())
+        self._inflight[key] = future
+        future.add_done_callback(lambda done: self._finish_load(key, done))
+        return future
+
+    def _finish_load(self, key: CacheKey, future: asyncio.Future):
+        if self._inflight.get(key) is not future:
+            return  # Invalidated while loading; do not store the old read
+        del self._inflight[key]
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            print(f"[DOC-CACHE] Load of {key[0]}/{key[1]} failed: {str(future.exception())}")
+            return
+        document = future.result()
+        if document is not None:
+            self._store(key, document)
+
+    def _store(self, key: CacheKey, document: dict):
+        size = len(bson.encode(document))
+        if size > settings.document_cache_max_bytes:
+            return
+        self._remove(key)
+        now = time.monotonic()
+        fresh_until = now + settings.document_cache_ttl_seconds
+        self._entries[key] = _Entry(document, size, fresh_until, fresh_until + settings.document_cache_stale_seconds)
+        self.size += size
+        while self.size > settings.document_cache_max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+        document_cache_bytes.set(self.size)
+
+    def _remove(self, key: CacheKey):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+            document_cache_bytes.set(self.size)
+
+    def invalidate(self, collection: str, doc_id: str):
+        """Drop a document and detach any load of it that is in flight"""
+        key = (collection, doc_id)
+        self._remove(key)
+        self._inflight.pop(key, None)
+
+    def invalidate_collection(self, collection: str):
+        """Drop every document of a collection (e.g. after a bulk import)"""
+        for key in [key for key in self._entries if key[0] == collection]:
+            self._remove(key)
+        for key in [key for key in self._inflight if key[0] == collection]:
+            del self._inflight[key]
+
+    def clear(self):
+        self._entries.clear()
+        self._inflight.clear()
+        self.size = 0
+        document_cache_bytes.set(0)
+
+
+# Global document cache instance
+document_cache = DocumentCache()
+
+
+def _invalidate_on_change(events: List[ContentEvent]):
+    """Batch listener: drop every changed document"""
+    for event in events:
+        document_cache.invalidate(event.collection, event.id)
+
+
+content_events.register_batch(_invalidate_on_change)
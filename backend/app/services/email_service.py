@@ -1,14 +1,11 @@
 """
 Email service for sending report previews and notifications
 """
-import smtplib
-import ssl
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from typing import Optional
 from concurrent.futures import ThreadPoolExecutor
 import asyncio
 from app.config import settings
+from app.services.metrics import email_sends_total
 
 # Thread pool for running sync SMTP in async context
 _executor = ThreadPoolExecutor(max_workers=2)
@@ -48,8 +45,15 @@ class EmailService:
             # For development, just return True (simulated send)
             print(f"[DEV MODE] Email would be sent to: {to_email}")
             print(f"[DEV MODE] Subject: {subject}")
+            email_sends_total.inc("preview", "simulated")
             return True
         
+        # SMTP/MIME modules are only loaded when an email is actually sent
+        import smtplib
+        import ssl
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+        
         try:
             # Create message container
             msg = MIMEMultipart("alternative")
@@ -194,10 +198,12 @@ This email was sent from Replaceable.ai Reports System
                     msg.as_string()
                 )
             
+            email_sends_total.inc("preview", "sent")
             return True
             
         except Exception as e:
             print(f"Email send error: {str(e)}")
+            email_sends_total.inc("preview", "failed")
             raise e
 
     @staticmethod
@@ -224,8 +230,15 @@ This email was sent from Replaceable.ai Reports System
         if not settings.email_configured:
             print(f"[DEV MODE] Email would be sent to: {to_email}")
             print(f"[DEV MODE] Subject: {subject}")
+            email_sends_total.inc("generic", "simulated")
             return True
         
+        # SMTP/MIME modules are only loaded when an email is actually sent
+        import smtplib
+        import ssl
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+        
         def _send_sync():
             """Synchronous email sending function"""
             try:
@@ -270,10 +283,12 @@ This email was sent from Replaceable.ai Reports System
             # Run sync SMTP in thread pool to avoid blocking
             loop = asyncio.get_event_loop()
             result = await loop.run_in_executor(_executor, _send_sync)
+            email_sends_total.inc("generic", "sent")
             return result
             
         except Exception as e:
             print(f"[EMAIL ERROR] Exception: {str(e)}")
+            email_sends_total.inc("generic", "failed")
             raise e
 
 
@@ -0,0 +1,185 @@
+"""
+In-process content event hub
+
+Route handlers emit a ContentEvent after every write to news, reports or
+intelligence cards. Other services (live updates, caches, ...) register
+listeners here instead of being called from each handler directly.
+
+Listeners keep derived state (facet counts, the public feed, sync
+tombstones) in step with the write, so `emit` waits for them, but they run
+outside the request's query deadline: each listener gets its own
+`query_max_time_ms` budget, and a client disconnecting does not cancel
+them halfway.
+"""
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional, Union
+from pymongo import ReturnDocument
+from app.utils.background import query_budget, spawn_background
+
+# Event actions
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+PUBLISH = "publish"
+UNPUBLISH = "unpublish"
+FEATURE = "feature"
+UNFEATURE = "unfeature"
+
+PUBLISHED_STATUS = "published"
+
+
+@dataclass
+class ContentEvent:
+    """A single content change"""
+    collection: str  # "news", "reports" or "intelligence_cards"
+    action: str
+    id: str
+    document: Optional[dict] = None  # Raw document after the change (None for deletes)
+    previous: Optional[dict] = None  # Raw document before the change, when known
+    timestamp: datetime = field(default_factory=datetime.utcnow)
+
+    @property
+    def is_public(self) -> bool:
+        """True if the change is visible to (or removes something from) public readers"""
+        was_published = bool(self.previous) and self.previous.get("status") == PUBLISHED_STATUS
+        is_published = bool(self.document) and self.document.get("status") == PUBLISHED_STATUS
+        return was_published or is_published or (self.action == DELETE and self.previous is None)
+
+
+def derive_action(previous: Optional[dict], document: Optional[dict]) -> str:
+    """
+    Classify a change from its before/after documents
+
+    Status transitions win over featured toggles, which win over plain updates.
+    """
+    if document is None:
+        return DELETE
+    if previous is None:
+        return PUBLISH if document.get("status") == PUBLISHED_STATUS else CREATE
+
+    was_published = previous.get("status") == PUBLISHED_STATUS
+    is_published = document.get("status") == PUBLISHED_STATUS
+    if is_published and not was_published:
+        return PUBLISH
+    if was_published and not is_published:
+        return UNPUBLISH
+
+    was_featured = bool(previous.get("is_featured"))
+    is_featured = bool(document.get("is_featured"))
+    if is_featured and not was_featured:
+        return FEATURE
+    if was_featured and not is_featured:
+        return UNFEATURE
+    return UPDATE
+
+
+Listener = Callable[[ContentEvent], Union[None, Awaitable[None]]]
+BatchListener = Callable[[List[ContentEvent]], Union[None, Awaitable[None]]]
+
+
+async def _call(listener, arg):
+    """Invoke a sync or async listener under its own query budget, logging instead of raising"""
+    try:
+        with query_budget():
+            result = listener(arg)
+            if asyncio.iscoroutine(result):
+                await result
+    except Exception as e:
+        print(f"[EVENTS] Listener {getattr(listener, '__name__', listener)} failed: {str(e)}")
+
+
+class ContentEventHub:
+    """Fan-out of content events to registered listeners"""
+
+    def __init__(self):
+        self._listeners: List[Listener] = []
+        self._batch_listeners: List[BatchListener] = []
+
+    def register(self, listener: Listener):
+        """Register a sync or async per-event listener (called in registration order)"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def register_batch(self, listener: BatchListener):
+        """Register a listener that receives each emitted batch once (e.g. cache invalidation)"""
+        if listener not in self._batch_listeners:
+            self._batch_listeners.append(listener)
+
+    def unregister(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+        if listener in self._batch_listeners:
+            self._batch_listeners.remove(listener)
+
+    async def emit(self, event: ContentEvent):
+        """Deliver one event to every listener; listener errors are logged, not raised"""
+        await self.emit_many([event])
+
+    async def emit_many(self, events: List[ContentEvent]):
+        """Deliver a batch: per-event listeners see each event, batch listeners see the list once"""
+        if not events:
+            return
+        await asyncio.shield(spawn_background(self._deliver(events)))
+
+    async def _deliver(self, events: List[ContentEvent]):
+        for listener in self._listeners:
+            for event in events:
+                await _call(listener, event)
+        for listener in self._batch_listeners:
+            await _call(listener, events)
+
+
+# Global hub instance
+content_events = ContentEventHub()
+
+
+async def emit_content_event(
+    collection: str,
+    document: Optional[dict] = None,
+    previous: Optional[dict] = None,
+    doc_id: Optional[str] = None,
+    action: Optional[str] = None
+):
+    """
+    Emit a change for one document
+
+    Args:
+        collection: Collection name
+        document: Raw document after the change (None for deletes)
+        previous: Raw document before the change (None for creates)
+        doc_id: Document ID when neither document is available
+        action: Override the action derived from previous/document
+    """
+    source = document or previous or {}
+    event = ContentEvent(
+        collection=collection,
+        action=action or derive_action(previous, document),
+        id=str(doc_id or source.get("_id")),
+        document=document,
+        previous=previous
+    )
+    await content_events.emit(event)
+
+
+async def update_and_emit(collection, doc_id, fields: dict) -> Optional[dict]:
+    """
+    `$set` fields on a document and emit the change; returns the updated document
+
+    The previous document is the one MongoDB replaced (find_one_and_update
+    returning the before image) and the new one is that document with
+    `fields` applied, so concurrent writes to the same document each emit
+    their own exact before/after pair and incrementally maintained state
+    (facet counts) does not drift. Returns None if the document is gone.
+    """
+    previous = await collection.find_one_and_update(
+        {"_id": doc_id},
+        {"$set": fields},
+        return_document=ReturnDocument.BEFORE
+    )
+    if previous is None:
+        return None
+    updated = {**previous, **fields}
+    await emit_content_event(collection.name, document=updated, previous=previous)
+    return updated
@@ -0,0 +1,110 @@
+"""
+Export service - streams MongoDB cursors as NDJSON or CSV
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, List, Optional
+from bson import ObjectId
+
+# Flush to the client once this many bytes are buffered
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+# Documents fetched per round-trip from MongoDB
+EXPORT_CURSOR_BATCH_SIZE = 500
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _json_default(value: Any):
+    """JSON encoder fallback for BSON/driver types"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _csv_cell(value: Any) -> Any:
+    """Flatten a value into a single CSV cell"""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default, ensure_ascii=False)
+    return value
+
+
+class ExportService:
+    """Service class for streaming exports"""
+
+    @staticmethod
+    async def stream_ndjson(
+        cursor,
+        transform: Callable[[dict], dict]
+    ) -> AsyncIterator[bytes]:
+        """
+        Encode each cursor document as one JSON line
+
+        Args:
+            cursor: Motor cursor (iterated lazily)
+            transform: Converts a raw document to its API shape (e.g. NewsModel.from_db)
+
+        Yields:
+            Byte chunks of roughly EXPORT_CHUNK_BYTES
+        """
+        buffer: List[bytes] = []
+        size = 0
+        async for doc in cursor.batch_size(EXPORT_CURSOR_BATCH_SIZE):
+            line = json.dumps(transform(doc), default=_json_default, ensure_ascii=False)
+            encoded = (line + "\n").encode("utf-8")
+            buffer.append(encoded)
+            size += len(encoded)
+            if size >= EXPORT_CHUNK_BYTES:
+                yield b"".join(buffer)
+                buffer.clear()
+                size = 0
+        if buffer:
+            yield b"".join(buffer)
+
+    @staticmethod
+    async def stream_csv(
+        cursor,
+        transform: Callable[[dict], dict],
+        columns: List[str]
+    ) -> AsyncIterator[bytes]:
+        """
+        Encode cursor documents as CSV with a header row
+
+        Nested values (stats, lists, rich report sections) are written as
+        JSON strings so every row has the same columns.
+        """
+        text = io.StringIO()
+        writer = csv.writer(text)
+        writer.writerow(columns)
+        async for doc in cursor.batch_size(EXPORT_CURSOR_BATCH_SIZE):
+            item = transform(doc)
+            writer.writerow([_csv_cell(item.get(column)) for column in columns])
+            if text.tell() >= EXPORT_CHUNK_BYTES:
+                yield text.getvalue().encode("utf-8")
+                text.seek(0)
+                text.truncate(0)
+        if text.tell():
+            yield text.getvalue().encode("utf-8")
+
+    @staticmethod
+    def stream(
+        fmt: str,
+        cursor,
+        transform: Callable[[dict], dict],
+        columns: Optional[List[str]] = None
+    ) -> AsyncIterator[bytes]:
+        """Pick the encoder for `fmt` ("ndjson" or "csv")"""
+        if fmt == "csv":
+            return ExportService.stream_csv(cursor, transform, columns or [])
+        return ExportService.stream_ndjson(cursor, transform)
@@ -0,0 +1,237 @@
+"""
+Facet counts for published content
+
+The `facet_counts` collection holds, per content collection, how many
+published documents carry each facet value, plus pair counts ("of the
+documents with tier=tier_1, how many have each category") so a single
+exact-match filter can be drilled into without aggregating. Counts are
+kept current from content events: each change subtracts the previous
+document's contributions and adds the new one's, in one bulk write per
+batch. Update handlers take the previous document from the write itself
+(events.update_and_emit), so concurrent updates to one document add up
+exactly. Other filter combinations (search text, substring filters, dates)
+fall back to a `$facet` aggregation whose result is cached until the
+collection changes.
+
+Documents in `facet_counts`:
+    {_id, collection, given_field, given_value, field, value, count}
+`given_field` is None for unconditional counts; field "_total" counts documents.
+"""
+from collections import Counter as CountMap
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+from app.database import get_database
+from app.services.cache import MISS, response_cache
+from app.services.events import ContentEvent, PUBLISHED_STATUS, content_events
+
+FACET_COUNTS_COLLECTION = "facet_counts"
+TOTAL = "_total"
+
+# Facet fields per content collection
+FACET_FIELDS: Dict[str, List[str]] = {
+    "news": ["category", "tier"],
+    "reports": ["tags"],
+    "intelligence_cards": ["company", "tier", "category", "industry"],
+}
+
+# Fields whose list filter is an exact match, so the pair counts apply
+EXACT_FILTER_FIELDS: Dict[str, List[str]] = {
+    "news": ["category", "tier"],
+    "reports": ["tags"],
+    "intelligence_cards": ["tier"],
+}
+
+CountKey = Tuple[Optional[str], Optional[str], str, str]  # (given_field, given_value, field, value)
+
+# Collections whose counts this process has seen built
+_built: Set[str] = set()
+
+
+def _values(document: dict, field: str) -> List[str]:
+    value = document.get(field)
+    values = value if isinstance(value, list) else [value]
+    return sorted({str(item) for item in values if item not in (None, "")})
+
+
+def facet_contributions(collection: str, document: Optional[dict]) -> CountMap:
+    """Every count a published document adds to the facet index"""
+    counts: CountMap = CountMap()
+    if not document or document.get("status") != PUBLISHED_STATUS:
+        return counts
+
+    values = {field: _values(document, field) for field in FACET_FIELDS[collection]}
+    counts[(None, None, TOTAL, "")] += 1
+    for field, field_values in values.items():
+        for value in field_values:
+            counts[(None, None, field, value)] += 1
+            counts[(field, value, TOTAL, "")] += 1
+            for other_field, other_values in values.items():
+                for other_value in other_values:
+                    counts[(field, value, other_field, other_value)] += 1
+    return counts
+
+
+def _count_id(collection: str, key: CountKey) -> str:
+    given_field, given_value, field, value = key
+    return "|".join([collection, given_field or "", given_value or "", field, value])
+
+
+def _count_update(collection: str, key: CountKey, inc: Optional[int] = None, count: Optional[int] = None) -> UpdateOne:
+    given_field, given_value, field, value = key
+    fields = {
+        "collection": collection,
+        "given_field": given_field,
+        "given_value": given_value,
+        "field": field,
+        "value": value
+    }
+    if inc is not None:
+        update = {"$setOnInsert": fields, "$inc": {"count": inc}}
+    else:
+        update = {"$set": {**fields, "count": count}}
+    return UpdateOne({"_id": _count_id(collection, key)}, update, upsert=True)
+
+
+async def apply_events(events: List[ContentEvent]):
+    """Batch listener: apply the net count changes of a batch of events"""
+    deltas: Dict[str, CountMap] = {}
+    for event in events:
+        if event.collection not in FACET_FIELDS:
+            continue
+        delta = deltas.setdefault(event.collection, CountMap())
+        delta.update(facet_contributions(event.collection, event.document))
+        delta.subtract(facet_contributions(event.collection, event.previous))
+
+    counts = get_database()[FACET_COUNTS_COLLECTION]
+    for collection, delta in deltas.items():
+        updates = [_count_update(collection, key, inc=change) for key, change in delta.items() if change]
+        if not updates:
+            continue
+        try:
+            await counts.bulk_write(updates, ordered=False)
+            await counts.delete_many({
+                "collection": collection,
+                "count": {"$lte": 0},
+                "_id": {"$ne": _count_id(collection, (None, None, TOTAL, ""))}  # Marks the counts as built
+            })
+        except PyMongoError as e:
+            print(f"[FACETS] Failed to update {collection} counts, rebuilding: {str(e)}")
+            await rebuild(collection)
+
+
+content_events.register_batch(apply_events)
+
+
+async def rebuild(collection: str) -> int:
+    """
+    Recount a collection's facets from its published documents
+
+    New counts are upserted before stale ones are removed, so readers never
+    see an empty index. Returns the number of count documents written.
+    """
+    projection = {field: 1 for field in FACET_FIELDS[collection]}
+    projection["status"] = 1
+    totals: CountMap = CountMap()
+    cursor = get_database()[collection].find({"status": PUBLISHED_STATUS}, projection)
+    async for document in cursor:
+        totals.update(facet_contributions(collection, document))
+
+    # Keep a zero total so an empty collection still counts as built
+    totals.setdefault((None, None, TOTAL, ""), 0)
+
+    counts = get_database()[FACET_COUNTS_COLLECTION]
+    updates = [_count_update(collection, key, count=count) for key, count in totals.items()]
+    for start in range(0, len(updates), 1000):
+        await counts.bulk_write(updates[start:start + 1000], ordered=False)
+    await counts.delete_many({
+        "collection": collection,
+        "_id": {"$nin": [_count_id(collection, key) for key in totals]}
+    })
+    _built.add(collection)
+    return len(updates)
+
+
+async def ensure_built(collection: str):
+    """Build the counts for `collection` if they have never been built"""
+    if collection in _built:
+        return
+    exists = await get_database()[FACET_COUNTS_COLLECTION].count_documents(
+        {"_id": _count_id(collection, (None, None, TOTAL, ""))}, limit=1
+    )
+    if not exists:
+        await rebuild(collection)
+    _built.add(collection)
+
+
+def _shape_counts(collection: str, documents: Iterable[dict]) -> dict:
+    result = {"total": 0, "facets": {field: {} for field in FACET_FIELDS[collection]}}
+    for document in documents:
+        if document["field"] == TOTAL:
+            result["total"] = document["count"]
+        elif document["field"] in result["facets"] and document["count"] > 0:
+            result["facets"][document["field"]][document["value"]] = document["count"]
+    for field, values in result["facets"].items():
+        result["facets"][field] = dict(sorted(values.items(), key=lambda item: (-item[1], item[0])))
+    return result
+
+
+async def _from_index(collection: str, given: Optional[Tuple[str, str]]) -> dict:
+    await ensure_built(collection)
+    given_field, given_value = given or (None, None)
+    documents = await get_database()[FACET_COUNTS_COLLECTION].find(
+        {"collection": collection, "given_field": given_field, "given_value": given_value}
+    ).to_list(length=None)
+    return _shape_counts(collection, documents)
+
+
+async def _aggregate(collection: str, query: dict) -> dict:
+    """Count facets over the documents matching `query` in one $facet pass"""
+    branches = {"_total": [{"$count": "count"}]}
+    for field in FACET_FIELDS[collection]:
+        branch = [{"$unwind": f"${field}"}] if field == "tags" else []
+        branch += [
+            {"$match": {field: {"$nin": [None, ""]}}},
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}}
+        ]
+        branches[field] = branch
+    result = await get_database()[collection].aggregate([{"$match": query}, {"$facet": branches}]).to_list(1)
+    row = result[0] if result else {}
+    documents = [{"field": TOTAL, "value": "", "count": item["count"]} for item in row.get("_total", [])]
+    for field in FACET_FIELDS[collection]:
+        documents += [{"field": field, "value": str(item["_id"]), "count": item["count"]} for item in row.get(field, [])]
+    return _shape_counts(collection, documents)
+
+
+async def get_facets(
+    collection: str,
+    query: dict,
+    filters: Dict[str, Optional[str]],
+    match: str = "literal"
+) -> dict:
+    """
+    Facet value -> count maps for published documents matching the filters
+
+    Args:
+        collection: Content collection name
+        query: Public list filter for the same parameters (used when the
+            index cannot answer)
+        filters: Active filter values by facet field (None when unset), plus
+            any other list parameters that narrow the result
+        match: Text match mode, part of the cache key for aggregated results
+
+    Returns:
+        dict: {"total": n, "facets": {field: {value: count}}, "source": "index" | "aggregate"}
+    """
+    active = {name: value for name, value in filters.items() if value}
+    if not active or (len(active) == 1 and next(iter(active)) in EXACT_FILTER_FIELDS[collection]):
+        given = next(iter(active.items())) if active else None
+        return {**await _from_index(collection, given), "source": "index"}
+
+    cache_key = ("facets", collection, tuple(sorted(active.items())), match)
+    cached = response_cache.get(cache_key)
+    if cached is not MISS:
+        return cached
+    result = {**await _aggregate(collection, query), "source": "aggregate"}
+    response_cache.set(cache_key, result, tags=[collection])
+    return result
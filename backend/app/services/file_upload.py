@@ -8,6 +8,7 @@ from datetime import datetime
 from typing import Optional, Tuple
 from fastapi import UploadFile, HTTPException
 from app.config import settings
+from app.services.metrics import upload_bytes_total, uploads_total
 
 # Allowed file extensions
 ALLOWED_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
@@ -21,10 +22,12 @@ class FileUploadService:
     def __init__(self):
         self.upload_dir = settings.upload_dir
         self.max_file_size = settings.max_file_size
-        self._ensure_upload_dirs()
+        self._dirs_ready = False  # Directories are created on first upload, not at import
     
     def _ensure_upload_dirs(self):
         """Create upload directories if they don't exist"""
+        if self._dirs_ready:
+            return
         dirs = [
             self.upload_dir,
             os.path.join(self.upload_dir, "images"),
@@ -33,6 +36,7 @@ class FileUploadService:
         ]
         for dir_path in dirs:
             os.makedirs(dir_path, exist_ok=True)
+        self._dirs_ready = True
     
     def _get_file_extension(self, filename: str) -> str:
         """Get file extension from filename"""
@@ -86,11 +90,13 @@ class FileUploadService:
         
         # Generate unique filename
         new_filename = self._generate_filename(file.filename)
+        self._ensure_upload_dirs()
         file_path = os.path.join(self.upload_dir, "images", new_filename)
         
         # Read and validate file size
         content = await file.read()
         if len(content) > self.max_file_size:
+            uploads_total.inc("image", "too_large")
             raise HTTPException(
                 status_code=400,
                 detail=f"File too large. Maximum size: {self.max_file_size // 1024 // 1024}MB"
@@ -99,6 +105,8 @@ class FileUploadService:
         # Save file
         async with aiofiles.open(file_path, 'wb') as f:
             await f.write(content)
+        uploads_total.inc("image", "stored")
+        upload_bytes_total.inc("image", amount=len(content))
         
         # Return relative URL path
         return f"/uploads/images/{new_filename}"
@@ -127,11 +135,13 @@ class FileUploadService:
         
         # Generate unique filename
         new_filename = self._generate_filename(file.filename)
+        self._ensure_upload_dirs()
         file_path = os.path.join(self.upload_dir, "pdfs", new_filename)
         
         # Read and validate file size
         content = await file.read()
         if len(content) > self.max_file_size:
+            uploads_total.inc("pdf", "too_large")
             raise HTTPException(
                 status_code=400,
                 detail=f"File too large. Maximum size: {self.max_file_size // 1024 // 1024}MB"
@@ -140,6 +150,8 @@ class FileUploadService:
         # Save file
         async with aiofiles.open(file_path, 'wb') as f:
             await f.write(content)
+        uploads_total.inc("pdf", "stored")
+        upload_bytes_total.inc("pdf", amount=len(content))
         
         # Return relative URL path
         return f"/uploads/pdfs/{new_filename}"
@@ -0,0 +1,432 @@
+"""
+Bulk import service - streams NDJSON / JSON array payloads into reports and cards
+
+Each written batch is emitted as one content event batch, so caches, the
+public feed, facets, related content, snapshots, CDN purges and live
+updates react to imports exactly as they do to single writes.
+
+Records are matched to existing documents by `slug`. The create handlers
+store the same derived slug (insert_with_slug), and `maintenance.py slugs`
+backfills documents created before they did, so re-importing an exported
+item updates it instead of adding a copy.
+"""
+import codecs
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from pydantic import BaseModel, ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from pymongo.results import InsertOneResult
+from app.config import settings
+from app.database import get_reports_collection, get_intelligence_cards_collection
+from app.models.report import ReportModel
+from app.models.intelligence_card import IntelligenceCardModel
+from app.schemas.report import ReportCreate
+from app.schemas.intelligence_card import IntelligenceCardCreate
+from app.schemas.imports import ImportFailure, ImportReportResponse
+from app.services.events import ContentEvent, content_events, derive_action
+from app.utils.slug import slugify
+
+# Size of each read from the underlying byte stream
+READ_CHUNK_SIZE = 64 * 1024
+
+
+# Supported import targets, keyed by the same path segment as their routers
+IMPORT_KINDS: Dict[str, dict] = {
+    "reports": {
+        "schema": ReportCreate,
+        "build": ReportModel.create_document,
+        "collection": get_reports_collection,
+        "slug_fields": ("title",),
+    },
+    "intelligence-cards": {
+        "schema": IntelligenceCardCreate,
+        "build": IntelligenceCardModel.create_document,
+        "collection": get_intelligence_cards_collection,
+        "slug_fields": ("company", "title"),
+    },
+}
+
+
+def derive_slug(kind: str, values: dict) -> str:
+    """The slug an item is imported under when the record does not carry one"""
+    return slugify(*(str(values.get(field) or "") for field in IMPORT_KINDS[kind]["slug_fields"]))
+
+
+async def insert_with_slug(kind: str, collection, document: dict) -> InsertOneResult:
+    """
+    Insert a document created outside an import under its derived slug
+
+    If another item already holds the slug, the document is inserted
+    without one (imports keep matching the item that has it).
+    """
+    slug = derive_slug(kind, document)
+    if slug:
+        document["slug"] = slug
+        try:
+            return await collection.insert_one(document)
+        except DuplicateKeyError:
+            del document["slug"]
+    return await collection.insert_one(document)
+
+
+async def backfill_slugs(kind: str) -> Tuple[int, int]:
+    """
+    Give documents without a slug their derived one, oldest first
+
+    Returns (updated, skipped); a document is skipped when its slug is
+    empty or already taken.
+    """
+    collection = IMPORT_KINDS[kind]["collection"]()
+    updated = skipped = 0
+    fields = {field: 1 for field in IMPORT_KINDS[kind]["slug_fields"]}
+    async for document in collection.find({"slug": {"$exists": False}}, fields).sort("created_at", 1):
+        slug = derive_slug(kind, document)
+        if not slug:
+            skipped += 1
+            continue
+        try:
+            await collection.update_one({"_id": document["_id"], "slug": {"$exists": False}}, {"$set": {"slug": slug}})
+            updated += 1
+        except DuplicateKeyError:
+            skipped += 1
+    return updated, skipped
+
+
+class RecordStreamError(Exception):
+    """Raised for a malformed record; carries the line it started on"""
+
+    def __init__(self, line: int, message: str):
+        super().__init__(message)
+        self.line = line
+
+
+def _utf8_length(text: str) -> int:
+    """Size of `text` as it arrived on the wire (a character can take up to 4 bytes)"""
+    return len(text.encode("utf-8"))
+
+
+class JSONRecordReader:
+    """
+    Incremental reader yielding one JSON record at a time from a byte stream.
+
+    Accepts either NDJSON (one object per line) or a single top-level JSON
+    array of objects, with or without a leading UTF-8 BOM. Only the record
+    being decoded is held in memory, so the footprint is bounded by
+    ``max_record_bytes`` regardless of payload size. The limit applies to
+    each record's UTF-8 size, not its decoded length in characters.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], max_record_bytes: int):
+        self._chunks = chunks.__aiter__()
+        # utf-8-sig drops a leading byte order mark, which many exporters write
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+        self._json = json.JSONDecoder()
+        self._max = max_record_bytes
+        self._buffer = ""
+        self._pos = 0
+        self._line = 1
+        self._eof = False
+
+    async def _fill(self) -> bool:
+        """Append the next chunk to the buffer; return False at end of stream"""
+        if self._eof:
+            return False
+        if self._pos:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self._eof = True
+            self._buffer += self._decoder.decode(b"", final=True)
+            return False
+        self._buffer += self._decoder.decode(chunk)
+        return True
+
+    def _advance(self, new_pos: int):
+        self._line += self._buffer.count("\n", self._pos, new_pos)
+        self._pos = new_pos
+
+    async def _skip_whitespace(self) -> Optional[str]:
+        """Skip whitespace and return the next character, or None at EOF"""
+        while True:
+            buf = self._buffer
+            pos = self._pos
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            self._advance(pos)
+            if pos < len(buf):
+                return buf[pos]
+            if not await self._fill():
+                return None
+
+    async def records(self) -> AsyncIterator[Tuple[int, Any]]:
+        """
+        Yield ``(line_number, record)`` pairs
+
+        A malformed NDJSON line is yielded as a RecordStreamError in place of
+        the record so the caller can report it and keep going.
+
+        Raises:
+            RecordStreamError: For malformed JSON arrays, which cannot be resumed
+        """
+        first = await self._skip_whitespace()
+        if first is None:
+            return
+        if first == "[":
+            self._advance(self._pos + 1)
+            async for item in self._array_records():
+                yield item
+        else:
+            async for item in self._ndjson_records():
+                yield item
+
+    async def _ndjson_records(self) -> AsyncIterator[Tuple[int, Any]]:
+        skipping = False
+        while True:
+            newline = self._buffer.find("\n", self._pos)
+            if newline == -1:
+                if len(self._buffer) - self._pos > self._max and not skipping:
+                    skipping = True
+                    yield self._line, RecordStreamError(
+                        self._line, f"Record exceeds {self._max} bytes"
+                    )
+                if skipping:
+                    # Drop the oversized partial line instead of buffering it
+                    self._buffer = ""
+                    self._pos = 0
+                if await self._fill():
+                    continue
+                if skipping or not self._buffer[self._pos:].strip():
+                    return
+                newline = len(self._buffer)
+
+            line_no = self._line
+            text = self._buffer[self._pos:newline]
+            self._pos = min(newline + 1, len(self._buffer))
+            self._line += 1
+
+            if skipping:
+                skipping = False
+                continue
+            if not text.strip():
+                continue
+            if _utf8_length(text) > self._max:
+                yield line_no, RecordStreamError(line_no, f"Record exceeds {self._max} bytes")
+                continue
+            try:
+                yield line_no, json.loads(text)
+            except json.JSONDecodeError as e:
+                yield line_no, RecordStreamError(line_no, f"Invalid JSON: {e.msg} (column {e.colno})")
+
+    async def _array_records(self) -> AsyncIterator[Tuple[int, Any]]:
+        expect_value = True
+        after_comma = False
+        while True:
+            char = await self._skip_whitespace()
+            if char is None:
+                raise RecordStreamError(self._line, "Unterminated JSON array")
+            if char == "]":
+                if after_comma:
+                    raise RecordStreamError(self._line, "Trailing comma before ']'")
+                return
+            if char == "," and not expect_value:
+                self._advance(self._pos + 1)
+                expect_value = True
+                after_comma = True
+                continue
+            if not expect_value:
+                raise RecordStreamError(self._line, "Expected ',' or ']' between records")
+
+            start_line = self._line
+            target = len(self._buffer) - self._pos
+            while True:
+                try:
+                    record, end = self._json.raw_decode(self._buffer, self._pos)
+                    break
+                except json.JSONDecodeError as e:
+                    pending = len(self._buffer) - self._pos
+                    if pending > self._max:
+                        raise RecordStreamError(start_line, f"Record exceeds {self._max} bytes")
+                    # Read ahead geometrically so large records are not re-parsed per chunk
+                    target = max(target * 2, pending + READ_CHUNK_SIZE)
+                    while len(self._buffer) - self._pos < target:
+                        if not await self._fill():
+                            break
+                    if self._eof and len(self._buffer) - self._pos == pending:
+                        raise RecordStreamError(start_line, f"Invalid JSON: {e.msg}")
+            too_large = _utf8_length(self._buffer[self._pos:end]) > self._max
+            self._advance(end)
+            expect_value = False
+            after_comma = False
+            if too_large:
+                yield start_line, RecordStreamError(start_line, f"Record exceeds {self._max} bytes")
+            else:
+                yield start_line, record
+
+
+async def iter_file_chunks(path: str, chunk_size: int = READ_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Yield a local file in fixed-size chunks (used by the import CLI)"""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    """Collapse a pydantic error into a single readable line"""
+    parts = []
+    for err in error.errors()[:3]:
+        field = ".".join(str(loc) for loc in err["loc"]) or "record"
+        parts.append(f"{field}: {err['msg']}")
+    if len(error.errors()) > 3:
+        parts.append(f"(+{len(error.errors()) - 3} more)")
+    return "; ".join(parts)
+
+
+class ImportService:
+    """Service class for streaming bulk imports"""
+
+    @staticmethod
+    def build_upsert(
+        kind: str,
+        data: BaseModel,
+        slug: str,
+        created_by: Optional[str] = None
+    ) -> UpdateOne:
+        """
+        Build an idempotent upsert keyed by slug
+
+        Creation-only fields (created_at, created_by and a defaulted
+        published_date) are written with $setOnInsert so re-importing the
+        same file does not rewrite them.
+        """
+        spec = IMPORT_KINDS[kind]
+        document = spec["build"](**data.model_dump(), created_by=created_by)
+        document["slug"] = slug
+
+        on_insert = {
+            "created_at": document.pop("created_at"),
+            "created_by": document.pop("created_by"),
+        }
+        if data.published_date is None:
+            on_insert["published_date"] = document.pop("published_date")
+
+        return UpdateOne(
+            {"slug": slug},
+            {"$set": document, "$setOnInsert": on_insert},
+            upsert=True
+        )
+
+    @staticmethod
+    async def import_stream(
+        kind: str,
+        chunks: AsyncIterator[bytes],
+        created_by: Optional[str] = None,
+        dry_run: bool = False,
+        batch_size: Optional[int] = None
+    ) -> ImportReportResponse:
+        """
+        Validate and upsert records from a byte stream
+
+        Args:
+            kind: Import target ("reports" or "intelligence-cards")
+            chunks: Async iterator of raw bytes (request body or file)
+            created_by: User ID recorded on newly inserted documents
+            dry_run: Validate only, do not write
+            batch_size: Records per bulk_write call
+
+        Returns:
+            Import report with counts and failures by line number
+        """
+        spec = IMPORT_KINDS[kind]
+        schema = spec["schema"]
+        batch_size = batch_size or settings.import_batch_size
+        report = ImportReportResponse(kind=kind, dry_run=dry_run)
+
+        def fail(line: int, error: str, slug: str = ""):
+            report.failed += 1
+            if len(report.failures) < settings.import_max_failures:
+                report.failures.append(ImportFailure(line=line, slug=slug, error=error))
+            else:
+                report.failures_truncated = True
+
+        batch: List[UpdateOne] = []
+        batch_meta: List[Tuple[int, str]] = []
+
+        async def flush():
+            if not batch:
+                return
+            collection = spec["collection"]()
+            slugs = [slug for _, slug in batch_meta]
+            previous = {
+                document["slug"]: document
+                async for document in collection.find({"slug": {"$in": slugs}})
+            }
+            try:
+                result = await collection.bulk_write(batch, ordered=False)
+                report.inserted += result.upserted_count
+                report.updated += result.matched_count
+            except BulkWriteError as e:
+                details = e.details
+                report.inserted += details.get("nUpserted", 0)
+                report.updated += details.get("nMatched", 0)
+                for write_error in details.get("writeErrors", []):
+                    line, slug = batch_meta[write_error["index"]]
+                    fail(line, write_error.get("errmsg", "Write failed"), slug)
+            batch.clear()
+            batch_meta.clear()
+
+            # Failed records read back unchanged (or not at all) and are skipped
+            events = []
+            async for document in collection.find({"slug": {"$in": slugs}}):
+                before = previous.get(document["slug"])
+                if document == before:
+                    continue
+                events.append(ContentEvent(
+                    collection=collection.name,
+                    action=derive_action(before, document),
+                    id=str(document["_id"]),
+                    document=document,
+                    previous=before
+                ))
+            await content_events.emit_many(events)
+
+        reader = JSONRecordReader(chunks, settings.import_max_record_bytes)
+        try:
+            async for line, record in reader.records():
+                report.processed += 1
+                if isinstance(record, RecordStreamError):
+                    fail(record.line, str(record))
+                    continue
+                if not isinstance(record, dict):
+                    fail(line, "Record must be a JSON object")
+                    continue
+
+                try:
+                    data = schema.model_validate(record)
+                except ValidationError as e:
+                    fail(line, _format_validation_error(e), str(record.get("slug") or ""))
+                    continue
+
+                slug = slugify(str(record.get("slug") or "")) or derive_slug(kind, dict(data))
+                if not slug:
+                    fail(line, "Could not derive a slug; provide a 'slug' field")
+                    continue
+
+                if dry_run:
+                    continue
+
+                batch.append(ImportService.build_upsert(kind, data, slug, created_by))
+                batch_meta.append((line, slug))
+                if len(batch) >= batch_size:
+                    await flush()
+        except RecordStreamError as e:
+            report.processed += 1
+            fail(e.line, f"{e} - import stopped")
+
+        await flush()
+        return report
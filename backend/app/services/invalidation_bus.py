@@ -0,0 +1,261 @@
+"""
+Cross-worker cache invalidation bus
+
+The response cache and the document cache live in each worker process and
+are invalidated by local content events, which only fire in the worker that
+handled the write. The bus carries those invalidations to every other
+worker and instance through a capped MongoDB collection:
+
+- Each worker publishes the keys touched by its content events as one
+  message per flush: {worker, seq, sent_at, keys: [[collection, id], ...]}.
+  An `id` of None invalidates the whole collection. A message may also
+  carry `live`: live-update messages for SSE clients on other workers,
+  used while change streams are unavailable (services/live_updates.py).
+- Every worker tails the collection with a tailable cursor and applies
+  messages from other workers to its own caches.
+- `seq` counts each worker's messages. A receiver that sees a gap (a lost
+  insert, or messages overwritten before it read them) or loses its cursor
+  cannot know what it missed, so it clears its caches (a resync).
+  Replayed messages are skipped by the same counter.
+
+The delay between `sent_at` and applying a message is recorded in
+`cache_bus_delay_seconds` (it includes any clock skew between hosts) and
+summarized on GET /api/diagnostics/cache-bus.
+
+Every write, bulk imports included, reaches other workers only through
+content events and this bus. Per-worker state and how it stays current:
+
+- response cache, document cache: invalidated per message (above).
+- related-content model: items in a message are re-read before the next
+  refresh; a resync drops the model (services/related.py).
+- public feed built state: kept in MongoDB and cached per worker for
+  `public_feed_state_ttl_seconds`; dropped for every collection in a
+  message and on a resync, so the TTL only bounds a message that arrives
+  before the writer marked the feed dirty.
+- facet "counts exist" flag: only ever moves from unbuilt to built.
+- publish scheduler heap: only the worker that saw the write schedules
+  the job; the others pick it up on their periodic resync.
+- published-content snapshot: a file per host, rebuilt by the worker that
+  handled a public change. Other hosts keep their older file until one of
+  their own workers sees a public change or restarts. It is only served
+  while MongoDB is unreachable and is labelled with X-Snapshot-Built-At.
+
+The import CLI runs the bus publisher only, so API workers drop what an
+import changed.
+"""
+import asyncio
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid, PyMongoError
+from app.config import settings
+from app.database import get_database
+from app.services import public_feed, related
+from app.services.cache import response_cache
+from app.services.document_cache import document_cache
+from app.services.events import ContentEvent, content_events
+from app.services.metrics import cache_bus_delay_seconds, cache_bus_messages_total, cache_bus_resyncs_total
+
+BUS_COLLECTION = "cache_invalidations"
+RETRY_SECONDS = 5
+
+InvalidationKey = Tuple[str, Optional[str]]  # (collection, document id or None for all)
+
+
+def apply_invalidation(keys: List[InvalidationKey]):
+    """Drop the cached data for `keys` in this process"""
+    response_cache.invalidate({collection for collection, _ in keys})
+    public_feed.forget_state({collection for collection, _ in keys})
+    for collection, doc_id in keys:
+        if doc_id is None:
+            document_cache.invalidate_collection(collection)
+            related.drop_model()
+        else:
+            document_cache.invalidate(collection, doc_id)
+    related.mark_stale((collection, doc_id) for collection, doc_id in keys if doc_id is not None)
+
+
+def clear_local_caches():
+    response_cache.clear()
+    document_cache.clear()
+    public_feed.forget_state()
+    related.drop_model()
+
+
+class InvalidationBus:
+    """Publishes local invalidations and applies other workers' ones"""
+
+    def __init__(self):
+        self.worker_id = uuid.uuid4().hex
+        self.mode = "off"  # "tailing" while the reader is running
+        self._seq = 0
+        self._pending: Set[InvalidationKey] = set()
+        self._pending_live: List[dict] = []
+        self._live_listeners: List[Callable[[List[dict]], None]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._last_seen: Dict[str, int] = {}  # worker -> last applied seq
+        self._tasks: List[asyncio.Task] = []
+        self.stats = {"published": 0, "applied": 0, "resyncs": 0, "last_delay_ms": None, "max_delay_ms": None}
+
+    # ============ PUBLISHING ============
+
+    def publish(self, collection: str, doc_id: Optional[str] = None):
+        """Queue an invalidation for the other workers (flushed by the publisher task)"""
+        if self._wakeup is None:
+            return
+        self._pending.add((collection, doc_id))
+        self._wakeup.set()
+
+    def publish_live(self, messages: List[dict]):
+        """Queue live-update messages for the other workers' SSE clients"""
+        if self._wakeup is None or not messages:
+            return
+        self._pending_live.extend(messages)
+        self._wakeup.set()
+
+    def register_live(self, listener: Callable[[List[dict]], None]):
+        """Call `listener` with the live-update messages other workers publish"""
+        if listener not in self._live_listeners:
+            self._live_listeners.append(listener)
+
+    def on_content_events(self, events: List[ContentEvent]):
+        """Batch listener: forward local content changes"""
+        for event in events:
+            self.publish(event.collection, event.id)
+
+    async def _flush(self):
+        keys = sorted(self._pending, key=lambda key: (key[0], key[1] or ""))
+        live = self._pending_live
+        self._pending.clear()
+        self._pending_live = []
+        if not keys and not live:
+            return
+        message = {
+            "worker": self.worker_id,
+            "seq": self._seq + 1,
+            "sent_at": datetime.utcnow(),
+            "keys": [list(key) for key in keys]
+        }
+        if live:
+            message["live"] = live
+        # Counted even if the insert fails, so receivers see the gap and resync
+        self._seq += 1
+        try:
+            await get_database()[BUS_COLLECTION].insert_one(message)
+            self.stats["published"] += 1
+            cache_bus_messages_total.inc("published")
+        except PyMongoError as e:
+            print(f"[CACHE BUS] Failed to publish {len(keys)} invalidation(s): {str(e)}")
+
+    async def _publisher(self):
+        try:
+            # Inserting first would create the collection uncapped
+            await self._ensure_collection()
+        except PyMongoError as e:
+            print(f"[CACHE BUS] Could not create {BUS_COLLECTION}: {str(e)}")
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            await self._flush()
+
+    # ============ RECEIVING ============
+
+    def _resync(self, reason: str):
+        clear_local_caches()
+        self.stats["resyncs"] += 1
+        cache_bus_resyncs_total.inc(reason)
+        print(f"[CACHE BUS] Cleared local caches ({reason})")
+
+    def _receive(self, message: dict):
+        worker, seq = message.get("worker"), message.get("seq", 0)
+        if worker is None or worker == self.worker_id:
+            return
+        last = self._last_seen.get(worker)
+        if last is not None and seq <= last:
+            return  # Replayed after reopening the cursor
+        self._last_seen[worker] = seq
+        for listener in self._live_listeners:
+            listener(message.get("live", []))
+        if last is not None and seq > last + 1:
+            self._resync("gap")
+            return
+
+        apply_invalidation([(collection, doc_id) for collection, doc_id in message.get("keys", [])])
+        delay_ms = (datetime.utcnow() - message["sent_at"]).total_seconds() * 1000
+        self.stats["applied"] += 1
+        self.stats["last_delay_ms"] = round(delay_ms, 1)
+        self.stats["max_delay_ms"] = max(self.stats["max_delay_ms"] or 0, round(delay_ms, 1))
+        cache_bus_messages_total.inc("applied")
+        cache_bus_delay_seconds.observe(max(delay_ms, 0) / 1000)
+
+    async def _ensure_collection(self):
+        database = get_database()
+        try:
+            await database.create_collection(BUS_COLLECTION, capped=True, size=settings.cache_bus_size_bytes)
+        except CollectionInvalid:
+            pass  # Already exists
+        # A tailable cursor on an empty capped collection dies at once
+        if not await database[BUS_COLLECTION].find_one({}):
+            await database[BUS_COLLECTION].insert_one({"worker": None, "seq": 0, "sent_at": datetime.utcnow(), "keys": []})
+
+    async def _reader(self):
+        collection = get_database()[BUS_COLLECTION]
+        first = True
+        while True:
+            try:
+                await self._ensure_collection()
+                if first:
+                    # Messages sent before this worker started are history, not invalidations
+                    async for message in collection.find({}, {"worker": 1, "seq": 1}):
+                        if message.get("worker"):
+                            self._last_seen[message["worker"]] = max(self._last_seen.get(message["worker"], 0), message["seq"])
+                    first = False
+                cursor = collection.find({}, cursor_type=CursorType.TAILABLE_AWAIT)
+                self.mode = "tailing"
+                while cursor.alive:
+                    async for message in cursor:
+                        self._receive(message)
+                # Overwritten past our position: anything may have been missed
+                self._resync("cursor_lost")
+            except asyncio.CancelledError:
+                raise
+            except PyMongoError as e:
+                print(f"[CACHE BUS] Tailing interrupted: {str(e)}")
+                if self.mode == "tailing":
+                    self._resync("error")
+            self.mode = "reconnecting"
+            await asyncio.sleep(RETRY_SECONDS)
+
+    # ============ LIFECYCLE ============
+
+    def start(self, receive: bool = True):
+        """Start publishing local content events and, unless `receive` is False, tailing other workers' messages"""
+        if not settings.cache_bus_enabled or self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        content_events.register_batch(self.on_content_events)
+        self._tasks = [asyncio.create_task(self._publisher())]
+        if receive:
+            self._tasks.append(asyncio.create_task(self._reader()))
+
+    async def stop(self):
+        content_events.unregister(self.on_content_events)
+        for task in self._tasks:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        if self._pending:
+            await self._flush()
+        self._wakeup = None
+        self.mode = "off"
+
+    def status(self) -> dict:
+        return {"worker": self.worker_id, "mode": self.mode, "workers_seen": len(self._last_seen), **self.stats}
+
+
+# Global bus instance (started in the app lifespan)
+invalidation_bus = InvalidationBus()
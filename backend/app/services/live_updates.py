@@ -0,0 +1,241 @@
+"""
+Live update broadcaster for Server-Sent Events
+
+A single source feeds every connected client:
+- a MongoDB change stream when the deployment supports it (replica set / Atlas), or
+- content events when it does not (standalone mongod). Each worker sends
+  its own events to its clients and forwards them on the cache
+  invalidation bus, so clients of other workers and instances see them
+  too. With several workers and the bus disabled, clients only see writes
+  handled by their own worker; a warning is logged at startup.
+
+Each client gets a bounded queue. A client that falls behind is dropped
+rather than slowing down the broadcast; its EventSource reconnects and
+refetches.
+"""
+import asyncio
+import itertools
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+from pymongo.errors import PyMongoError
+from app.config import settings
+from app.database import get_database
+from app.services.invalidation_bus import invalidation_bus
+from app.services.events import (
+    ContentEvent,
+    content_events,
+    CREATE, UPDATE, DELETE, PUBLISH, UNPUBLISH, FEATURE, UNFEATURE,
+    PUBLISHED_STATUS
+)
+
+# Collections whose changes are pushed to clients
+WATCHED_COLLECTIONS = ["intelligence_cards", "news", "reports"]
+
+# Seconds to wait before retrying a failed change stream
+WATCH_RETRY_SECONDS = 30
+
+
+class LiveSubscriber:
+    """One connected SSE client"""
+
+    def __init__(self, queue_size: int, collections: Optional[Set[str]] = None):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.collections = collections
+        self.dropped = False
+
+    def wants(self, collection: str) -> bool:
+        return self.collections is None or collection in self.collections
+
+
+class LiveUpdateBroadcaster:
+    """Shares one change source across all connected clients"""
+
+    def __init__(self):
+        self._subscribers: Set[LiveSubscriber] = set()
+        self._watch_task: Optional[asyncio.Task] = None
+        self._sequence = itertools.count(1)
+        self.mode = "local"  # "change_stream" once the watcher is running
+        self.dropped_clients = 0
+        self._reported_unavailable = False
+
+    @property
+    def client_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, collections: Optional[Set[str]] = None) -> LiveSubscriber:
+        subscriber = LiveSubscriber(settings.sse_client_queue_size, collections)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: LiveSubscriber):
+        self._subscribers.discard(subscriber)
+
+    def publish(self, message: dict):
+        """Queue a message for every interested client without awaiting any of them"""
+        message["seq"] = next(self._sequence)
+        for subscriber in list(self._subscribers):
+            if not subscriber.wants(message["collection"]):
+                continue
+            try:
+                subscriber.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Slow consumer: drop it instead of buffering without bound
+                subscriber.dropped = True
+                self._subscribers.discard(subscriber)
+                self.dropped_clients += 1
+
+    # ============ SOURCES ============
+
+    async def on_content_events(self, events: List[ContentEvent]):
+        """
+        Content hub batch listener, used only while no change stream is active
+
+        A batch with more than `sse_batch_collapse_threshold` public changes
+        to one collection (an import) is sent as a single "update" message
+        without an id, so it cannot overflow client queues.
+        """
+        if self.mode != "local":
+            return
+        messages = []
+        by_collection: Dict[str, List[ContentEvent]] = {}
+        for event in events:
+            if event.is_public:
+                by_collection.setdefault(event.collection, []).append(event)
+
+        for collection, changes in by_collection.items():
+            if len(changes) > settings.sse_batch_collapse_threshold:
+                messages.append({
+                    "type": UPDATE,
+                    "collection": collection,
+                    "id": None,
+                    "count": len(changes),
+                    "is_public": True,
+                    "ts": changes[-1].timestamp.isoformat()
+                })
+                continue
+            for event in changes:
+                document = event.document or {}
+                messages.append({
+                    "type": event.action,
+                    "collection": event.collection,
+                    "id": event.id,
+                    "status": document.get("status"),
+                    "is_featured": document.get("is_featured"),
+                    "is_public": True,  # Checked above
+                    "ts": event.timestamp.isoformat()
+                })
+        for message in messages:
+            self.publish(dict(message))
+        invalidation_bus.publish_live(messages)
+
+    def on_bus_messages(self, messages: List[dict]):
+        """Live-update messages from other workers' content events (local mode only)"""
+        if self.mode != "local":
+            return
+        for message in messages:
+            self.publish(dict(message))
+
+    @staticmethod
+    def _message_from_change(change: dict) -> Optional[dict]:
+        """Translate a change stream event into the same message shape as local events"""
+        operation = change["operationType"]
+        document = change.get("fullDocument") or {}
+        updated = (change.get("updateDescription") or {}).get("updatedFields", {})
+
+        if operation == "delete":
+            action = DELETE
+        elif operation == "insert":
+            action = PUBLISH if document.get("status") == PUBLISHED_STATUS else CREATE
+        elif "status" in updated:
+            action = PUBLISH if updated["status"] == PUBLISHED_STATUS else UNPUBLISH
+        elif "is_featured" in updated:
+            action = FEATURE if updated["is_featured"] else UNFEATURE
+        else:
+            action = UPDATE
+
+        # Draft-only edits are not visible to public clients
+        if action in (CREATE, UPDATE, FEATURE, UNFEATURE) and document.get("status") != PUBLISHED_STATUS:
+            return None
+
+        return {
+            "type": action,
+            "collection": change["ns"]["coll"],
+            "id": str(change["documentKey"]["_id"]),
+            "status": document.get("status"),
+            "is_featured": document.get("is_featured"),
+            # Without a pre-image, status changes and deletes may have been public
+            "is_public": action in (DELETE, PUBLISH, UNPUBLISH) or document.get("status") == PUBLISHED_STATUS,
+            "ts": datetime.utcnow().isoformat()
+        }
+
+    async def _watch(self):
+        """Run the change stream, falling back to local events while it is unavailable"""
+        pipeline = [{"$match": {
+            "ns.coll": {"$in": WATCHED_COLLECTIONS},
+            "operationType": {"$in": ["insert", "update", "replace", "delete"]}
+        }}]
+        while True:
+            try:
+                async with get_database().watch(pipeline, full_document="updateLookup") as stream:
+                    self.mode = "change_stream"
+                    print("✅ Live updates: using MongoDB change streams")
+                    async for change in stream:
+                        message = self._message_from_change(change)
+                        if message:
+                            self.publish(message)
+            except asyncio.CancelledError:
+                raise
+            except PyMongoError as e:
+                if self.mode == "change_stream":
+                    print(f"[LIVE UPDATES] Change stream interrupted: {str(e)}")
+                elif not self._reported_unavailable:
+                    self._reported_unavailable = True
+                    print(f"ℹ️  Live updates: change streams unavailable, using in-process events ({str(e).splitlines()[0]})")
+            self.mode = "local"
+            await asyncio.sleep(WATCH_RETRY_SECONDS)
+
+    def start(self):
+        """Register the local listener and start the change stream watcher"""
+        content_events.register_batch(self.on_content_events)
+        invalidation_bus.register_live(self.on_bus_messages)
+        if settings.workers > 1 and not settings.cache_bus_enabled:
+            print(
+                "⚠️  Live updates: the cache bus is disabled, so without change streams "
+                "SSE clients only see writes handled by their own worker"
+            )
+        if settings.sse_use_change_streams and self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        content_events.unregister(self.on_content_events)
+        if self._watch_task:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+        self.mode = "local"
+
+    # ============ CLIENT STREAM ============
+
+    async def event_stream(self, subscriber: LiveSubscriber):
+        """Yield SSE-formatted bytes for one client until it disconnects or is dropped"""
+        heartbeat = settings.sse_heartbeat_seconds
+        try:
+            yield f"retry: {settings.sse_retry_ms}\n: connected ({self.mode})\n\n".encode()
+            while not subscriber.dropped:
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                data = json.dumps(message, separators=(",", ":"))
+                yield f"id: {message['seq']}\nevent: {message['type']}\ndata: {data}\n\n".encode()
+        finally:
+            self.unsubscribe(subscriber)
+
+
+# Global broadcaster instance
+live_updates = LiveUpdateBroadcaster()
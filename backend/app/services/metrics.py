@@ -0,0 +1,499 @@
+"""
+Lightweight Prometheus-format metrics
+
+Counters, gauges and histograms are plain dicts keyed by label tuples. Each
+metric guards its values with a lock: the pymongo monitoring listeners
+update them from motor's executor threads while the event loop does too,
+and an unlocked read-modify-write would lose increments. Rendering happens
+only when /metrics is scraped.
+
+Values are per process. With several workers behind one port a scrape
+reaches a random worker, so when `metrics_dir` is set every worker writes
+its values to `<metrics_dir>/<pid>-<start>.json` every
+`metrics_share_interval_seconds` and /metrics merges all the files:
+counters and histograms are summed over every worker, including exited
+ones (so totals never go backwards across worker restarts), and gauges are
+reported per live worker with a `worker` label. Other workers' values are
+up to one interval old. gunicorn.conf.py sets the directory and clears it
+when the server starts.
+"""
+import asyncio
+import bisect
+import glob
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from pymongo import monitoring
+
+LabelValues = Tuple[str, ...]
+
+# Latency buckets in seconds (HTTP and MongoDB)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def empty(self) -> "_Metric":
+        """A metric with the same definition and no values (for merging)"""
+        return type(self)(self.name, self.documentation, self.label_names)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def export(self) -> list:
+        with self._lock:
+            return [[list(labels), value] for labels, value in self._values.items()]
+
+    def merge(self, entries: list, worker: str):
+        with self._lock:
+            for labels, value in entries:
+                key = tuple(labels)
+                self._values[key] = self._values.get(key, 0) + value
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str):
+        with self._lock:
+            self._values[labels] = value
+
+    def empty(self) -> "Gauge":
+        return Gauge(self.name, self.documentation, self.label_names + ("worker",))
+
+    def merge(self, entries: list, worker: str):
+        with self._lock:
+            for labels, value in entries:
+                self._values[tuple(labels) + (worker,)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, *labels: str):
+        bucket = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(labels)
+            if counts is None:
+                counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+                self._sums[labels] = 0.0
+            # Non-cumulative storage; made cumulative at render time
+            counts[bucket] += 1
+            self._sums[labels] += value
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            return sum(self._counts.get(labels, ()))
+
+    def empty(self) -> "Histogram":
+        return Histogram(self.name, self.documentation, self.label_names, self.buckets)
+
+    def export(self) -> list:
+        with self._lock:
+            return [[list(labels), list(counts), self._sums.get(labels, 0.0)] for labels, counts in self._counts.items()]
+
+    def merge(self, entries: list, worker: str):
+        with self._lock:
+            for labels, counts, total in entries:
+                if len(counts) != len(self.buckets) + 1:
+                    continue  # Written with different buckets (older deploy)
+                key = tuple(labels)
+                merged = self._counts.setdefault(key, [0] * len(counts))
+                for i, count in enumerate(counts):
+                    merged[i] += count
+                self._sums[key] = self._sums.get(key, 0.0) + total
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        with self._lock:
+            values = sorted((labels, list(counts), self._sums[labels]) for labels, counts in self._counts.items())
+        for labels, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}")
+            label_str = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds every metric and renders the exposition text"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    # ============ SHARING BETWEEN WORKERS ============
+
+    def write_shared(self, directory: str):
+        """Write this process's values for the other workers to merge"""
+        global _process_file
+        if _process_file is None or not _process_file.startswith(f"{os.getpid()}-"):
+            _process_file = f"{os.getpid()}-{time.time_ns()}.json"
+        data = {name: metric.export() for name, metric in self._metrics.items()}
+        path = os.path.join(directory, _process_file)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as handle:
+            json.dump(data, handle, separators=(",", ":"))
+        os.replace(temp_path, path)
+
+    def render_shared(self, directory: str) -> str:
+        """Render every worker's values merged (this process's are written first, so they are current)"""
+        self.write_shared(directory)
+        merged = {name: metric.empty() for name, metric in self._metrics.items()}
+        for path in glob.glob(os.path.join(directory, "*.json")):
+            worker = os.path.basename(path).split("-", 1)[0]
+            try:
+                with open(path) as handle:
+                    data = json.load(handle)
+            except (OSError, ValueError):
+                continue
+            alive = _is_alive(int(worker))
+            for name, entries in data.items():
+                metric = merged.get(name)
+                if metric is None or (isinstance(metric, Gauge) and not alive):
+                    continue
+                metric.merge(entries, worker)
+        lines: List[str] = []
+        for metric in merged.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    async def share(self, directory: str, interval: float):
+        """Write this process's values every `interval` seconds (run as a task)"""
+        try:
+            while True:
+                await asyncio.to_thread(self.write_shared, directory)
+                await asyncio.sleep(interval)
+        finally:
+            self.write_shared(directory)  # Final values, kept after the worker exits
+
+
+# Shared-directory file name of this process (reset after a fork)
+_process_file: Optional[str] = None
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def prepare_shared_dir(directory: str):
+    """Create the shared metrics directory and drop files from earlier server runs"""
+    os.makedirs(directory, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, "*.json*")):
+        os.remove(path)
+
+
+registry = MetricsRegistry()
+
+# ============ HTTP ============
+
+http_requests_total = registry.counter(
+    "http_requests_total", "HTTP requests by route template, method and status", ["method", "route", "status"]
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ["method", "route"]
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being served", ["method"]
+)
+
+# ============ MONGODB ============
+
+mongo_command_duration_seconds = registry.histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency by collection and command", ["collection", "command"]
+)
+mongo_command_failures_total = registry.counter(
+    "mongodb_command_failures_total", "Failed MongoDB commands by collection and command", ["collection", "command"]
+)
+mongo_pool_connections = registry.gauge(
+    "mongodb_pool_connections", "Open connections in the MongoDB pool", ["address"]
+)
+mongo_pool_checked_out = registry.gauge(
+    "mongodb_pool_checked_out", "Connections currently checked out of the MongoDB pool", ["address"]
+)
+mongo_pool_utilization = registry.gauge(
+    "mongodb_pool_utilization", "Checked-out connections as a fraction of maxPoolSize", ["address"]
+)
+mongo_pool_checkout_wait_seconds = registry.histogram(
+    "mongodb_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection", ["address"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+)
+mongo_pool_checkout_failures_total = registry.counter(
+    "mongodb_pool_checkout_failures_total", "Failed connection checkouts by reason", ["address", "reason"]
+)
+
+# ============ APPLICATION ============
+
+email_sends_total = registry.counter(
+    "email_sends_total", "Email send attempts by kind and result", ["kind", "result"]
+)
+otp_attempts_total = registry.counter(
+    "otp_attempts_total", "OTP verification attempts by result", ["result"]
+)
+upload_bytes_total = registry.counter(
+    "upload_bytes_total", "Bytes accepted by file uploads", ["kind"]
+)
+uploads_total = registry.counter(
+    "uploads_total", "File uploads by kind and result", ["kind", "result"]
+)
+rate_limited_total = registry.counter(
+    "rate_limited_total", "Requests rejected with 429 by rate limit policy", ["policy"]
+)
+document_cache_requests_total = registry.counter(
+    "document_cache_requests_total", "Get-by-id document cache lookups by collection and result", ["collection", "result"]
+)
+document_cache_bytes = registry.gauge(
+    "document_cache_bytes", "Approximate size of the documents held in the get-by-id cache"
+)
+cache_bus_messages_total = registry.counter(
+    "cache_bus_messages_total", "Cache invalidation bus messages by direction", ["direction"]
+)
+cache_bus_resyncs_total = registry.counter(
+    "cache_bus_resyncs_total", "Full cache resyncs after missed invalidation messages", ["reason"]
+)
+cache_bus_delay_seconds = registry.histogram(
+    "cache_bus_delay_seconds", "Time from publishing an invalidation to applying it in another worker"
+)
+
+
+class MongoCommandTimer(monitoring.CommandListener):
+    """
+    pymongo command listener timing every command by collection
+
+    The driver reports duration itself, so this only keeps the collection name
+    between the started and finished callbacks.
+    """
+
+    # Commands whose first value is not a collection name
+    _NO_COLLECTION = {"ping", "isMaster", "ismaster", "hello", "buildInfo", "endSessions",
+                      "killCursors", "saslStart", "saslContinue", "listCollections",
+                      "listDatabases", "abortTransaction", "commitTransaction"}
+
+    def __init__(self):
+        self._collections: Dict[Tuple[int, int], str] = {}
+
+    def _key(self, event) -> Tuple[int, int]:
+        return (event.request_id, event.operation_id or 0)
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        name = event.command_name
+        if name == "getMore":
+            collection = event.command.get("collection", "")
+        elif name in self._NO_COLLECTION:
+            collection = ""
+        else:
+            value = event.command.get(name)
+            collection = value if isinstance(value, str) else ""
+        self._collections[self._key(event)] = collection
+
+    def _finish(self, event, failed: bool):
+        collection = self._collections.pop(self._key(event), "")
+        seconds = event.duration_micros / 1_000_000
+        mongo_command_duration_seconds.observe(seconds, collection, event.command_name)
+        if failed:
+            mongo_command_failures_total.inc(collection, event.command_name)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        self._finish(event, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        self._finish(event, failed=True)
+
+
+class MongoPoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    pymongo pool listener exposing pool size, utilization and checkout waits
+
+    Checkouts happen on motor's executor threads, so the wait start time is
+    kept per thread between the started and checked-out events.
+    """
+
+    def __init__(self, max_pool_size: int):
+        self.max_pool_size = max_pool_size
+        self._local = threading.local()
+
+    @staticmethod
+    def _address(event) -> str:
+        host, port = event.address
+        return f"{host}:{port}"
+
+    def _set_checked_out(self, address: str, delta: int):
+        mongo_pool_checked_out.inc(address, amount=delta)
+        if self.max_pool_size:
+            mongo_pool_utilization.set(mongo_pool_checked_out.value(address) / self.max_pool_size, address)
+
+    def pool_created(self, event):
+        address = self._address(event)
+        mongo_pool_connections.set(0, address)
+        mongo_pool_checked_out.set(0, address)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        mongo_pool_connections.inc(self._address(event))
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        mongo_pool_connections.dec(self._address(event))
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        self._local.started = None
+        mongo_pool_checkout_failures_total.inc(self._address(event), str(event.reason))
+
+    def connection_checked_out(self, event):
+        address = self._address(event)
+        started = getattr(self._local, "started", None)
+        if started is not None:
+            mongo_pool_checkout_wait_seconds.observe(time.perf_counter() - started, address)
+            self._local.started = None
+        self._set_checked_out(address, 1)
+
+    def connection_checked_in(self, event):
+        self._set_checked_out(self._address(event), -1)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording latency, status and in-flight requests
+
+    Requests are labelled by route template (e.g. /api/news/{news_id}) so
+    label cardinality stays bounded. Unmatched paths are grouped as "unmatched".
+    """
+
+    def __init__(self, app, exclude_paths: Optional[Sequence[str]] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = set(exclude_paths or ())
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_holder = ["500"]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = str(message["status"])
+            await send(message)
+
+        # In-flight is tracked by method only: the route is not known until routing ran
+        http_requests_in_flight.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_flight.dec(method)
+            # Set by the router once a route matched
+            route = scope.get("route")
+            template = getattr(route, "path_format", None) or "unmatched"
+            http_request_duration_seconds.observe(elapsed, method, template)
+            http_requests_total.inc(method, template, status_holder[0])
@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict
 from app.config import settings
 from app.services.email_service import email_service
+from app.services.metrics import otp_attempts_total
 
 
 class OTPService:
@@ -86,11 +87,13 @@ class OTPService:
         stored = cls._otp_store.get(email)
         
         if not stored:
+            otp_attempts_total.inc("unknown")
             return False
         
         # Check if expired
         if datetime.utcnow() > stored["expires_at"]:
             del cls._otp_store[email]
+            otp_attempts_total.inc("expired")
             return False
         
         # Increment attempts
@@ -99,14 +102,17 @@ class OTPService:
         # Max 3 attempts
         if stored["attempts"] > 3:
             del cls._otp_store[email]
+            otp_attempts_total.inc("locked")
             return False
         
         # Verify OTP
         if stored["otp"] != otp:
+            otp_attempts_total.inc("invalid")
             return False
         
         # OTP valid - clean up
         del cls._otp_store[email]
+        otp_attempts_total.inc("success")
         
         return True
     
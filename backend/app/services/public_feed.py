@@ -0,0 +1,319 @@
+"""
+Public read model for the content list endpoints
+
+The `public_feed` collection holds one document per *published* news item,
+report and intelligence card, already shaped by the model's `from_db`
+(response field names, defaults filled in) and tagged with its `kind`.
+Because the shaped documents keep the source field names, the public list
+filters from utils/queries.py apply to the feed unchanged, and compound
+`(kind, filter field, published_date)` indexes serve every public list
+without touching drafts or reshaping documents on each request.
+
+The feed is written synchronously from content events, in the same request
+as the source write. Whether a kind's feed can be read is recorded in its
+meta document. Each worker caches that state for
+`public_feed_state_ttl_seconds` and drops it when it marks the kind dirty
+or rebuilds it, or when the invalidation bus reports a change to the kind.
+If a feed write fails the kind is marked dirty (bumping its generation),
+reads fall back to the source collection, and the first worker to see it claims a rebuild
+lease and rebuilds the kind in the background. A rebuild only marks the
+kind built if its generation is unchanged, so a failure during the rebuild
+leaves it dirty for the next one. `maintenance.py feed` rebuilds and checks
+the feed against the source collections.
+
+Documents in `public_feed`:
+    {_id: "<kind>:<id>", kind, id, ...response fields}
+with one meta document per kind:
+    {_id: "_meta:<kind>", kind: "_meta", state: "built" | "dirty", generation, built_at, rebuilding_until}
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from pymongo import DeleteOne, ReplaceOne
+from pymongo.errors import DuplicateKeyError, PyMongoError
+from app.config import settings
+from app.database import get_database
+from app.models.intelligence_card import IntelligenceCardModel
+from app.models.news import NewsModel
+from app.models.report import ReportModel
+from app.schemas.intelligence_card import IntelligenceCardResponse
+from app.schemas.news import NewsResponse
+from app.schemas.report import ReportResponse
+from app.services.events import ContentEvent, PUBLISHED_STATUS, content_events
+from app.utils.background import spawn_background
+
+FEED_COLLECTION = "public_feed"
+META_KIND = "_meta"
+
+# Meta document states
+BUILT = "built"
+DIRTY = "dirty"
+
+# Attempts at recording a failed feed write before leaving it to the next read
+MARK_DIRTY_ATTEMPTS = 3
+
+# Source collection -> (document shaper, response schema)
+FEED_SOURCES: Dict[str, Tuple[Callable[[dict], Optional[dict]], type]] = {
+    "news": (NewsModel.from_db, NewsResponse),
+    "reports": (ReportModel.from_db, ReportResponse),
+    "intelligence_cards": (IntelligenceCardModel.from_db, IntelligenceCardResponse),
+}
+
+# Kinds this process failed to mark dirty (retried on the next read), and running rebuilds
+_unrecorded: Set[str] = set()
+_rebuild_tasks: Dict[str, asyncio.Task] = {}
+
+# Kind -> (built, monotonic time it was read from the meta document)
+_states: Dict[str, Tuple[bool, float]] = {}
+
+
+def _feed_id(kind: str, doc_id: str) -> str:
+    return f"{kind}:{doc_id}"
+
+
+def _meta_id(kind: str) -> str:
+    return f"{META_KIND}:{kind}"
+
+
+def forget_state(kinds: Optional[Iterable[str]] = None):
+    """Drop the cached built state of `kinds` (all if None) so the next read checks MongoDB"""
+    if kinds is None:
+        _states.clear()
+    else:
+        for kind in kinds:
+            _states.pop(kind, None)
+
+
+def feed_document(kind: str, document: Optional[dict]) -> Optional[dict]:
+    """The feed entry for a source document, or None if it is not public"""
+    if not document or document.get("status") != PUBLISHED_STATUS:
+        return None
+    shaped = FEED_SOURCES[kind][0](document)
+    return {"_id": _feed_id(kind, shaped["id"]), "kind": kind, **shaped}
+
+
+def feed_projection(kind: str) -> Dict[str, int]:
+    """Only the response fields, so feed documents can be encoded as-is"""
+    projection = {name: 1 for name in FEED_SOURCES[kind][1].model_fields}
+    projection["_id"] = 0
+    return projection
+
+
+async def _mark_dirty(kind: str) -> bool:
+    """Record that the kind's feed missed a write, so every worker stops reading it"""
+    forget_state([kind])
+    delay = 0.1
+    for attempt in range(MARK_DIRTY_ATTEMPTS):
+        try:
+            await get_database()[FEED_COLLECTION].update_one(
+                {"_id": _meta_id(kind)},
+                {"$set": {"kind": META_KIND, "state": DIRTY}, "$inc": {"generation": 1}},
+                upsert=True
+            )
+            _unrecorded.discard(kind)
+            return True
+        except PyMongoError as e:
+            if attempt == MARK_DIRTY_ATTEMPTS - 1:
+                print(f"[FEED] Failed to mark the {kind} feed dirty, retrying on the next read: {str(e)}")
+            else:
+                await asyncio.sleep(delay)
+                delay *= 2
+    _unrecorded.add(kind)
+    return False
+
+
+async def apply_events(events: List[ContentEvent]):
+    """Batch listener: upsert published items and remove everything else"""
+    writes: Dict[str, list] = {}
+    for event in events:
+        if event.collection not in FEED_SOURCES:
+            continue
+        entry = feed_document(event.collection, event.document)
+        if entry is None:
+            write = DeleteOne({"_id": _feed_id(event.collection, event.id)})
+        else:
+            write = ReplaceOne({"_id": entry["_id"]}, entry, upsert=True)
+        writes.setdefault(event.collection, []).append(write)
+
+    feed = get_database()[FEED_COLLECTION]
+    for kind, kind_writes in writes.items():
+        try:
+            # Ordered, so the last event for an item wins
+            await feed.bulk_write(kind_writes, ordered=True)
+        except PyMongoError as e:
+            print(f"[FEED] Failed to update {kind} feed, reads fall back until rebuilt: {str(e)}")
+            await _mark_dirty(kind)
+
+
+content_events.register_batch(apply_events)
+
+
+async def rebuild(kind: str) -> int:
+    """
+    Rewrite a kind's feed from its published source documents
+
+    Entries are upserted before stale ones are removed, so readers never see
+    an empty feed. The kind is marked built unless it was marked dirty
+    while rebuilding. Returns the number of entries written.
+    """
+    feed = get_database()[FEED_COLLECTION]
+    meta = await feed.find_one({"_id": _meta_id(kind)}, {"generation": 1}) or {}
+    generation = meta.get("generation", {"$exists": False})
+    ids = []
+    writes = []
+    written = 0
+    cursor = get_database()[kind].find({"status": PUBLISHED_STATUS})
+    async for document in cursor:
+        entry = feed_document(kind, document)
+        ids.append(entry["_id"])
+        writes.append(ReplaceOne({"_id": entry["_id"]}, entry, upsert=True))
+        if len(writes) >= 500:
+            await feed.bulk_write(writes, ordered=False)
+            written += len(writes)
+            writes = []
+    if writes:
+        await feed.bulk_write(writes, ordered=False)
+        written += len(writes)
+
+    await feed.delete_many({"kind": kind, "_id": {"$nin": ids}})
+    try:
+        await feed.update_one(
+            {"_id": _meta_id(kind), "generation": generation},
+            {
+                "$set": {"kind": META_KIND, "state": BUILT, "built_at": datetime.utcnow()},
+                "$unset": {"rebuilding_until": ""}
+            },
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # Marked dirty while rebuilding: release the lease so the next read rebuilds again
+        await feed.update_one({"_id": _meta_id(kind)}, {"$unset": {"rebuilding_until": ""}})
+        print(f"[FEED] {kind} feed changed while rebuilding, left dirty")
+    forget_state([kind])
+    return written
+
+
+async def is_built(kind: str) -> bool:
+    """True if every worker may read the kind's feed"""
+    if kind in _unrecorded:
+        await _mark_dirty(kind)
+        return False
+    cached = _states.get(kind)
+    if cached is not None and time.monotonic() - cached[1] < settings.public_feed_state_ttl_seconds:
+        return cached[0]
+    checked_at = time.monotonic()
+    meta = await get_database()[FEED_COLLECTION].find_one({"_id": _meta_id(kind)}, {"state": 1})
+    # Meta documents written before the state field existed mark built feeds
+    built = meta is not None and meta.get("state", BUILT) == BUILT
+    _states[kind] = (built, checked_at)
+    return built
+
+
+async def _claim_rebuild(kind: str) -> bool:
+    """Take the kind's rebuild lease unless it is built or another worker holds it"""
+    now = datetime.utcnow()
+    try:
+        await get_database()[FEED_COLLECTION].update_one(
+            {
+                "_id": _meta_id(kind),
+                "state": {"$ne": BUILT},
+                "$or": [{"rebuilding_until": {"$exists": False}}, {"rebuilding_until": {"$lt": now}}]
+            },
+            {
+                "$set": {"kind": META_KIND, "rebuilding_until": now + timedelta(seconds=settings.public_feed_rebuild_lease_seconds)},
+                "$setOnInsert": {"state": DIRTY, "generation": 0}
+            },
+            upsert=True
+        )
+        return True
+    except DuplicateKeyError:
+        return False
+
+
+async def _rebuild_out_of_band(kind: str):
+    try:
+        if await _claim_rebuild(kind):
+            written = await rebuild(kind)
+            print(f"[FEED] Rebuilt {kind} feed: {written} entries")
+    except PyMongoError as e:
+        # The lease expires, after which another read retries
+        print(f"[FEED] Failed to rebuild {kind} feed: {str(e)}")
+
+
+def schedule_rebuild(kind: str):
+    """Rebuild the kind's feed in the background, at most once at a time per process"""
+    task = _rebuild_tasks.get(kind)
+    if task is None or task.done():
+        _rebuild_tasks[kind] = spawn_background(_rebuild_out_of_band(kind))
+
+
+async def find_page(
+    kind: str,
+    query: dict,
+    sort: List[Tuple[str, int]],
+    skip: int,
+    limit: int
+) -> Optional[Tuple[List[dict], int]]:
+    """
+    One page of public items and the total count, or None while the kind's
+    feed is not built (callers query the source collection instead; a
+    rebuild is started in the background)
+
+    Args:
+        kind: Source collection name
+        query: Public list filter from utils/queries.py (built with is_admin=False)
+        sort: Sort specification over response fields
+
+    Returns:
+        (response-shaped documents, total matching), or None
+    """
+    if not await is_built(kind):
+        schedule_rebuild(kind)
+        return None
+    feed = get_database()[FEED_COLLECTION]
+    query = {**query, "kind": kind}
+    total = await feed.count_documents(query)
+    items = await feed.find(query, feed_projection(kind)).sort(sort).skip(skip).limit(limit).to_list(length=limit)
+    return items, total
+
+
+async def check(kind: str, repair: bool = False) -> dict:
+    """
+    Compare a kind's feed with its source collection
+
+    Returns counts and sample IDs of entries that are missing, stale (differ
+    from the freshly shaped document) or orphaned (no longer published).
+    With `repair` the differences are written back.
+    """
+    feed = get_database()[FEED_COLLECTION]
+    stored = {}
+    async for entry in feed.find({"kind": kind}):
+        stored[entry["_id"]] = entry
+
+    missing, stale, fixes = [], [], []
+    async for document in get_database()[kind].find({"status": PUBLISHED_STATUS}):
+        expected = feed_document(kind, document)
+        current = stored.pop(expected["_id"], None)
+        if current is None:
+            missing.append(expected["id"])
+        elif current != expected:
+            stale.append(expected["id"])
+        else:
+            continue
+        fixes.append(ReplaceOne({"_id": expected["_id"]}, expected, upsert=True))
+    orphaned = [entry["id"] for entry in stored.values()]
+    fixes += [DeleteOne({"_id": entry_id}) for entry_id in stored]
+
+    if repair and fixes:
+        for start in range(0, len(fixes), 500):
+            await feed.bulk_write(fixes[start:start + 500], ordered=False)
+    return {
+        "kind": kind,
+        "consistent": not fixes,
+        "missing": len(missing),
+        "stale": len(stale),
+        "orphaned": len(orphaned),
+        "sample": {"missing": missing[:10], "stale": stale[:10], "orphaned": orphaned[:10]},
+        "repaired": bool(repair and fixes)
+    }
@@ -0,0 +1,211 @@
+"""
+Per-client rate limiting for expensive public endpoints
+
+Each policy is a token bucket: `burst` requests may arrive at once, then
+tokens refill at `limit` per `period` seconds. Buckets are keyed by policy
+and client address and live in process memory; idle buckets that have
+refilled completely are compacted away as the table is touched.
+
+With `rate_limit_store = "mongo"` buckets are shared between workers in the
+`rate_limits` collection, updated atomically with a single pipeline
+update. A rejected client is remembered locally until its Retry-After
+passes, so repeated throttled requests never reach MongoDB. If MongoDB is
+unreachable the in-memory buckets take over (limits become per worker).
+
+Routes opt in with `dependencies=[Depends(rate_limit("login"))]`.
+"""
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from fastapi import HTTPException, Request, status
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+from app.config import settings
+from app.database import get_database
+from app.services.metrics import rate_limited_total
+
+RATE_LIMITS_COLLECTION = "rate_limits"
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """Token bucket parameters"""
+    limit: int  # Tokens refilled per period
+    period: float  # Seconds
+    burst: int  # Bucket capacity
+
+    @property
+    def rate(self) -> float:
+        """Tokens per second"""
+        return self.limit / self.period
+
+
+# Policy name -> limits. bcrypt, SMTP and regex scans are what these protect.
+POLICIES: Dict[str, RateLimitPolicy] = {
+    "login": RateLimitPolicy(limit=10, period=60, burst=5),
+    "register": RateLimitPolicy(limit=5, period=300, burst=3),
+    "admin_otp": RateLimitPolicy(limit=5, period=900, burst=3),  # Each request sends an email
+    "admin_otp_email": RateLimitPolicy(limit=3, period=900, burst=3),  # Per target address
+    "verify_otp": RateLimitPolicy(limit=10, period=300, burst=5),
+    "subscribe": RateLimitPolicy(limit=5, period=300, burst=3),
+    "search": RateLimitPolicy(limit=60, period=60, burst=20),
+}
+
+Decision = Tuple[bool, float]  # (allowed, seconds until a token is available)
+
+
+class MemoryBucketStore:
+    """Token buckets in a dict: key -> [tokens, last refill time]"""
+
+    def __init__(self, compact_every: float = 60.0):
+        self._buckets: Dict[Tuple[str, str], List[float]] = {}
+        self._compact_every = compact_every
+        self._next_compact = time.monotonic() + compact_every
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def take(self, name: str, policy: RateLimitPolicy, key: str, cost: float = 1.0) -> Decision:
+        now = time.monotonic()
+        if now >= self._next_compact:
+            self.compact(now)
+
+        bucket = self._buckets.get((name, key))
+        if bucket is None:
+            bucket = self._buckets[(name, key)] = [float(policy.burst), now]
+        else:
+            bucket[0] = min(policy.burst, bucket[0] + (now - bucket[1]) * policy.rate)
+            bucket[1] = now
+
+        if bucket[0] >= cost:
+            bucket[0] -= cost
+            return True, 0.0
+        return False, (cost - bucket[0]) / policy.rate
+
+    def compact(self, now: Optional[float] = None):
+        """Drop buckets that would be full again (equivalent to absent)"""
+        now = time.monotonic() if now is None else now
+        self._buckets = {
+            (name, key): bucket
+            for (name, key), bucket in self._buckets.items()
+            if name in POLICIES
+            and bucket[0] + (now - bucket[1]) * POLICIES[name].rate < POLICIES[name].burst
+        }
+        self._next_compact = now + self._compact_every
+
+    def clear(self):
+        self._buckets.clear()
+
+
+class MongoBucketStore:
+    """Token buckets shared between workers through MongoDB"""
+
+    def __init__(self, fallback: MemoryBucketStore):
+        self._fallback = fallback
+        self._blocked: Dict[Tuple[str, str], float] = {}  # Known-empty buckets -> monotonic retry time
+
+    async def take(self, name: str, policy: RateLimitPolicy, key: str, cost: float = 1.0) -> Decision:
+        now_mono = time.monotonic()
+        blocked_until = self._blocked.get((name, key))
+        if blocked_until is not None:
+            if blocked_until > now_mono:
+                return False, blocked_until - now_mono
+            del self._blocked[(name, key)]
+
+        now = datetime.utcnow()
+        # Seconds until an empty bucket is full again; the TTL index removes it after that
+        idle_expiry = now + timedelta(seconds=policy.burst / policy.rate)
+        elapsed = {"$divide": [{"$subtract": [now, {"$ifNull": ["$updated_at", now]}]}, 1000]}
+        pipeline = [
+            {"$set": {"tokens": {"$min": [
+                policy.burst,
+                {"$add": [{"$ifNull": ["$tokens", policy.burst]}, {"$multiply": [elapsed, policy.rate]}]}
+            ]}}},
+            {"$set": {
+                "allowed": {"$gte": ["$tokens", cost]},
+                "tokens": {"$cond": [{"$gte": ["$tokens", cost]}, {"$subtract": ["$tokens", cost]}, "$tokens"]},
+                "updated_at": now,
+                "expires_at": idle_expiry
+            }}
+        ]
+        try:
+            bucket = await get_database()[RATE_LIMITS_COLLECTION].find_one_and_update(
+                {"_id": f"{name}:{key}"},
+                pipeline,
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except PyMongoError as e:
+            print(f"[RATE-LIMIT] Shared store unavailable, using local buckets: {str(e)}")
+            return self._fallback.take(name, policy, key, cost)
+
+        if bucket["allowed"]:
+            return True, 0.0
+        retry_after = (cost - bucket["tokens"]) / policy.rate
+        if len(self._blocked) > 10000:
+            self._blocked = {k: v for k, v in self._blocked.items() if v > now_mono}
+        self._blocked[(name, key)] = now_mono + retry_after
+        return False, retry_after
+
+
+class RateLimiter:
+    """Checks requests against named policies"""
+
+    def __init__(self):
+        self.memory = MemoryBucketStore()
+        self.mongo = MongoBucketStore(self.memory)
+
+    async def hit(self, name: str, key: str, cost: float = 1.0) -> Decision:
+        """Take `cost` tokens from the bucket for (`name`, `key`)"""
+        policy = POLICIES[name]
+        if settings.rate_limit_store == "mongo":
+            return await self.mongo.take(name, policy, key, cost)
+        return self.memory.take(name, policy, key, cost)
+
+    async def check(self, name: str, key: str, cost: float = 1.0):
+        """Like hit(), but raises 429 with Retry-After when the bucket is empty"""
+        if not settings.rate_limit_enabled:
+            return
+        allowed, retry_after = await self.hit(name, key, cost)
+        if not allowed:
+            rate_limited_total.inc(name)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Please try again later.",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+            )
+
+
+# Global rate limiter instance
+rate_limiter = RateLimiter()
+
+
+def client_key(request: Request) -> str:
+    """Identify the client by address (first X-Forwarded-For hop if trusted)"""
+    if settings.rate_limit_trust_forwarded:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",", 1)[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit(name: str, query_param: Optional[str] = None):
+    """
+    Dependency enforcing policy `name` per client
+
+    Args:
+        name: Key of POLICIES
+        query_param: Only count requests that carry this query parameter
+            (e.g. "search" on list endpoints)
+    """
+    if name not in POLICIES:
+        raise ValueError(f"Unknown rate limit policy: {name}")
+
+    async def dependency(request: Request):
+        if query_param and not request.query_params.get(query_param):
+            return
+        await rate_limiter.check(name, client_key(request))
+
+    return dependency
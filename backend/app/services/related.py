@@ -0,0 +1,503 @@
+"""
+Related-content recommendations between news, reports and intelligence cards
+
+Every published item is turned into a sparse vector of weighted features:
+tags, companies, industry and category, plus TF-IDF weighted title words.
+Similarity is the cosine of two vectors; a card's explicit `report_id` link
+adds a bonus so the linked report always ranks first. The top
+`related_top_k` neighbours of each kind are stored per item in the
+`related_items` collection together with a short summary of each
+neighbour, so GET /api/related/{kind}/{id} is a single `_id` lookup.
+
+Writes are handled incrementally from content events, in a background
+task with the scoring run in a thread. Each worker keeps its feature model
+(titles and facet fields only) resident and patches it with the changed
+items; items changed by other workers arrive through the invalidation bus
+and are re-read before the next refresh, and the model is reloaded every
+`related_model_reload_seconds`. A changed item's list is recomputed; it is
+inserted into (or moved within) the stored lists of items it now ranks
+for, and only lists it drops out of are recomputed. Candidates come from
+rarer features first, capped per feature, so common words and broad
+categories do not make a write touch most of the catalog. Only lists that
+changed are written. `maintenance.py related` rebuilds everything, e.g.
+after large imports shift the IDF weights.
+"""
+import asyncio
+import math
+import re
+import time
+from collections import defaultdict
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from bson import ObjectId
+from pymongo import ReplaceOne
+from pymongo.errors import PyMongoError
+from app.config import settings
+from app.database import get_database
+from app.services.cdn import cdn_purger, related_key
+from app.services.events import ContentEvent, PUBLISHED_STATUS, content_events
+from app.utils.background import spawn_background
+
+RELATED_COLLECTION = "related_items"
+
+# URL segment -> collection, matching the content routers
+RELATED_KINDS: Dict[str, str] = {
+    "news": "news",
+    "reports": "reports",
+    "intelligence-cards": "intelligence_cards",
+}
+
+# Feature weights before IDF; companies are the strongest signal
+FEATURE_WEIGHTS = {"company": 3.0, "tag": 1.5, "industry": 1.0, "category": 1.0, "word": 1.0}
+
+# Added to a card <-> report pair linked through the card's report_id
+EXPLICIT_LINK_BONUS = 1.0
+
+# Fields loaded to build vectors and neighbour summaries
+MODEL_PROJECTION = {
+    "title": 1, "slug": 1, "status": 1, "tags": 1, "companies": 1, "company": 1,
+    "industry": 1, "category": 1, "tier": 1, "report_id": 1, "published_date": 1
+}
+
+STOPWORDS = {
+    "the", "and", "for", "with", "from", "that", "this", "are", "was", "its", "into", "over",
+    "after", "how", "why", "what", "who", "new", "can", "will", "has", "have", "not", "but"
+}
+
+ItemKey = Tuple[str, str]  # (collection, document id)
+Vector = Dict[str, float]
+
+
+def _words(text: str) -> List[str]:
+    return [word for word in re.findall(r"[a-z0-9]+", text.lower()) if len(word) > 2 and word not in STOPWORDS]
+
+
+def _as_list(value) -> List[str]:
+    values = value if isinstance(value, list) else [value]
+    return [str(item).strip().lower() for item in values if item not in (None, "")]
+
+
+def item_features(document: dict) -> Dict[str, float]:
+    """Raw (pre-IDF) feature weights of a document"""
+    features: Dict[str, float] = {}
+    for company in _as_list(document.get("company")) + _as_list(document.get("companies")):
+        features[f"company:{company}"] = FEATURE_WEIGHTS["company"]
+    for tag in _as_list(document.get("tags")):
+        features[f"tag:{tag}"] = FEATURE_WEIGHTS["tag"]
+    for industry in _as_list(document.get("industry")):
+        features[f"industry:{industry}"] = FEATURE_WEIGHTS["industry"]
+    for category in _as_list(document.get("category")):
+        features[f"category:{category}"] = FEATURE_WEIGHTS["category"]
+    for word in _words(document.get("title") or ""):
+        features[f"word:{word}"] = features.get(f"word:{word}", 0.0) + FEATURE_WEIGHTS["word"]
+    return features
+
+
+def summarize(collection: str, document: dict) -> dict:
+    """What a related-items list shows about a neighbour"""
+    return {
+        "kind": collection,
+        "id": str(document["_id"]),
+        "title": document.get("title", ""),
+        "slug": document.get("slug"),
+        "company": document.get("company"),
+        "category": document.get("category"),
+        "tier": document.get("tier"),
+        "published_date": document.get("published_date"),
+    }
+
+
+class RelatedModel:
+    """
+    TF-IDF vectors and feature postings for every published item
+
+    The model is patched in place as items change. A patched item is
+    weighted with the current document frequencies; other items keep the
+    weights they were last computed with until the model is reloaded.
+    """
+
+    def __init__(self, documents: Dict[ItemKey, dict]):
+        self.documents: Dict[ItemKey, dict] = {}
+        self.features: Dict[ItemKey, Dict[str, float]] = {}
+        self.document_frequency: Dict[str, int] = defaultdict(int)
+        self.vectors: Dict[ItemKey, Vector] = {}
+        # Feature -> items in insertion order (oldest published first), used as ordered sets
+        self.postings: Dict[str, Dict[ItemKey, None]] = defaultdict(dict)
+        # Report id -> published cards linking to it through report_id
+        self.cards_by_report: Dict[str, Set[ItemKey]] = defaultdict(set)
+
+        ordered = sorted(documents.items(), key=lambda item: item[1].get("published_date") or datetime.min)
+        for key, document in ordered:
+            self._add(key, document)
+        for key in self.features:
+            self.vectors[key] = self._vector(key)
+
+    @classmethod
+    async def load(cls) -> "RelatedModel":
+        database = get_database()
+        documents: Dict[ItemKey, dict] = {}
+        for collection in RELATED_KINDS.values():
+            cursor = database[collection].find({"status": PUBLISHED_STATUS}, MODEL_PROJECTION)
+            async for document in cursor:
+                documents[(collection, str(document["_id"]))] = document
+        return await asyncio.to_thread(cls, documents)
+
+    def _vector(self, key: ItemKey) -> Vector:
+        total = len(self.features)
+        vector = {
+            feature: weight * (math.log((total + 1) / (self.document_frequency[feature] + 1)) + 1)
+            for feature, weight in self.features[key].items()
+        }
+        norm = math.sqrt(sum(value * value for value in vector.values())) or 1.0
+        return {feature: value / norm for feature, value in vector.items()}
+
+    def _add(self, key: ItemKey, document: dict):
+        self.documents[key] = document
+        self.features[key] = item_features(document)
+        for feature in self.features[key]:
+            self.document_frequency[feature] += 1
+            self.postings[feature][key] = None
+        if key[0] == "intelligence_cards" and document.get("report_id"):
+            self.cards_by_report[str(document["report_id"])].add(key)
+
+    def _remove(self, key: ItemKey):
+        document = self.documents.pop(key, None)
+        if document is None:
+            return
+        for feature in self.features.pop(key):
+            self.document_frequency[feature] -= 1
+            self.postings[feature].pop(key, None)
+            if not self.document_frequency[feature]:
+                del self.document_frequency[feature]
+                del self.postings[feature]
+        self.vectors.pop(key, None)
+        if key[0] == "intelligence_cards" and document.get("report_id"):
+            self.cards_by_report[str(document["report_id"])].discard(key)
+
+    def patch(self, items: Dict[ItemKey, Optional[dict]]):
+        """Replace changed items with their current documents (None or unpublished removes them)"""
+        for key, document in items.items():
+            self._remove(key)
+            if document is not None and document.get("status") == PUBLISHED_STATUS:
+                self._add(key, document)
+        for key in items:
+            if key in self.features:
+                self.vectors[key] = self._vector(key)
+
+    def links(self, key: ItemKey) -> Set[ItemKey]:
+        """Items explicitly linked to `key` (card <-> report through report_id)"""
+        collection, doc_id = key
+        if collection == "reports":
+            return set(self.cards_by_report.get(doc_id, ()))
+        report_id = self.documents.get(key, {}).get("report_id")
+        if collection == "intelligence_cards" and report_id and ("reports", str(report_id)) in self.documents:
+            return {("reports", str(report_id))}
+        return set()
+
+    def _posting_candidates(self, feature: str) -> Iterable[ItemKey]:
+        """The feature's most recently published items, at most `related_max_candidates_per_feature`"""
+        return islice(reversed(self.postings[feature]), settings.related_max_candidates_per_feature)
+
+    def candidates(self, key: ItemKey) -> Set[ItemKey]:
+        """
+        Items sharing at least one feature (or an explicit link) with `key`
+
+        Features carried by more than `related_max_feature_df` of all items
+        (common words, broad categories) only contribute candidates when the
+        item has no rarer feature with any.
+        """
+        found: Set[ItemKey] = self.links(key)
+        limit = settings.related_max_feature_df * len(self.features)
+        common = []
+        for feature in self.features.get(key, {}):
+            if self.document_frequency[feature] > limit:
+                common.append(feature)
+            else:
+                found.update(self._posting_candidates(feature))
+        found.discard(key)
+        if not found:
+            for feature in common:
+                found.update(self._posting_candidates(feature))
+            found.discard(key)
+        return found
+
+    def score(self, key: ItemKey, other: ItemKey) -> float:
+        vector, other_vector = self.vectors[key], self.vectors[other]
+        if len(other_vector) < len(vector):
+            vector, other_vector = other_vector, vector
+        similarity = sum(value * other_vector.get(feature, 0.0) for feature, value in vector.items())
+        if other in self.links(key):
+            similarity += EXPLICIT_LINK_BONUS
+        return similarity
+
+    def entry(self, other: ItemKey, similarity: float) -> dict:
+        return {**summarize(other[0], self.documents[other]), "score": round(similarity, 4)}
+
+    def neighbors(self, key: ItemKey, top_k: int) -> List[dict]:
+        """Top `top_k` neighbours of each kind, best first (ranked by stored score, then id)"""
+        by_kind: Dict[str, List[Tuple[float, ItemKey]]] = defaultdict(list)
+        for other in self.candidates(key):
+            similarity = round(self.score(key, other), 4)
+            if similarity > 0:
+                by_kind[other[0]].append((similarity, other))
+        best: List[Tuple[float, ItemKey]] = []
+        for scored in by_kind.values():
+            scored.sort(key=lambda item: (-item[0], item[1][1]))
+            best.extend(scored[:top_k])
+        best.sort(key=lambda item: (-item[0], item[1][1]))
+        return [self.entry(other, similarity) for similarity, other in best]
+
+
+def _related_id(key: ItemKey) -> str:
+    return f"{key[0]}:{key[1]}"
+
+
+def _rank(item: dict) -> Tuple[float, str]:
+    """Sort key of a stored neighbour, matching RelatedModel.neighbors"""
+    return -item["score"], item["id"]
+
+
+def _with_neighbor(neighbors: List[dict], entry: dict, top_k: int) -> List[dict]:
+    """`neighbors` with `entry` inserted in rank order, keeping `top_k` of each kind"""
+    merged = sorted(neighbors + [entry], key=_rank)
+    kept: List[dict] = []
+    per_kind: Dict[str, int] = defaultdict(int)
+    for item in merged:
+        if per_kind[item["kind"]] < top_k:
+            kept.append(item)
+            per_kind[item["kind"]] += 1
+    return kept
+
+
+def _updated_lists(
+    model: RelatedModel,
+    changed: Set[ItemKey],
+    stored: Dict[ItemKey, List[dict]]
+) -> Dict[ItemKey, Optional[List[dict]]]:
+    """
+    New lists for the changed items and the stored lists they affect (None: delete)
+
+    Changed items are recomputed in full. Other stored lists are patched: a
+    changed item enters a list when it beats the lowest entry of its kind,
+    or moves within it. A list is recomputed only when a changed item drops
+    out or below that lowest entry, since an item outside the list may now
+    deserve the slot.
+    """
+    top_k = settings.related_top_k
+    lists: Dict[ItemKey, Optional[List[dict]]] = {}
+    for key in changed:
+        lists[key] = model.neighbors(key, top_k) if key in model.vectors else None
+
+    for key, neighbors in stored.items():
+        if key in changed:
+            continue
+        if key not in model.vectors:
+            lists[key] = None
+            continue
+        recompute = False
+        for other in changed:
+            same_kind = [item for item in neighbors if item["kind"] == other[0]]
+            # Items outside a full list rank after its last entry
+            last = max((_rank(item) for item in same_kind), default=None) if len(same_kind) >= top_k else None
+            score = round(model.score(key, other), 4) if other in model.vectors else 0.0
+            rank = (-score, other[1])
+            if any(item["id"] == other[1] for item in same_kind):
+                neighbors = [item for item in neighbors if not (item["kind"] == other[0] and item["id"] == other[1])]
+                if score <= 0 or (last is not None and rank > last):
+                    recompute = True
+                    break
+            elif score <= 0 or (last is not None and rank > last):
+                continue
+            neighbors = _with_neighbor(neighbors, model.entry(other, score), top_k)
+        lists[key] = model.neighbors(key, top_k) if recompute else neighbors
+    return lists
+
+
+async def _write(lists: Dict[ItemKey, List[dict]], existing: Optional[Dict[ItemKey, List[dict]]] = None) -> int:
+    """Store neighbour lists, skipping those equal to `existing`; returns the number written"""
+    collection = get_database()[RELATED_COLLECTION]
+    existing = existing or {}
+    writes = []
+    written = []
+    for key, neighbors in lists.items():
+        if existing.get(key) == neighbors:
+            continue
+        writes.append(ReplaceOne({"_id": _related_id(key)}, {
+            "_id": _related_id(key),
+            "kind": key[0],
+            "item_id": key[1],
+            "neighbors": neighbors,
+            # Lets writes find every list an item appears in
+            "neighbor_ids": [_related_id((item["kind"], item["id"])) for item in neighbors],
+            "updated_at": datetime.utcnow()
+        }, upsert=True))
+        written.append(key)
+    for start in range(0, len(writes), 500):
+        await collection.bulk_write(writes[start:start + 500], ordered=False)
+    cdn_purger.queue(related_key(*key) for key in written)
+    return len(writes)
+
+
+async def _fetch(keys: Iterable[ItemKey]) -> Dict[ItemKey, Optional[dict]]:
+    """Current model fields of `keys` (None for items that no longer exist)"""
+    found: Dict[ItemKey, Optional[dict]] = {}
+    ids: Dict[str, List[ObjectId]] = defaultdict(list)
+    for key in keys:
+        found[key] = None
+        if ObjectId.is_valid(key[1]):
+            ids[key[0]].append(ObjectId(key[1]))
+    for collection, object_ids in ids.items():
+        cursor = get_database()[collection].find({"_id": {"$in": object_ids}}, MODEL_PROJECTION)
+        async for document in cursor:
+            found[(collection, str(document["_id"]))] = document
+    return found
+
+
+# This process's model, when it was loaded, and items other workers changed since
+_model: Optional[RelatedModel] = None
+_model_loaded_at = 0.0
+_stale: Set[ItemKey] = set()
+
+
+def mark_stale(keys: Iterable[ItemKey]):
+    """Items changed by another worker: re-read them into the model before its next use"""
+    if _model is not None:
+        _stale.update(key for key in keys if key[0] in RELATED_KINDS.values())
+
+
+def drop_model():
+    """Forget the model (e.g. after missed invalidations); the next refresh reloads it"""
+    global _model
+    _model = None
+    _stale.clear()
+
+
+async def _resident_model() -> RelatedModel:
+    """This process's model, reloaded every `related_model_reload_seconds` to reset IDF drift"""
+    global _model, _model_loaded_at
+    if _model is None or time.monotonic() - _model_loaded_at > settings.related_model_reload_seconds:
+        _stale.clear()
+        _model = await RelatedModel.load()
+        _model_loaded_at = time.monotonic()
+    elif _stale:
+        stale = set(_stale)
+        _stale.clear()
+        await asyncio.to_thread(_model.patch, await _fetch(stale))
+    return _model
+
+
+# Items changed since the last refresh, and the task draining them
+_pending: Set[ItemKey] = set()
+_refresh_task: Optional[asyncio.Task] = None
+
+
+def _queue(keys: Iterable[ItemKey]):
+    global _refresh_task
+    _pending.update(keys)
+    if _pending and (_refresh_task is None or _refresh_task.done()):
+        _refresh_task = spawn_background(_drain())
+
+
+def apply_events(events: List[ContentEvent]):
+    """
+    Batch listener: queue changed items for a background refresh
+
+    Writes do not wait for the recompute; changes arriving while a refresh
+    runs are coalesced into the next one.
+    """
+    _queue((event.collection, event.id) for event in events if event.collection in RELATED_KINDS.values())
+
+
+async def _drain():
+    while _pending:
+        changed = set(_pending)
+        _pending.clear()
+        await refresh(changed)
+
+
+async def wait_for_refresh():
+    """Wait until queued changes are applied (for CLIs that exit after writing)"""
+    while _refresh_task is not None and not _refresh_task.done():
+        await _refresh_task
+
+
+async def refresh(changed: Set[ItemKey]):
+    """Patch the model with `changed` items and update the lists they affect"""
+    try:
+        model = await _resident_model()
+        await asyncio.to_thread(model.patch, await _fetch(changed))
+
+        def affected() -> Set[ItemKey]:
+            keys = set(changed)
+            for key in changed:
+                if key in model.vectors:
+                    keys |= model.candidates(key)
+            return keys
+
+        # Stored lists of the changed items, of the items they may enter, and of those that listed them
+        collection = get_database()[RELATED_COLLECTION]
+        stored: Dict[ItemKey, List[dict]] = {}
+        cursor = collection.find(
+            {"$or": [
+                {"_id": {"$in": [_related_id(key) for key in await asyncio.to_thread(affected)]}},
+                {"neighbor_ids": {"$in": [_related_id(key) for key in changed]}}
+            ]},
+            {"kind": 1, "item_id": 1, "neighbors": 1}
+        )
+        async for document in cursor:
+            stored[(document["kind"], document["item_id"])] = document["neighbors"]
+
+        lists = await asyncio.to_thread(_updated_lists, model, changed, stored)
+        gone = [key for key, neighbors in lists.items() if neighbors is None]
+        if gone:
+            await collection.delete_many({"_id": {"$in": [_related_id(key) for key in gone]}})
+            cdn_purger.queue(related_key(*key) for key in gone)
+        await _write({key: neighbors for key, neighbors in lists.items() if neighbors is not None}, stored)
+    except PyMongoError as e:
+        print(f"[RELATED] Failed to update related items: {str(e)}")
+
+
+content_events.register_batch(apply_events)
+
+
+async def rebuild() -> int:
+    """Recompute every list, drop lists of items no longer published and reset this process's model"""
+    global _model, _model_loaded_at
+    model = await RelatedModel.load()
+    lists = await asyncio.to_thread(
+        lambda: {key: model.neighbors(key, settings.related_top_k) for key in model.vectors}
+    )
+    written = await _write(lists)
+    await get_database()[RELATED_COLLECTION].delete_many(
+        {"_id": {"$nin": [_related_id(key) for key in model.vectors]}}
+    )
+    _model, _model_loaded_at = model, time.monotonic()
+    _stale.clear()
+    return written
+
+
+async def get_related(collection: str, doc_id: str, limit: int, kinds: Optional[List[str]] = None) -> Optional[List[dict]]:
+    """
+    Stored neighbours of an item, best first
+
+    Returns None if the item is not published. A published item without a
+    stored list yet (e.g. before the first rebuild) gets an empty list now
+    and is queued for a background refresh.
+    """
+    document = await get_database()[RELATED_COLLECTION].find_one({"_id": _related_id((collection, doc_id))})
+    if document is None:
+        if not ObjectId.is_valid(doc_id):
+            return None
+        published = await get_database()[collection].count_documents(
+            {"_id": ObjectId(doc_id), "status": PUBLISHED_STATUS}, limit=1
+        )
+        if not published:
+            return None
+        _queue([(collection, doc_id)])
+        return []
+
+    neighbors = document["neighbors"]
+    if kinds:
+        neighbors = [item for item in neighbors if item["kind"] in kinds]
+    return neighbors[:limit]
@@ -0,0 +1,270 @@
+"""
+Scheduled publishing
+
+Documents saved with status "scheduled" are flipped to "published" when
+their published_date arrives. Each worker keeps a heap of due times, rebuilt
+from MongoDB at startup and periodically resynced, and sleeps until the
+earliest one instead of polling. A lock document per job ensures only one
+worker fires it when several run side by side; a publish that fails gives
+its locks back and is retried after a short backoff.
+"""
+import asyncio
+import heapq
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from bson import ObjectId
+from fastapi import HTTPException, status
+from pymongo.errors import BulkWriteError, PyMongoError
+from app.config import settings
+from app.database import get_database
+from app.services.events import ContentEvent, content_events, derive_action
+
+SCHEDULED_STATUS = "scheduled"
+PUBLISHED_STATUS = "published"
+
+# Collections that support scheduled publishing
+SCHEDULED_COLLECTIONS = ["intelligence_cards", "news", "reports"]
+
+# How long a fired job's lock document is kept (TTL index cleans it up)
+LOCK_RETENTION = timedelta(hours=1)
+
+JobKey = Tuple[str, str]  # (collection, document id)
+
+
+def _as_utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """Normalize to the naive-UTC datetimes MongoDB returns"""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def require_publish_date(item_status, published_date: Optional[datetime]):
+    """Reject saving a scheduled item that has no published_date to fire at"""
+    if getattr(item_status, "value", item_status) == SCHEDULED_STATUS and published_date is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Scheduled items need a published_date"
+        )
+
+
+def _lock_id(collection: str, doc_id: str, due: datetime) -> str:
+    return f"{collection}:{doc_id}:{due.isoformat()}"
+
+
+class PublishScheduler:
+    """Heap-backed scheduler for status flips"""
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, str, str]] = []
+        self._due: Dict[JobKey, datetime] = {}  # Current due time per job (stale heap entries are skipped)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.fired = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._due)
+
+    def schedule(self, collection: str, doc_id: str, due: datetime):
+        """Add or move a job; wakes the loop if it is now the earliest"""
+        due = _as_utc_naive(due)
+        key = (collection, doc_id)
+        if self._due.get(key) == due:
+            return
+        self._due[key] = due
+        heapq.heappush(self._heap, (due, collection, doc_id))
+        if self._heap[0][0] == due:
+            self._wakeup.set()
+
+    def cancel(self, collection: str, doc_id: str):
+        """Forget a job; its heap entry is discarded lazily"""
+        self._due.pop((collection, doc_id), None)
+
+    def on_content_event(self, event: ContentEvent):
+        """Content hub listener keeping the heap in sync with local writes"""
+        if event.collection not in SCHEDULED_COLLECTIONS:
+            return
+        document = event.document
+        if document and document.get("status") == SCHEDULED_STATUS and document.get("published_date"):
+            self.schedule(event.collection, event.id, document["published_date"])
+        else:
+            self.cancel(event.collection, event.id)
+
+    async def rebuild(self):
+        """Reload every scheduled job from MongoDB (startup and periodic resync)"""
+        database = get_database()
+        jobs: Dict[JobKey, datetime] = {}
+        for collection in SCHEDULED_COLLECTIONS:
+            cursor = database[collection].find(
+                {"status": SCHEDULED_STATUS},
+                {"published_date": 1}
+            )
+            async for doc in cursor:
+                if doc.get("published_date"):
+                    jobs[(collection, str(doc["_id"]))] = _as_utc_naive(doc["published_date"])
+
+        self._due = jobs
+        self._heap = [(due, collection, doc_id) for (collection, doc_id), due in jobs.items()]
+        heapq.heapify(self._heap)
+        self._wakeup.set()
+
+    def _pop_due(self, now: datetime) -> Dict[str, List[Tuple[str, datetime]]]:
+        """Pop every job due by `now` (plus the coalescing window), grouped by collection"""
+        horizon = now + timedelta(milliseconds=settings.scheduler_coalesce_ms)
+        batch: Dict[str, List[Tuple[str, datetime]]] = {}
+        while self._heap and self._heap[0][0] <= horizon:
+            due, collection, doc_id = heapq.heappop(self._heap)
+            if self._due.get((collection, doc_id)) != due:
+                continue  # Stale entry: cancelled or rescheduled
+            del self._due[(collection, doc_id)]
+            batch.setdefault(collection, []).append((doc_id, due))
+        return batch
+
+    def _next_delay(self) -> Optional[float]:
+        """Seconds until the earliest live job, or None if there is none"""
+        while self._heap and self._due.get((self._heap[0][1], self._heap[0][2])) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        return (self._heap[0][0] - datetime.utcnow()).total_seconds()
+
+    async def _acquire(self, collection: str, jobs: List[Tuple[str, datetime]]) -> List[ObjectId]:
+        """Claim jobs across workers; returns the IDs this worker won"""
+        now = datetime.utcnow()
+        locks = [{
+            "_id": _lock_id(collection, doc_id, due),
+            "owner": self._owner,
+            "expires_at": now + LOCK_RETENTION
+        } for doc_id, due in jobs]
+        lost = set()
+        try:
+            await get_database().scheduler_locks.insert_many(locks, ordered=False)
+        except BulkWriteError as e:
+            lost = {error["index"] for error in e.details.get("writeErrors", [])}
+        return [ObjectId(doc_id) for i, (doc_id, _) in enumerate(jobs) if i not in lost]
+
+    async def _release_unfired(self, collection: str, jobs: List[Tuple[str, datetime]], fired: set):
+        """Drop the locks of claimed jobs that were not published, so a later resync can fire them"""
+        unfired = [_lock_id(collection, doc_id, due) for doc_id, due in jobs if ObjectId(doc_id) not in fired]
+        if unfired:
+            await get_database().scheduler_locks.delete_many({"_id": {"$in": unfired}, "owner": self._owner})
+
+    async def _retry_later(self, collection: str, jobs: List[Tuple[str, datetime]]):
+        """Give back the locks of a failed publish and requeue its jobs after a backoff"""
+        try:
+            await self._release_unfired(collection, jobs, set())
+        except PyMongoError as e:
+            print(f"[SCHEDULER] Failed to release locks, they expire with the TTL index: {str(e)}")
+        retry_at = datetime.utcnow() + timedelta(seconds=settings.scheduler_retry_seconds)
+        for doc_id, _ in jobs:
+            if (collection, doc_id) not in self._due:  # Not rescheduled meanwhile
+                self.schedule(collection, doc_id, retry_at)
+
+    async def _publish_due(self, collection: str, jobs: List[Tuple[str, datetime]]) -> List[ContentEvent]:
+        """Claim and publish one collection's jobs with a single update_many"""
+        database = get_database()
+        ids = await self._acquire(collection, jobs)
+        if not ids:
+            return []
+
+        # Jobs were popped up to the coalescing horizon, so match on their
+        # due times rather than the clock (they may be a few ms ahead of it)
+        now = datetime.utcnow()
+        due_filter = {
+            "_id": {"$in": ids},
+            "status": SCHEDULED_STATUS,
+            "published_date": {"$lte": max(due for _, due in jobs)}
+        }
+        before = await database[collection].find(due_filter).to_list(length=None)
+        await self._release_unfired(collection, jobs, {doc["_id"] for doc in before})
+        if not before:
+            return []
+        flipped_ids = [doc["_id"] for doc in before]
+        await database[collection].update_many(
+            {"_id": {"$in": flipped_ids}, "status": SCHEDULED_STATUS},
+            {"$set": {"status": PUBLISHED_STATUS, "updated_at": now}}
+        )
+        events = []
+        for doc in before:
+            after = {**doc, "status": PUBLISHED_STATUS, "updated_at": now}
+            events.append(ContentEvent(
+                collection=collection,
+                action=derive_action(doc, after),
+                id=str(doc["_id"]),
+                document=after,
+                previous=doc
+            ))
+        return events
+
+    async def _fire(self, batch: Dict[str, List[Tuple[str, datetime]]]):
+        """Publish one batch: one update_many and one event batch per collection"""
+        events: List[ContentEvent] = []
+        for collection, jobs in batch.items():
+            try:
+                published = await self._publish_due(collection, jobs)
+            except PyMongoError as e:
+                print(f"[SCHEDULER] Publishing {collection} failed, retrying {len(jobs)} job(s): {str(e)}")
+                await self._retry_later(collection, jobs)
+                continue
+            if published:
+                events += published
+                self.fired += len(published)
+                print(f"⏰ Scheduler published {len(published)} {collection} item(s)")
+
+        # One emit for the whole batch, so caches are invalidated once
+        await content_events.emit_many(events)
+
+    async def _run(self):
+        last_resync = datetime.utcnow()
+        resync_every = settings.scheduler_resync_seconds
+        while True:
+            delay = self._next_delay()
+            if resync_every > 0:
+                until_resync = resync_every - (datetime.utcnow() - last_resync).total_seconds()
+                delay = until_resync if delay is None else min(delay, until_resync)
+
+            if delay is None or delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                    continue  # Heap changed; recompute the earliest due time
+                except asyncio.TimeoutError:
+                    pass
+
+            try:
+                if resync_every > 0 and (datetime.utcnow() - last_resync).total_seconds() >= resync_every:
+                    last_resync = datetime.utcnow()
+                    await self.rebuild()
+                batch = self._pop_due(datetime.utcnow())
+                if batch:
+                    await self._fire(batch)
+            except asyncio.CancelledError:
+                raise
+            except PyMongoError as e:
+                print(f"[SCHEDULER] Run failed, will retry on next resync: {str(e)}")
+
+    async def start(self):
+        """Rebuild the heap from MongoDB and start the scheduler loop"""
+        if not settings.scheduler_enabled or self._task is not None:
+            return
+        content_events.register(self.on_content_event)
+        await self.rebuild()
+        self._task = asyncio.create_task(self._run())
+        print(f"⏰ Scheduler started with {self.pending} pending job(s)")
+
+    async def stop(self):
+        content_events.unregister(self.on_content_event)
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global scheduler instance
+publish_scheduler = PublishScheduler()
@@ -0,0 +1,174 @@
+"""
+Slow-query log
+
+A pymongo command listener that records reads and writes slower than
+`slow_query_ms`. Each entry carries the filter *shape* (operators and field
+names, values replaced by their type) rather than user data, so entries for
+the same query pattern group together. The first time a shape turns up
+slow, an `explain` (queryPlanner verbosity, which does not run the query)
+is fetched in the background and its plan summary attached to the entry
+and to later entries of that shape.
+
+Entries are printed as one JSON line each (`[SLOW-QUERY] {...}`) and the
+most recent ones are kept for GET /api/diagnostics/slow-queries.
+"""
+import asyncio
+import json
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from pymongo import monitoring
+from app.config import settings
+
+# Commands worth logging, and the fields of each that an explain needs
+EXPLAINABLE_FIELDS = {
+    "find": ("filter", "sort", "projection", "skip", "limit", "hint", "collation"),
+    "aggregate": ("pipeline", "cursor", "hint", "collation"),
+    "count": ("query", "skip", "limit", "hint", "collation"),
+    "distinct": ("key", "query", "collation"),
+    "findAndModify": ("query", "sort", "update", "remove", "new", "upsert"),
+    "update": ("updates",),
+    "delete": ("deletes",),
+}
+
+
+def query_shape(value: Any) -> Any:
+    """Replace values with their type names, keeping operators and field names"""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        # Lists of conditions ($or, $and, pipelines) keep their structure; value lists collapse
+        if value and all(isinstance(item, dict) for item in value):
+            return [query_shape(item) for item in value]
+        return "array"
+    return type(value).__name__
+
+
+def _command_shape(name: str, command: dict) -> dict:
+    if name == "find":
+        return {"filter": query_shape(command.get("filter", {})), "sort": query_shape(command.get("sort"))}
+    if name == "aggregate":
+        return {"pipeline": query_shape(command.get("pipeline", []))}
+    if name in ("update", "delete"):
+        key = "updates" if name == "update" else "deletes"
+        return {"filter": [query_shape(statement.get("q", {})) for statement in command.get(key, [])[:1]]}
+    return {"filter": query_shape(command.get("query", {}))}
+
+
+def summarize_plan(explain: dict) -> dict:
+    """Winning plan stages (outermost first), indexes used and rejected plan count"""
+    planner = explain.get("queryPlanner")
+    if planner is None:
+        # Aggregations nest the planner under the $cursor stage
+        for stage in explain.get("stages", []):
+            planner = stage.get("$cursor", {}).get("queryPlanner")
+            if planner:
+                break
+    if not planner:
+        return {}
+
+    stages: List[str] = []
+    indexes: List[str] = []
+    plan = planner.get("winningPlan", {})
+    plan = plan.get("queryPlan", plan)  # Slot-based engine wraps the classic plan
+    while plan:
+        stages.append(plan.get("stage", "?"))
+        if plan.get("indexName"):
+            indexes.append(plan["indexName"])
+        children = plan.get("inputStages") or []
+        plan = plan.get("inputStage") or (children[0] if children else None)
+    return {
+        "stages": stages,
+        "indexes": indexes,
+        "collection_scan": "COLLSCAN" in stages,
+        "rejected_plans": len(planner.get("rejectedPlans", []))
+    }
+
+
+class SlowQueryLog(monitoring.CommandListener):
+    """Command listener recording slow commands with their shape and plan"""
+
+    def __init__(self, size: int = 200):
+        self.entries: Deque[dict] = deque(maxlen=size)
+        self.plans: Dict[str, dict] = {}  # shape key -> plan summary
+        self._pending: Dict[Tuple[int, int], Tuple[str, str, dict]] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._database = None
+
+    def attach(self, database, loop: asyncio.AbstractEventLoop):
+        """Bind to the app's database and loop so explains can be scheduled"""
+        self._database = database
+        self._loop = loop
+
+    def _key(self, event) -> Tuple[int, int]:
+        return (event.request_id, event.operation_id or 0)
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        name = event.command_name
+        fields = EXPLAINABLE_FIELDS.get(name)
+        if fields is None:
+            return
+        command = event.command
+        explainable = {name: command.get(name), **{field: command[field] for field in fields if field in command}}
+        with self._lock:
+            self._pending[self._key(event)] = (name, command.get(name), explainable)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        self._finish(event, None)
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        self._finish(event, event.failure.get("errmsg") if isinstance(event.failure, dict) else str(event.failure))
+
+    def _finish(self, event, error: Optional[str]):
+        with self._lock:
+            pending = self._pending.pop(self._key(event), None)
+        if pending is None:
+            return
+        duration_ms = event.duration_micros / 1000
+        if duration_ms < settings.slow_query_ms:
+            return
+
+        name, collection, command = pending
+        shape = _command_shape(name, command)
+        shape_key = json.dumps([collection, name, shape], sort_keys=True, default=str)
+        entry = {
+            "at": datetime.utcnow().isoformat(),
+            "collection": collection,
+            "command": name,
+            "duration_ms": round(duration_ms, 1),
+            "shape": shape,
+            "plan": self.plans.get(shape_key),
+        }
+        if error:
+            entry["error"] = error
+        self.entries.append(entry)
+        print(f"[SLOW-QUERY] {json.dumps(entry, default=str)}")
+
+        if settings.slow_query_explain and name not in ("update", "delete") and shape_key not in self.plans:
+            self.plans[shape_key] = None  # Explain each shape once
+            if self._loop is not None and self._database is not None:
+                self._loop.call_soon_threadsafe(self._schedule_explain, shape_key, command, entry)
+
+    def _schedule_explain(self, shape_key: str, command: dict, entry: dict):
+        asyncio.ensure_future(self._explain(shape_key, command, entry))
+
+    async def _explain(self, shape_key: str, command: dict, entry: dict):
+        try:
+            result = await self._database.command({"explain": command, "verbosity": "queryPlanner"})
+        except Exception as e:
+            print(f"[SLOW-QUERY] explain failed for {entry['collection']}.{entry['command']}: {str(e)}")
+            return
+        plan = summarize_plan(result)
+        self.plans[shape_key] = plan
+        entry["plan"] = plan
+        print(f"[SLOW-QUERY] plan {json.dumps({'collection': entry['collection'], 'shape': entry['shape'], 'plan': plan})}")
+
+    def recent(self, limit: int = 50) -> List[dict]:
+        """Most recent entries first"""
+        return list(self.entries)[::-1][:limit]
+
+
+# Global slow-query log (registered on the client in connect_to_mongo)
+slow_query_log = SlowQueryLog(settings.slow_query_log_size)
@@ -0,0 +1,368 @@
+"""
+Shared on-disk snapshot of the published catalog
+
+Every published news item, report and intelligence card is encoded once,
+exactly as its get-by-id endpoint returns it, and written to a single file
+that all workers map read-only. The bulk of the data therefore lives once
+in the OS page cache rather than once per process; each worker only keeps
+the small offset index.
+
+File layout:
+    MAGIC (8 bytes) | item bodies | index JSON | index offset, index length (8 bytes each, big-endian)
+with index {"built_at": iso, "kinds": {kind: [[id, offset, length], ...]}},
+items ordered newest first and offsets relative to the first body byte.
+The index is a trailer so bodies can be streamed to disk as they are
+encoded: a build holds one batch of documents in memory, not the catalog.
+
+The worker that handles a public change rewrites the snapshot (changes
+arriving within `snapshot_rebuild_delay_seconds` are coalesced) into a
+temporary file and swaps it in with an atomic rename; readers notice the
+new file by its inode and remap it. Workers on one host can finish builds
+out of order, so the swap happens under a lock file and is skipped when
+the file in place was built from a later read than this build's. When MongoDB cannot be reached, the
+public get-by-id and unfiltered list endpoints are answered from the
+snapshot (see the PyMongoError handler in main.py).
+"""
+import asyncio
+import fcntl
+import json
+import mmap
+import os
+import re
+import time
+import uuid
+from datetime import datetime
+from math import ceil
+from typing import Dict, List, Optional, Tuple
+from fastapi import Request, Response
+from pymongo.errors import PyMongoError
+from app.config import settings
+from app.database import get_database
+from app.services.events import ContentEvent, PUBLISHED_STATUS, content_events
+from app.services.public_feed import FEED_SOURCES
+from app.utils.background import spawn_background
+from app.utils.serialization import encode_json
+
+MAGIC = b"PCSNAP2\n"
+TRAILER_LENGTH = 16
+
+# Documents read, encoded and written per step of a build
+BUILD_BATCH_SIZE = 500
+
+# URL segment -> collection, for serving fallbacks
+SNAPSHOT_PATHS = {"news": "news", "reports": "reports", "intelligence-cards": "intelligence_cards"}
+FALLBACK_ROUTE = re.compile(r"^/api/(news|reports|intelligence-cards)(?:/([0-9a-fA-F]{24}))?/?$")
+
+# List parameters the snapshot can honour (its items are in the default newest-first order)
+FALLBACK_LIST_PARAMS = {"page", "size", "sort_by"}
+
+# Rebuild at startup if the file is older than this (changes may have been made while no worker ran)
+STARTUP_REBUILD_AGE_SECONDS = 600
+
+# How often readers check whether the file was swapped
+REFRESH_CHECK_SECONDS = 1.0
+
+
+class SnapshotWriter:
+    """Streams item bodies into a temporary file next to `path`; `commit()` swaps it in"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        self.temp_path = os.path.join(directory, f".{os.path.basename(path)}.{uuid.uuid4().hex}.tmp")
+        self._handle = open(self.temp_path, "wb")
+        self._handle.write(MAGIC)
+        self._offset = 0
+        self.index: Dict[str, list] = {}
+        self.count = 0
+
+    def write_items(self, kind: str, items: List[Tuple[str, bytes]]):
+        """Append encoded bodies to `kind` (call in newest-first order)"""
+        entries = self.index.setdefault(kind, [])
+        for doc_id, body in items:
+            self._handle.write(body)
+            entries.append([doc_id, self._offset, len(body)])
+            self._offset += len(body)
+        self.count += len(items)
+
+    def encode_and_write(self, kind: str, documents: List[dict]):
+        shaper, response_type = FEED_SOURCES[kind]
+        self.write_items(kind, [(str(doc["_id"]), encode_json(response_type, shaper(doc))) for doc in documents])
+
+    def commit(self, built_at: datetime) -> bool:
+        """
+        Append the index and trailer and atomically replace `path`, unless
+        the snapshot there was built at or after `built_at`; returns whether
+        the file was replaced
+        """
+        try:
+            index = json.dumps({"built_at": built_at.isoformat(), "kinds": self.index}, separators=(",", ":")).encode()
+            self._handle.write(index)
+            self._handle.write((len(MAGIC) + self._offset).to_bytes(8, "big"))
+            self._handle.write(len(index).to_bytes(8, "big"))
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+            self._handle.close()
+            lock_path = os.path.join(os.path.dirname(self.temp_path), f".{os.path.basename(self.path)}.lock")
+            with open(lock_path, "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)  # Released when the lock file is closed
+                current = read_built_at(self.path)
+                if current is not None and current >= built_at:
+                    return False
+                os.replace(self.temp_path, self.path)
+                return True
+        finally:
+            self.discard()
+
+    def discard(self):
+        """Remove the temporary file (no-op after a successful commit)"""
+        self._handle.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+
+def read_built_at(path: str) -> Optional[datetime]:
+    """The build time recorded in the snapshot at `path`, or None if there is no readable one"""
+    try:
+        with open(path, "rb") as handle:
+            if handle.read(len(MAGIC)) != MAGIC:
+                return None
+            handle.seek(-TRAILER_LENGTH, os.SEEK_END)
+            trailer = handle.read(TRAILER_LENGTH)
+            handle.seek(int.from_bytes(trailer[:8], "big"))
+            index = json.loads(handle.read(int.from_bytes(trailer[8:], "big")))
+        return datetime.fromisoformat(index["built_at"])
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def write_snapshot(path: str, sections: Dict[str, List[Tuple[str, bytes]]], built_at: datetime) -> bool:
+    """Write already-encoded sections as a snapshot file and atomically replace `path` with it"""
+    writer = SnapshotWriter(path)
+    try:
+        for kind, items in sections.items():
+            writer.write_items(kind, items)
+    except BaseException:
+        writer.discard()
+        raise
+    return writer.commit(built_at)
+
+
+class Snapshot:
+    """A mapped snapshot file"""
+
+    def __init__(self, handle, mapped: mmap.mmap, index: dict, data_start: int, file_id: Tuple[int, int]):
+        self._handle = handle
+        self._map = mapped
+        self.built_at: str = index["built_at"]
+        self.data_start = data_start
+        self.file_id = file_id
+        self.entries: Dict[str, List[Tuple[str, int, int]]] = {
+            kind: [tuple(entry) for entry in entries] for kind, entries in index["kinds"].items()
+        }
+        self.positions: Dict[str, Dict[str, int]] = {
+            kind: {entry[0]: position for position, entry in enumerate(entries)}
+            for kind, entries in self.entries.items()
+        }
+
+    @classmethod
+    def open(cls, path: str) -> "Snapshot":
+        handle = open(path, "rb")
+        try:
+            stat = os.fstat(handle.fileno())
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            handle.close()
+            raise
+        if len(mapped) < len(MAGIC) + TRAILER_LENGTH or mapped[:len(MAGIC)] != MAGIC:
+            mapped.close()
+            handle.close()
+            raise ValueError(f"{path} is not a snapshot file (or has an older layout)")
+        index_start = int.from_bytes(mapped[-TRAILER_LENGTH:-8], "big")
+        index_length = int.from_bytes(mapped[-8:], "big")
+        index = json.loads(mapped[index_start:index_start + index_length])
+        return cls(handle, mapped, index, len(MAGIC), (stat.st_ino, stat.st_mtime_ns))
+
+    def close(self):
+        self._map.close()
+        self._handle.close()
+
+    def _body(self, entry: Tuple[str, int, int]) -> bytes:
+        start = self.data_start + entry[1]
+        return self._map[start:start + entry[2]]
+
+    def item(self, kind: str, doc_id: str) -> Optional[bytes]:
+        """Encoded response body of a published item, or None"""
+        position = self.positions.get(kind, {}).get(doc_id)
+        if position is None:
+            return None
+        return self._body(self.entries[kind][position])
+
+    def page(self, kind: str, skip: int, limit: int) -> Tuple[List[bytes], int]:
+        """Encoded bodies of one page of published items (newest first) and the total"""
+        entries = self.entries.get(kind, [])
+        return [self._body(entry) for entry in entries[skip:skip + limit]], len(entries)
+
+
+class SnapshotStore:
+    """Builds the snapshot file and keeps this worker's mapping current"""
+
+    def __init__(self):
+        self._snapshot: Optional[Snapshot] = None
+        self._next_check = 0.0
+        self._build_task: Optional[asyncio.Task] = None
+        self._dirty = False
+
+    @property
+    def path(self) -> str:
+        return settings.snapshot_path
+
+    def current(self) -> Optional[Snapshot]:
+        """The mapped snapshot, remapped if the file has been swapped since"""
+        now = time.monotonic()
+        if now < self._next_check:
+            return self._snapshot
+        self._next_check = now + REFRESH_CHECK_SECONDS
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return self._snapshot  # Keep serving the mapping we have
+        if self._snapshot is None or self._snapshot.file_id != (stat.st_ino, stat.st_mtime_ns):
+            try:
+                snapshot = Snapshot.open(self.path)
+            except (OSError, ValueError) as e:
+                print(f"[SNAPSHOT] Could not map {self.path}: {str(e)}")
+                return self._snapshot
+            if self._snapshot is not None:
+                self._snapshot.close()
+            self._snapshot = snapshot
+        return self._snapshot
+
+    async def build(self) -> Optional[int]:
+        """
+        Encode every published item and swap in a new snapshot; returns the
+        item count, or None if another worker swapped in a later build first
+
+        Documents are encoded and written in batches off the event loop, so
+        memory use is bounded by the batch size rather than the catalog.
+        The snapshot is stamped with the time its reads started.
+        """
+        database = get_database()
+        built_at = datetime.utcnow()
+        writer = await asyncio.to_thread(SnapshotWriter, self.path)
+        try:
+            for kind in FEED_SOURCES:
+                cursor = database[kind].find({"status": PUBLISHED_STATUS}).sort("published_date", -1)
+                batch: List[dict] = []
+                async for document in cursor:
+                    batch.append(document)
+                    if len(batch) >= BUILD_BATCH_SIZE:
+                        await asyncio.to_thread(writer.encode_and_write, kind, batch)
+                        batch = []
+                await asyncio.to_thread(writer.encode_and_write, kind, batch)
+        except BaseException:
+            await asyncio.to_thread(writer.discard)
+            raise
+        replaced = await asyncio.to_thread(writer.commit, built_at)
+        self._next_check = 0.0
+        return writer.count if replaced else None
+
+    def schedule_build(self):
+        """Rebuild soon; changes arriving meanwhile are folded into the same rebuild"""
+        self._dirty = True
+        if self._build_task is None or self._build_task.done():
+            self._build_task = spawn_background(self._rebuild_when_quiet())
+
+    async def _rebuild_when_quiet(self):
+        while self._dirty:
+            await asyncio.sleep(settings.snapshot_rebuild_delay_seconds)
+            self._dirty = False
+            try:
+                count = await self.build()
+                if count is None:
+                    print("[SNAPSHOT] A later build was swapped in meanwhile, discarded this one")
+                else:
+                    print(f"[SNAPSHOT] Rebuilt with {count} published item(s)")
+            except (PyMongoError, OSError) as e:
+                print(f"[SNAPSHOT] Rebuild failed, keeping the previous snapshot: {str(e)}")
+
+    def apply_events(self, events: List[ContentEvent]):
+        """Batch listener: rebuild after changes visible to public readers"""
+        if any(event.collection in FEED_SOURCES and event.is_public for event in events):
+            self.schedule_build()
+
+    def start(self):
+        """Follow content events and build the snapshot if it is missing or old"""
+        if not settings.snapshot_enabled:
+            return
+        content_events.register_batch(self.apply_events)
+        try:
+            age = time.time() - os.stat(self.path).st_mtime
+        except OSError:
+            age = None
+        # A file that cannot be mapped (e.g. an older layout) is rebuilt too
+        if age is None or age > STARTUP_REBUILD_AGE_SECONDS or self.current() is None:
+            self.schedule_build()
+
+    async def stop(self):
+        content_events.unregister(self.apply_events)
+        if self._build_task and not self._build_task.done():
+            self._build_task.cancel()
+            try:
+                await self._build_task
+            except asyncio.CancelledError:
+                pass
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+
+    def serve_fallback(self, request: Request) -> Optional[Response]:
+        """
+        Answer a public read from the snapshot, or None if it cannot be
+
+        Covers GET get-by-id and unfiltered, newest-first list requests for
+        news, reports and cards.
+        """
+        if not settings.snapshot_enabled or request.method != "GET":
+            return None
+        match = FALLBACK_ROUTE.match(request.url.path)
+        snapshot = self.current() if match else None
+        if snapshot is None:
+            return None
+        kind, doc_id = SNAPSHOT_PATHS[match.group(1)], match.group(2)
+
+        if doc_id:
+            body = snapshot.item(kind, doc_id.lower())
+        else:
+            params = request.query_params
+            if set(params) - FALLBACK_LIST_PARAMS or params.get("sort_by", "newest") != "newest":
+                return None
+            try:
+                page = max(1, int(params.get("page", 1)))
+                size = min(100, max(1, int(params.get("size", 12 if kind == "intelligence_cards" else 10))))
+            except ValueError:
+                return None
+            items, total = snapshot.page(kind, (page - 1) * size, size)
+            pages = ceil(total / size) if total > 0 else 1
+            body = (
+                b'{"items":[' + b",".join(items) + b'],"total":' + str(total).encode()
+                + b',"page":' + str(page).encode() + b',"size":' + str(size).encode()
+                + b',"pages":' + str(pages).encode() + b"}"
+            )
+        if body is None:
+            return None
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={
+                # Never cached by the CDN: it would keep serving outage data after recovery
+                "Cache-Control": "no-store",
+                "X-Served-From": "snapshot",
+                "X-Snapshot-Built-At": snapshot.built_at
+            }
+        )
+
+
+# Global snapshot store (started in the app lifespan)
+snapshot_store = SnapshotStore()
@@ -0,0 +1,199 @@
+"""
+Delta sync for clients and mirrors (GET /api/sync?since=<token>)
+
+Every write to news, reports and intelligence cards sets `updated_at`, and
+each collection has an `(updated_at, _id)` index, so the changes after a
+token are read as an index range whose cost grows with the number of
+changes, not the collection size. Deletes leave no document behind, so
+the content event listener below records a tombstone in `sync_tombstones`
+for each one; tombstones expire after `sync_tombstone_retention_days`, and
+tokens older than that are refused (the client must resync from scratch).
+
+Changes are ordered by (updated_at, kind, id) and the token is the
+position of the last change returned, so paging through a burst of
+changes with the same timestamp neither skips nor repeats any. Only
+changes older than `sync_settle_seconds` are returned: a write whose
+timestamp was taken just before another's may commit just after it, and
+the settle window lets it land before the token moves past it.
+
+Public callers see published documents as upserts and any other changed
+document (unpublished, draft edits) as a removal; admins see every
+document as an upsert. Deletions are removals for everyone.
+"""
+import base64
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ASCENDING
+from pymongo.errors import PyMongoError
+from app.config import settings
+from app.database import get_database
+from app.services.events import DELETE, ContentEvent, PUBLISHED_STATUS, content_events
+from app.services.public_feed import FEED_SOURCES
+
+TOMBSTONE_COLLECTION = "sync_tombstones"
+
+EPOCH = datetime(1970, 1, 1)
+
+# Sort order of a sync source, matching the indexes in database.py
+SYNC_SORT = [("updated_at", ASCENDING), ("_id", ASCENDING)]
+TOMBSTONE_SORT = [("updated_at", ASCENDING), ("kind", ASCENDING), ("_id", ASCENDING)]
+
+Position = Tuple[datetime, str, Optional[ObjectId]]  # (updated_at, kind, id); kind "" with no id = all of updated_at
+
+
+class InvalidSyncToken(ValueError):
+    """The token could not be decoded"""
+
+
+def encode_token(position: Position) -> str:
+    updated_at, kind, doc_id = position
+    millis = (updated_at - EPOCH) // timedelta(milliseconds=1)
+    raw = f"{millis}:{kind}:{doc_id or ''}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_token(token: str) -> Position:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        millis, kind, doc_id = raw.split(":")
+        if kind and kind not in FEED_SOURCES:
+            raise ValueError(kind)
+        return (
+            EPOCH + timedelta(milliseconds=int(millis)),
+            kind,
+            ObjectId(doc_id) if doc_id else None
+        )
+    except (ValueError, InvalidId, UnicodeDecodeError) as e:
+        raise InvalidSyncToken(str(e))
+
+
+def _after_in_kind(position: Position, kind: str) -> dict:
+    """Filter for documents of `kind` ordered after `position`"""
+    updated_at, last_kind, last_id = position
+    if last_id is None or kind < last_kind:
+        return {"updated_at": {"$gt": updated_at}}
+    if kind > last_kind:
+        return {"updated_at": {"$gte": updated_at}}
+    return {"$or": [
+        {"updated_at": {"$gt": updated_at}},
+        {"updated_at": updated_at, "_id": {"$gt": last_id}}
+    ]}
+
+
+def _after_tombstone(position: Position) -> dict:
+    updated_at, last_kind, last_id = position
+    if last_id is None:
+        return {"updated_at": {"$gt": updated_at}}
+    return {"$or": [
+        {"updated_at": {"$gt": updated_at}},
+        {"updated_at": updated_at, "kind": {"$gt": last_kind}},
+        {"updated_at": updated_at, "kind": last_kind, "_id": {"$gt": last_id}}
+    ]}
+
+
+def _change(kind: str, document: dict, is_admin: bool) -> dict:
+    shaper, response_type = FEED_SOURCES[kind]
+    change = {"kind": kind, "id": str(document["_id"]), "updated_at": document["updated_at"]}
+    if is_admin or document.get("status") == PUBLISHED_STATUS:
+        shaped = shaper(document)
+        return {**change, "action": "upsert", "item": {name: shaped.get(name) for name in response_type.model_fields}}
+    return {**change, "action": "remove", "reason": "unpublished"}
+
+
+async def changes_since(
+    token: Optional[str],
+    kinds: List[str],
+    limit: int,
+    is_admin: bool = False
+) -> dict:
+    """
+    Changes after `token` (from the beginning when None), oldest first
+
+    Args:
+        token: Token returned by a previous call
+        kinds: Collections to include
+        limit: Maximum changes to return
+
+    Returns:
+        dict: {"changes": [...], "next": token, "has_more": bool}
+
+    Raises:
+        InvalidSyncToken: The token is malformed
+        LookupError: The token is older than tombstone retention
+    """
+    now = datetime.utcnow()
+    if token is None:
+        position: Position = (EPOCH, "", None)
+    else:
+        position = decode_token(token)
+        if position[0] < now - timedelta(days=settings.sync_tombstone_retention_days):
+            raise LookupError("Sync token is older than the tombstone retention period")
+
+    # Changes newer than this may still be joined by slower writes with earlier timestamps
+    until = max(now - timedelta(seconds=settings.sync_settle_seconds), position[0])
+    database = get_database()
+
+    # Up to limit + 1 from each source, merged in (updated_at, kind, id) order
+    candidates = []
+    for kind in kinds:
+        query ={"$and": [_after_in_kind(position, kind), {"updated_at": {"$lte": until}}]}
+        cursor = database[kind].find(query).sort(SYNC_SORT).limit(limit + 1)
+        async for document in cursor:
+            candidates.append(((document["updated_at"], kind, document["_id"]), _change(kind, document, is_admin)))
+
+    query = {"$and": [_after_tombstone(position), {"updated_at": {"$lte": until}, "kind": {"$in": kinds}}]}
+    cursor = database[TOMBSTONE_COLLECTION].find(query).sort(TOMBSTONE_SORT).limit(limit + 1)
+    async for tombstone in cursor:
+        candidates.append((
+            (tombstone["updated_at"], tombstone["kind"], tombstone["_id"]),
+            {
+                "kind": tombstone["kind"],
+                "id": str(tombstone["_id"]),
+                "updated_at": tombstone["updated_at"],
+                "action": "remove",
+                "reason": "deleted"
+            }
+        ))
+
+    candidates.sort(key=lambda candidate: candidate[0])
+    page = candidates[:limit]
+    has_more = len(candidates) > limit
+    if has_more:
+        next_position = page[-1][0]
+    else:
+        # Caught up: move the token to the settle watermark so it does not age out
+        next_position = (until, "", None)
+    return {
+        "changes": [change for _, change in page],
+        "next": encode_token(next_position),
+        "has_more": has_more
+    }
+
+
+async def record_tombstones(events: List[ContentEvent]):
+    """Batch listener: record deletions for sync clients"""
+    tombstones = []
+    for event in events:
+        if event.action != DELETE or event.collection not in FEED_SOURCES:
+            continue
+        try:
+            doc_id = ObjectId(event.id)
+        except InvalidId:
+            continue
+        tombstones.append({
+            "_id": doc_id,
+            "kind": event.collection,
+            "updated_at": event.timestamp,
+            "expires_at": event.timestamp + timedelta(days=settings.sync_tombstone_retention_days)
+        })
+    if not tombstones:
+        return
+    try:
+        await get_database()[TOMBSTONE_COLLECTION].insert_many(tombstones, ordered=False)
+    except PyMongoError as e:
+        print(f"[SYNC] Failed to record {len(tombstones)} tombstone(s): {str(e)}")
+
+
+content_events.register_batch(record_tombstones)
@@ -0,0 +1,177 @@
+"""
+Post-boot warmup, deep health checks and keep-alive
+
+After startup the app serves immediately; warm_up() then runs in the
+background to open pooled MongoDB connections, fill the landing, featured
+and stats caches and build the lazily created serializers and password
+context, so the first real visitors do not pay for them.
+
+KeepAlive replaces the old blocking keep_alive.py loop: it pings the
+service's public URL (platforms such as Render only count inbound traffic)
+with jitter, and backs off after failures instead of hammering a sleeping
+or broken instance.
+"""
+import asyncio
+import random
+import time
+from typing import List, Optional
+import httpx
+from app.config import settings
+from app.database import get_database
+
+
+async def mongo_ping() -> float:
+    """Round-trip a ping to MongoDB; returns latency in milliseconds"""
+    started = time.perf_counter()
+    await get_database().command("ping")
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+async def deep_health(timeout: float) -> dict:
+    """MongoDB reachability and latency for /health?deep=1"""
+    try:
+        latency = await asyncio.wait_for(mongo_ping(), timeout=timeout)
+    except Exception as e:
+        return {"ok": False, "error": str(e) or type(e).__name__}
+    return {"ok": True, "latency_ms": latency}
+
+
+async def _prime_pool():
+    """Open connections up to the configured minimum with concurrent pings"""
+    connections = max(1, settings.mongo_min_pool_size)
+    await asyncio.gather(*(mongo_ping() for _ in range(connections)))
+
+
+async def _prime_caches():
+    """Fill the response cache for the landing bundle and the public landing-page endpoints"""
+    # Imported here: routes import services, not the other way around
+    from app.routes.intelligence_cards import get_featured_card, get_landing_cards, get_platform_stats
+    from app.routes.landing import get_landing
+
+    await get_landing(cards_limit=8, news_limit=6)
+    await get_platform_stats()
+    await get_landing_cards(limit=8, expand=None)
+    await get_featured_card(expand=None)
+
+
+def _prime_lazy_paths():
+    """Build response serializers and the password context ahead of first use"""
+    from app.schemas.intelligence_card import IntelligenceCardListResponse, IntelligenceCardResponse
+    from app.schemas.news import NewsListResponse, NewsResponse
+    from app.schemas.report import ReportListResponse, ReportResponse
+    from app.utils.password import get_pwd_context
+    from app.utils.serialization import prepare_serializers
+
+    prepare_serializers(
+        NewsListResponse, NewsResponse, ReportListResponse, ReportResponse,
+        IntelligenceCardListResponse, IntelligenceCardResponse, List[IntelligenceCardResponse]
+    )
+    get_pwd_context()
+
+
+async def warm_up() -> dict:
+    """
+    Run every warmup step, logging instead of raising
+
+    Returns:
+        dict: Milliseconds per step, or the error for failed steps
+    """
+    results = {}
+    for name, step in (
+        ("mongo_pool", _prime_pool),
+        ("caches", _prime_caches),
+        ("lazy_paths", _prime_lazy_paths),
+    ):
+        started = time.perf_counter()
+        try:
+            result = step()
+            if asyncio.iscoroutine(result):
+                await result
+            results[name] = round((time.perf_counter() - started) * 1000, 1)
+        except Exception as e:
+            results[name] = f"failed: {str(e)}"
+    steps = ", ".join(f"{name} {value} ms" if isinstance(value, float) else f"{name} {value}"
+                      for name, value in results.items())
+    print(f"🔥 Warmup finished ({steps})")
+    return results
+
+
+class KeepAlive:
+    """
+    Periodic self-ping of a public URL with jitter and failure backoff
+
+    Successful pings are spaced `interval` ± `jitter` seconds apart. After a
+    failure the next attempt comes sooner (`retry_base` seconds) and doubles
+    with each further failure, capped at `interval`.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        interval: float = 840,
+        jitter: float = 60,
+        retry_base: float = 30,
+        timeout: float = 30,
+        path: str = "/health?deep=1"
+    ):
+        self.url = base_url.rstrip("/") + path
+        self.interval = interval
+        self.jitter = jitter
+        self.retry_base = retry_base
+        self.timeout = timeout
+        self.failures = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def next_delay(self) -> float:
+        if self.failures:
+            return min(self.interval, self.retry_base * 2 ** (self.failures - 1))
+        return max(1.0, self.interval + random.uniform(-self.jitter, self.jitter))
+
+    async def ping(self, client: httpx.AsyncClient) -> bool:
+        started = time.perf_counter()
+        try:
+            response = await client.get(self.url)
+            ok = response.status_code == 200
+        except httpx.HTTPError as e:
+            ok = False
+            print(f"[KEEP-ALIVE] Ping failed: {type(e).__name__} {str(e)}")
+        else:
+            elapsed = (time.perf_counter() - started) * 1000
+            if not ok:
+                print(f"[KEEP-ALIVE] {self.url} returned {response.status_code} in {elapsed:.0f} ms")
+        self.failures = 0 if ok else self.failures + 1
+        return ok
+
+    async def run(self, initial_delay: Optional[float] = None):
+        """Ping forever (until cancelled)"""
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            await asyncio.sleep(self.next_delay() if initial_delay is None else initial_delay)
+            while True:
+                await self.ping(client)
+                await asyncio.sleep(self.next_delay())
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+            print(f"💓 Keep-alive pinging {self.url} every ~{self.interval:.0f}s")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def build_keep_alive() -> Optional[KeepAlive]:
+    """KeepAlive from settings, or None when keep_alive_url is not set"""
+    if not settings.keep_alive_url:
+        return None
+    return KeepAlive(
+        settings.keep_alive_url,
+        interval=settings.keep_alive_interval_seconds,
+        jitter=settings.keep_alive_jitter_seconds
+    )
+
@@ -0,0 +1,28 @@
+"""
+Background tasks started while handling a request
+"""
+import asyncio
+import contextlib
+import contextvars
+from typing import Coroutine
+import pymongo
+from app.config import settings
+
+
+def spawn_background(coro: Coroutine) -> asyncio.Task:
+    """
+    Run `coro` as a task detached from the caller's context
+
+    asyncio copies the current context into new tasks, so a task started
+    during a request would inherit the request's pymongo.timeout() deadline
+    (see query_time_limit in dependencies.py) and fail with timeouts once the
+    request is over. The task starts from an empty context instead.
+    """
+    return contextvars.Context().run(asyncio.create_task, coro)
+
+
+def query_budget():
+    """A fresh `query_max_time_ms` deadline for work running outside a request's own"""
+    if settings.query_max_time_ms <= 0:
+        return contextlib.nullcontext()
+    return pymongo.timeout(settings.query_max_time_ms / 1000)
@@ -0,0 +1,218 @@
+"""
+Shared MongoDB filter builders for list and export endpoints
+
+User text is matched literally (escaped) unless the caller asks for
+`match="regex"`, and is capped at `query_max_pattern_length` characters.
+"""
+import re
+from datetime import datetime, timedelta
+from typing import Optional, List, Tuple
+from bson import ObjectId
+from fastapi import HTTPException
+from app.config import settings
+from app.models.news import NewsStatus
+from app.models.report import ReportStatus
+from app.models.intelligence_card import CardStatus
+
+# Accepted values for the `match` query parameter
+MATCH_MODES = "^(literal|regex)$"
+
+
+def text_pattern(value: str, match: str = "literal") -> str:
+    """
+    Turn user-supplied search/filter text into a safe $regex pattern
+
+    Raises:
+        HTTPException: If the text is too long or is not a valid regex
+    """
+    if len(value) > settings.query_max_pattern_length:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Search text is limited to {settings.query_max_pattern_length} characters"
+        )
+    if match != "regex":
+        return re.escape(value)
+    try:
+        re.compile(value)
+    except re.error as e:
+        raise HTTPException(status_code=400, detail=f"Invalid regular expression: {str(e)}")
+    return value
+
+
+def _contains(value: str, match: str = "literal") -> dict:
+    """Case-insensitive substring (or regex) condition"""
+    return {"$regex": text_pattern(value, match), "$options": "i"}
+
+
+def parse_id_list(ids: str) -> List[str]:
+    """
+    Split a comma-separated `ids` parameter, dropping blanks and duplicates
+
+    Raises:
+        HTTPException: If more than `max_ids_per_request` IDs are given
+    """
+    parsed = list(dict.fromkeys(part.strip() for part in ids.split(",") if part.strip()))
+    if len(parsed) > settings.max_ids_per_request:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.max_ids_per_request} IDs can be requested at once"
+        )
+    return parsed
+
+
+def build_ids_query(ids: List[str], published_status: Optional[str] = None) -> dict:
+    """
+    `$in` filter for a list of ID strings (invalid ObjectIds are skipped)
+
+    Pass `published_status` to restrict the result to published documents.
+    """
+    query = {"_id": {"$in": [ObjectId(value) for value in ids if ObjectId.is_valid(value)]}}
+    if published_status:
+        query["status"] = published_status
+    return query
+
+
+def order_by_ids(ids: List[str], documents: List[dict]) -> Tuple[List[dict], List[str]]:
+    """Documents in requested order, plus the requested IDs that were not found"""
+    by_id = {str(document["_id"]): document for document in documents}
+    found = [by_id[value] for value in ids if value in by_id]
+    missing = [value for value in ids if value not in by_id]
+    return found, missing
+
+
+def build_news_query(
+    is_admin: bool,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    tier: Optional[str] = None,
+    search: Optional[str] = None,
+    match: str = "literal"
+) -> dict:
+    """Build the news list filter; non-admins only see published news"""
+    query = {}
+
+    if not is_admin:
+        query["status"] = NewsStatus.PUBLISHED.value
+    elif status:
+        query["status"] = status
+
+    if category:
+        query["category"] = category
+
+    if tier:
+        query["tier"] = tier
+
+    if search:
+        condition = _contains(search, match)
+        query["$or"] = [
+            {"title": condition},
+            {"description": condition},
+            {"summary": condition}
+        ]
+
+    return query
+
+
+def build_reports_query(
+    is_admin: bool,
+    status: Optional[str] = None,
+    tag: Optional[str] = None,
+    search: Optional[str] = None,
+    match: str = "literal"
+) -> dict:
+    """Build the reports list filter; non-admins only see published reports"""
+    query = {}
+
+    if not is_admin:
+        query["status"] = ReportStatus.PUBLISHED.value
+    elif status:
+        query["status"] = status
+
+    if tag:
+        query["tags"] = tag
+
+    if search:
+        condition = _contains(search, match)
+        query["$or"] = [
+            {"title": condition},
+            {"summary": condition},
+            {"content": condition}
+        ]
+
+    return query
+
+
+def build_cards_query(
+    is_admin: bool,
+    status: Optional[str] = None,
+    company: Optional[str] = None,
+    tier: Optional[str] = None,
+    category: Optional[str] = None,
+    industry: Optional[str] = None,
+    date_filter: Optional[str] = None,
+    search: Optional[str] = None,
+    match: str = "literal"
+) -> dict:
+    """Build the intelligence cards list filter; non-admins only see published cards"""
+    query = {}
+
+    if not is_admin:
+        query["status"] = CardStatus.PUBLISHED.value
+    elif status:
+        query["status"] = status
+
+    if company:
+        query["company"] = _contains(company, match)
+
+    if tier:
+        query["tier"] = tier
+
+    if category:
+        query["category"] = _contains(category, match)
+
+    if industry:
+        query["industry"] = _contains(industry, match)
+
+    # Date filter
+    if date_filter:
+        now = datetime.utcnow()
+        if date_filter == "7d":
+            query["published_date"] = {"$gte": now - timedelta(days=7)}
+        elif date_filter == "30d":
+            query["published_date"] = {"$gte": now - timedelta(days=30)}
+        elif date_filter == "90d":
+            query["published_date"] = {"$gte": now - timedelta(days=90)}
+        elif date_filter == "2026":
+            query["published_date"] = {
+                "$gte": datetime(2026, 1, 1),
+                "$lt": datetime(2027, 1, 1)
+            }
+        elif date_filter == "2025":
+            query["published_date"] = {
+                "$gte": datetime(2025, 1, 1),
+                "$lt": datetime(2026, 1, 1)
+            }
+
+    if search:
+        condition = _contains(search, match)
+        query["$or"] = [
+            {"title": condition},
+            {"company": condition},
+            {"excerpt": condition},
+            {"category": condition}
+        ]
+
+    return query
+
+
+def build_cards_sort(sort_by: Optional[str] = None) -> List[Tuple[str, int]]:
+    """Map the cards `sort_by` option to a MongoDB sort specification"""
+    if sort_by == "oldest":
+        return [("published_date", 1)]
+    if sort_by == "rpi-high":
+        return [("rpi_score", -1), ("published_date", -1)]
+    if sort_by == "rpi-low":
+        return [("rpi_score", 1), ("published_date", -1)]
+    if sort_by == "jobs":
+        return [("jobs_affected", -1), ("published_date", -1)]
+    return [("published_date", -1)]  # Default: newest first
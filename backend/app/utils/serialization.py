@@ -0,0 +1,142 @@
+"""
+Single-pass JSON responses for read endpoints
+
+Returning a pydantic model from a route makes FastAPI dump it to a dict,
+validate that dict again against `response_model` and then encode it with
+the standard json module. For read endpoints built from trusted MongoDB data
+that is three passes over every document.
+
+`json_response` validates the raw `from_db` dicts once against the response
+type and encodes them directly to bytes in pydantic-core. The route keeps its
+`response_model` for the OpenAPI schema; FastAPI skips its own serialization
+when a Response is returned.
+
+With `raw_json_reads` enabled, reads skip validation altogether: routes fetch
+only the response fields (`read_projection`) and the documents are reshaped
+into the schema's field order and encoded by pydantic-core's serializer, so
+the output stays byte-identical for well-formed documents.
+"""
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union, get_args, get_origin
+import pydantic_core
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from app.config import settings
+
+# Shaping plans: how to rebuild validated output from trusted data
+#   None                      -> value passed through as-is
+#   ("list", plan)            -> each item shaped with plan
+#   ("model", [(name, default, plan), ...]) -> keys in schema order with defaults
+Plan = Optional[Tuple[str, Any]]
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type: Any) -> TypeAdapter:
+    """TypeAdapters are costly to build, so keep one per response type"""
+    return TypeAdapter(response_type)
+
+
+def _field_default(field) -> Any:
+    if field.default_factory is not None:
+        return field.default_factory()
+    if field.default is pydantic_core.PydanticUndefined:
+        return None
+    return field.default
+
+
+@lru_cache(maxsize=None)
+def _plan(annotation: Any) -> Plan:
+    """Build the shaping plan for a response type (cached per type)"""
+    origin = get_origin(annotation)
+    if origin is Union:
+        # Optional[X]: None passes through, anything else is shaped as X
+        plans = [_plan(arg) for arg in get_args(annotation) if arg is not type(None)]
+        return plans[0] if len(plans) == 1 else None
+    if origin in (list, List):
+        item_plan = _plan(get_args(annotation)[0])
+        return ("list", item_plan) if item_plan else None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return ("model", [
+            (name, field, _plan(field.annotation))
+            for name, field in annotation.model_fields.items()
+        ])
+    return None
+
+
+def _shape(plan: Plan, value: Any) -> Any:
+    if plan is None or value is None:
+        return value
+    kind, spec = plan
+    if kind == "list":
+        return [_shape(spec, item) for item in value]
+    if isinstance(value, BaseModel):
+        value = value.__dict__
+    shaped = {}
+    for name, field, sub_plan in spec:
+        item = value.get(name) if name in value else _field_default(field)
+        shaped[name] = _shape(sub_plan, item)
+    return shaped
+
+
+def encode_json(response_type: Any, data: Any) -> bytes:
+    """
+    Encode `data` as JSON bytes matching `response_type`
+
+    Args:
+        response_type: Response schema, e.g. NewsListResponse or List[NewsResponse]
+        data: Plain dicts/lists (e.g. from Model.from_db) or model instances
+
+    Returns:
+        bytes: Compact UTF-8 JSON, identical to FastAPI's default output
+    """
+    if settings.raw_json_reads:
+        return encode_trusted_json(response_type, data)
+    adapter = _adapter(response_type)
+    return adapter.dump_json(adapter.validate_python(data))
+
+
+def encode_trusted_json(response_type: Any, data: Any) -> bytes:
+    """
+    Encode trusted data without validation
+
+    Keys are put in schema order, missing fields get their schema defaults and
+    nested models are trimmed to their declared fields, so the bytes match
+    `encode_json` for documents that would have passed validation. Values are
+    not coerced: only use this for data written through the API.
+    """
+    return pydantic_core.to_json(_shape(_plan(response_type), data))
+
+
+def read_projection(response_type: Any) -> Optional[Dict[str, int]]:
+    """
+    MongoDB projection for a read served through `json_response`
+
+    Returns None (fetch whole documents) unless raw_json_reads is enabled, in
+    which case only the response fields are fetched and decoded. Response
+    field names match document keys, with `id` coming from `_id`.
+    """
+    if not settings.raw_json_reads:
+        return None
+    return _projection(response_type)
+
+
+@lru_cache(maxsize=None)
+def _projection(response_type: Any) -> Dict[str, int]:
+    return {name: 1 for name in response_type.model_fields if name != "id"}
+
+
+def prepare_serializers(*response_types: Any):
+    """Build and cache the TypeAdapters and shaping plans for response types"""
+    for response_type in response_types:
+        _adapter(response_type)
+        _plan(response_type)
+
+
+def json_response(response_type: Any, data: Any, status_code: int = 200) -> Response:
+    """Build a JSON Response validated and encoded in a single pass"""
+    return json_bytes_response(encode_json(response_type, data), status_code)
+
+
+def json_bytes_response(body: bytes, status_code: int = 200) -> Response:
+    """Wrap already-encoded JSON (e.g. a cached body) in a Response"""
+    return Response(content=body, status_code=status_code, media_type="application/json")
@@ -0,0 +1,24 @@
+"""
+Slug utilities for stable, human-readable document keys
+"""
+import re
+import unicodedata
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def slugify(*parts: str, max_length: int = 120) -> str:
+    """
+    Build a URL-safe slug from one or more text parts
+
+    Args:
+        parts: Text fragments joined with a dash (e.g. company and title)
+        max_length: Maximum slug length
+
+    Returns:
+        Lowercase ASCII slug, or an empty string if nothing usable remains
+    """
+    text = " ".join(p for p in parts if p)
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    slug = _NON_ALNUM.sub("-", text.lower()).strip("-")
+    return slug[:max_length].rstrip("-")
@@ -0,0 +1,57 @@
+"""
+Startup profiling and readiness state
+
+main.py records how long each boot step takes; the summary is logged once
+startup completes and reported by /ready. Background index reconciliation
+reports its progress here too, so /ready can show it without blocking on it.
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+# Captured when this module is first imported, i.e. early in app.main's imports
+_PROCESS_MARK = time.perf_counter()
+
+
+class StartupState:
+    """Boot timings and readiness flags for this worker"""
+
+    def __init__(self):
+        self.import_started = _PROCESS_MARK
+        self.steps: Dict[str, float] = {}  # step name -> milliseconds
+        self.ready = False
+        self.startup_ms: Optional[float] = None
+        self.indexes = "pending"  # pending | running | ready | failed | skipped
+        self.indexes_created = 0
+
+    @contextmanager
+    def step(self, name: str):
+        """Time one startup step"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps[name] = round((time.perf_counter() - started) * 1000, 1)
+
+    def mark_imported(self):
+        """Record the time spent importing the application modules"""
+        self.steps["imports"] = round((time.perf_counter() - self.import_started) * 1000, 1)
+
+    def mark_ready(self):
+        self.ready = True
+        self.startup_ms = round((time.perf_counter() - self.import_started) * 1000, 1)
+        steps = ", ".join(f"{name} {ms:.0f} ms" for name, ms in self.steps.items())
+        print(f"⏱️ Startup finished in {self.startup_ms:.0f} ms ({steps})")
+
+    def as_dict(self) -> dict:
+        return {
+            "ready": self.ready,
+            "startup_ms": self.startup_ms,
+            "steps_ms": self.steps,
+            "indexes": self.indexes,
+            "indexes_created": self.indexes_created
+        }
+
+
+# Global startup state for this process
+startup_state = StartupState()
@@ -0,0 +1,3 @@
+"""
+Benchmark suite for the public API (see benchmarks/README.md)
+"""
@@ -0,0 +1,89 @@
+"""
+Benchmark: cold-start time of the API server
+
+Starts `uvicorn app.main:app` in a fresh process several times and measures
+how long it takes until /health (process serving) and /ready (startup
+finished, MongoDB reachable) first return 200. Each index mode is measured
+separately; "blocking" reproduces the previous boot sequence, which built
+every index before serving.
+
+Usage (from backend/, with MongoDB running):
+    python -m benchmarks.cold_start --runs 5 --modes blocking background
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(client: httpx.Client, url: str, deadline: float) -> float:
+    """Poll `url` until it returns 200; returns the time it happened"""
+    while time.perf_counter() < deadline:
+        try:
+            if client.get(url).status_code == 200:
+                return time.perf_counter()
+        except httpx.TransportError:
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(f"{url} did not become ready")
+
+
+def measure_once(mode: str, timeout: float) -> dict:
+    port = _free_port()
+    env = {**os.environ, "INDEX_BUILD_MODE": mode, "DEBUG": "False", "SCHEDULER_ENABLED": "False"}
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=2) as client:
+            deadline = started + timeout
+            health = _wait_for(client, "/health", deadline)
+            ready = _wait_for(client, "/ready", deadline)
+            payload = client.get("/ready").json()
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return {
+        "health_ms": (health - started) * 1000,
+        "ready_ms": (ready - started) * 1000,
+        "steps": payload.get("steps_ms", {})
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API cold-start time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", default=["blocking", "background"],
+                        choices=["blocking", "background", "off"])
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        runs = [measure_once(mode, args.timeout) for _ in range(args.runs)]
+        health = statistics.median(run["health_ms"] for run in runs)
+        ready = statistics.median(run["ready_ms"] for run in runs)
+        steps = {
+            name: statistics.median(run["steps"].get(name, 0) for run in runs)
+            for name in runs[-1]["steps"]
+        }
+        step_text = ", ".join(f"{name} {ms:.0f}" for name, ms in steps.items())
+        print(f"{mode:<11} /health {health:7.0f} ms   /ready {ready:7.0f} ms   (median of {args.runs}; {step_text} ms)")
+
+
+if __name__ == "__main__":
+    main()
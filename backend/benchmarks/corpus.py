@@ -0,0 +1,266 @@
+"""
+Synthetic corpus generator for benchmarks
+
+Documents are built with the same create_document helpers the API uses, so
+their shape matches production data. Rich reports are derived from
+sample_report_v2_complete.json with varied text, which keeps payload sizes
+realistic (~10 KB per report). Generation is deterministic for a given seed.
+"""
+import copy
+import json
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+from bson import ObjectId
+
+from app.models.intelligence_card import IntelligenceCardModel
+from app.models.news import NewsModel
+from app.models.report import ReportModel
+from app.utils.slug import slugify
+
+SAMPLE_REPORT_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "sample_report_v2_complete.json"
+)
+
+COMPANIES = [
+    "Amazon", "Microsoft", "Salesforce", "Google", "Meta", "IBM", "Infosys", "TCS",
+    "Wipro", "Accenture", "Goldman Sachs", "JPMorgan", "Klarna", "Duolingo", "Apple",
+    "Intel", "Cisco", "Oracle", "SAP", "Dell"
+]
+CATEGORIES = ["Layoffs", "Automation", "Hiring", "Policy", "Research", "Funding", "General"]
+INDUSTRIES = ["Technology", "Finance", "Retail", "Healthcare", "Manufacturing", "Media"]
+TAGS = ["ai", "automation", "layoffs", "genai", "workforce", "india", "us", "banking",
+        "customer-support", "engineering", "hiring-freeze", "reskilling", "policy"]
+ROLES = ["Customer Support", "Data Entry", "Junior Developer", "Analyst", "Recruiter",
+         "Copywriter", "QA Tester", "Paralegal", "Translator", "Bookkeeper"]
+WORDS = ("ai workforce automation jobs roles hiring layoffs productivity shift analysts "
+         "engineers support agents banks model deployment risk exposure enterprise "
+         "restructuring growth quarter decline demand pipeline replacement tasks").split()
+TIERS = ["tier_1", "tier_2", "tier_3"]
+
+# Share of documents generated as published; the rest are drafts
+PUBLISHED_RATIO = 0.8
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _paragraph(rng: random.Random, sentences: int) -> str:
+    return " ".join(_sentence(rng, rng.randint(8, 18)) for _ in range(sentences))
+
+
+def _status(rng: random.Random) -> str:
+    return "published" if rng.random() < PUBLISHED_RATIO else "draft"
+
+
+def _published_date(rng: random.Random, start: datetime, days: int) -> datetime:
+    return start - timedelta(seconds=rng.randint(0, days * 86400))
+
+
+def load_sample_report() -> dict:
+    with open(SAMPLE_REPORT_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _vary(value, rng: random.Random):
+    """Replace long strings with random text of similar length, recursively"""
+    if isinstance(value, str) and len(value) > 40:
+        return _paragraph(rng, max(1, len(value) // 90))
+    if isinstance(value, list):
+        return [_vary(item, rng) for item in value]
+    if isinstance(value, dict):
+        return {key: _vary(item, rng) for key, item in value.items()}
+    return value
+
+
+class CorpusGenerator:
+    """Deterministic generator of news, report and card documents"""
+
+    def __init__(self, seed: int = 42, days: int = 730):
+        self.rng = random.Random(seed)
+        self.now = datetime.utcnow()
+        self.days = days
+        self._sample = load_sample_report()
+
+    def news(self, count: int) -> Iterator[dict]:
+        rng = self.rng
+        for i in range(count):
+            company = rng.choice(COMPANIES)
+            doc = NewsModel.create_document(
+                title=f"{company} {_sentence(rng, rng.randint(5, 10))}",
+                description=_paragraph(rng, rng.randint(3, 8)),
+                summary=_paragraph(rng, 2),
+                source=rng.choice(["Reuters", "Bloomberg", "Mint", "TechCrunch", "FT"]),
+                source_url=f"https://example.com/news/{i}",
+                category=rng.choice(CATEGORIES),
+                tier=rng.choice(TIERS),
+                status=_status(rng),
+                tags=rng.sample(TAGS, rng.randint(1, 4)),
+                affected_roles=rng.sample(ROLES, rng.randint(0, 3)),
+                companies=[company],
+                key_stat_value=f"{rng.randint(100, 50000):,}",
+                key_stat_label="Jobs affected",
+                published_date=_published_date(rng, self.now, self.days),
+                created_by="benchmark"
+            )
+            yield doc
+
+    def reports(self, count: int, rich_ratio: float = 0.5) -> Iterator[dict]:
+        rng = self.rng
+        sample = self._sample
+        for i in range(count):
+            title = f"{rng.choice(COMPANIES)} {_sentence(rng, rng.randint(4, 9))} #{i}"
+            if rng.random() < rich_ratio:
+                rich = _vary(copy.deepcopy(sample), rng)
+                doc = ReportModel.create_document(
+                    title=title,
+                    summary=rich.get("summary") or _paragraph(rng, 2),
+                    subtitle=rich.get("subtitle"),
+                    label=rich.get("label"),
+                    tier=rng.choice(TIERS),
+                    author=sample.get("author"),
+                    reading_time=rng.randint(4, 20),
+                    tags=rng.sample(TAGS, rng.randint(2, 5)),
+                    status=_status(rng),
+                    hero_stats=rich.get("hero_stats"),
+                    hero_context=rich.get("hero_context"),
+                    exec_summary=rich.get("exec_summary"),
+                    metrics=rich.get("metrics"),
+                    data_table=rich.get("data_table"),
+                    rpi_analysis=rich.get("rpi_analysis"),
+                    risk_buckets=rich.get("risk_buckets"),
+                    timeline=rich.get("timeline"),
+                    guidance=rich.get("guidance"),
+                    sources=rich.get("sources"),
+                    context_label=rich.get("context_label"),
+                    context_title=rich.get("context_title"),
+                    context_intro=rich.get("context_intro"),
+                    metrics_label=rich.get("metrics_label"),
+                    metrics_title=rich.get("metrics_title"),
+                    metrics_intro=rich.get("metrics_intro"),
+                    context_box=rich.get("context_box"),
+                    insight_block=rich.get("insight_block"),
+                    is_rich_report=True,
+                    published_date=_published_date(rng, self.now, self.days),
+                    created_by="benchmark"
+                )
+            else:
+                doc = ReportModel.create_document(
+                    title=title,
+                    summary=_paragraph(rng, 2),
+                    content="\n\n".join(_paragraph(rng, 6) for _ in range(rng.randint(4, 12))),
+                    tags=rng.sample(TAGS, rng.randint(1, 4)),
+                    status=_status(rng),
+                    reading_time=rng.randint(3, 12),
+                    author="Replaceable.ai Research",
+                    published_date=_published_date(rng, self.now, self.days),
+                    created_by="benchmark"
+                )
+            doc["_id"] = ObjectId()
+            doc["slug"] = f"{slugify(title, max_length=100)}-{i}"
+            yield doc
+
+    def cards(self, count: int, report_ids: List[str] = None) -> Iterator[dict]:
+        rng = self.rng
+        for i in range(count):
+            company = rng.choice(COMPANIES)
+            tier = rng.choice(TIERS)
+            report_id = rng.choice(report_ids) if report_ids and rng.random() < 0.5 else None
+            doc = IntelligenceCardModel.create_document(
+                title=f"{company} {_sentence(rng, rng.randint(4, 8))}",
+                title_highlight=f"{rng.randint(1, 50) * 1000:,} Jobs",
+                company=company,
+                company_icon=company[0],
+                company_gradient=company.lower().replace(" ", "-"),
+                category=rng.choice(CATEGORIES),
+                excerpt=_paragraph(rng, 2),
+                tier=tier,
+                tier_label=f"{tier.replace('_', ' ').title()}",
+                status=_status(rng),
+                stat1_value=f"{rng.randint(100, 30000):,}",
+                stat1_label="Roles Affected",
+                stat2_value=f"{rng.uniform(3, 9.5):.1f}",
+                stat2_label="Peak RPI",
+                stat2_type=rng.choice(["critical", "elevated", "moderate"]),
+                stat3_value=f"${rng.randint(1, 80)}B",
+                stat3_label="AI Investment",
+                rpi_score=f"{rng.uniform(3, 9.5):.1f}",
+                jobs_affected=f"{rng.randint(100, 30000):,}",
+                ai_investment=f"${rng.randint(1, 80)}B",
+                report_id=report_id,
+                analysis_url=f"/report/{report_id}" if report_id else None,
+                is_featured=False,
+                display_order=i,
+                published_date=_published_date(rng, self.now, self.days),
+                created_by="benchmark",
+                industry=rng.choice(INDUSTRIES),
+                tags=rng.sample(TAGS, rng.randint(1, 4))
+            )
+            yield doc
+
+
+def _batched(docs: Iterator[dict], size: int) -> Iterator[List[dict]]:
+    batch = []
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def seed_corpus(
+    database,
+    news: int,
+    reports: int,
+    cards: int,
+    seed: int = 42,
+    batch_size: int = 1000,
+    drop: bool = True
+) -> Dict[str, int]:
+    """
+    Insert a synthetic corpus into `database`
+
+    Existing benchmark collections are dropped first unless `drop` is False.
+    One random published card is marked featured.
+    """
+    generator = CorpusGenerator(seed=seed)
+    counts = {}
+
+    if drop:
+        for name in ("news", "reports", "intelligence_cards"):
+            await database[name].drop()
+
+    report_ids: List[str] = []
+    for name, docs in (
+        ("news", generator.news(news)),
+        ("reports", generator.reports(reports)),
+    ):
+        inserted = 0
+        for batch in _batched(docs, batch_size):
+            if name == "reports":
+                report_ids.extend(str(doc["_id"]) for doc in batch[:10])
+            await database[name].insert_many(batch, ordered=False)
+            inserted += len(batch)
+            print(f"  {name}: {inserted:,}/{news if name == 'news' else reports:,}", end="\r")
+        counts[name] = inserted
+        print()
+
+    inserted = 0
+    for batch in _batched(generator.cards(cards, report_ids), batch_size):
+        await database.intelligence_cards.insert_many(batch, ordered=False)
+        inserted += len(batch)
+        print(f"  intelligence_cards: {inserted:,}/{cards:,}", end="\r")
+    counts["intelligence_cards"] = inserted
+    print()
+
+    await database.intelligence_cards.update_one(
+        {"status": "published"},
+        {"$set": {"is_featured": True}}
+    )
+    return counts
@@ -0,0 +1,205 @@
+"""
+Load driver, latency statistics and baseline comparison
+
+The same scenarios run either in-process (httpx ASGITransport against the
+FastAPI app, no network or server overhead) or over HTTP against a running
+server. Every scenario is driven by a fixed number of concurrent workers
+issuing a fixed number of requests.
+"""
+import asyncio
+import json
+import platform
+import random
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+SEARCH_TERMS = ["automation", "layoffs", "ai", "workforce", "hiring"]
+
+
+@dataclass
+class Scenario:
+    """A named endpoint and a function producing the next request path"""
+    name: str
+    path: Callable[[random.Random, Dict[str, List[str]]], str]
+
+
+# Public read endpoints; {ids} are sampled from list responses before the run
+SCENARIOS = [
+    Scenario("news_list", lambda r, ids: f"/api/news?page={r.randint(1, 50)}&size=20"),
+    Scenario("news_search", lambda r, ids: f"/api/news?search={r.choice(SEARCH_TERMS)}&size=20"),
+    Scenario("news_detail", lambda r, ids: f"/api/news/{r.choice(ids['news'])}"),
+    Scenario("reports_list", lambda r, ids: f"/api/reports?page={r.randint(1, 50)}&size=20"),
+    Scenario("reports_list_100", lambda r, ids: f"/api/reports?page={r.randint(1, 5)}&size=100"),
+    Scenario("report_detail", lambda r, ids: f"/api/reports/{r.choice(ids['reports'])}"),
+    Scenario("cards_list", lambda r, ids: f"/api/intelligence-cards?page={r.randint(1, 50)}&size=12"),
+    Scenario("cards_landing", lambda r, ids: "/api/intelligence-cards/landing"),
+    Scenario("cards_featured", lambda r, ids: "/api/intelligence-cards/featured"),
+    Scenario("cards_stats", lambda r, ids: "/api/intelligence-cards/stats"),
+    Scenario("card_detail", lambda r, ids: f"/api/intelligence-cards/{r.choice(ids['intelligence_cards'])}"),
+]
+
+SCENARIOS_BY_NAME = {scenario.name: scenario for scenario in SCENARIOS}
+
+
+@dataclass
+class ScenarioResult:
+    requests: int
+    errors: int
+    seconds: float
+    rps: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    mean_bytes: float
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def sample_ids(client: httpx.AsyncClient, size: int = 100) -> Dict[str, List[str]]:
+    """Collect published IDs from the list endpoints for detail scenarios"""
+    ids = {}
+    for key, path in (
+        ("news", "/api/news"),
+        ("reports", "/api/reports"),
+        ("intelligence_cards", "/api/intelligence-cards"),
+    ):
+        response = await client.get(path, params={"size": size})
+        response.raise_for_status()
+        ids[key] = [item["id"] for item in response.json()["items"]]
+        if not ids[key]:
+            raise RuntimeError(f"No published {key} found; seed the benchmark database first")
+    return ids
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    ids: Dict[str, List[str]],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    seed: int
+) -> ScenarioResult:
+    rng = random.Random(seed)
+    paths = [scenario.path(rng, ids) for _ in range(warmup + requests)]
+    for path in paths[:warmup]:
+        await client.get(path)
+
+    queue = iter(paths[warmup:])
+    latencies: List[float] = []
+    sizes: List[int] = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        for path in queue:
+            start = time.perf_counter()
+            try:
+                response = await client.get(path)
+                body = response.content
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            sizes.append(len(body))
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    ms = [value * 1000 for value in latencies]
+    return ScenarioResult(
+        requests=requests,
+        errors=errors,
+        seconds=round(elapsed, 3),
+        rps=round(requests / elapsed, 1) if elapsed else 0.0,
+        mean_ms=round(sum(ms) / len(ms), 3) if ms else 0.0,
+        p50_ms=round(percentile(ms, 50), 3),
+        p95_ms=round(percentile(ms, 95), 3),
+        p99_ms=round(percentile(ms, 99), 3),
+        max_ms=round(ms[-1], 3) if ms else 0.0,
+        mean_bytes=round(sum(sizes) / len(sizes)) if sizes else 0
+    )
+
+
+async def run_all(
+    client: httpx.AsyncClient,
+    scenarios: List[Scenario],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    seed: int = 7
+) -> Dict[str, ScenarioResult]:
+    ids = await sample_ids(client)
+    results = {}
+    for scenario in scenarios:
+        result = await run_scenario(client, scenario, ids, requests, concurrency, warmup, seed)
+        results[scenario.name] = result
+        print(
+            f"  {scenario.name:<18} {result.rps:>9.1f} req/s  "
+            f"p50 {result.p50_ms:>8.2f}  p95 {result.p95_ms:>8.2f}  p99 {result.p99_ms:>8.2f} ms  "
+            f"{result.mean_bytes:>9,.0f} B  errors {result.errors}"
+        )
+    return results
+
+
+def build_report(mode: str, results: Dict[str, ScenarioResult], meta: Optional[dict] = None) -> dict:
+    return {
+        "meta": {
+            "mode": mode,
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            **(meta or {})
+        },
+        "results": {name: asdict(result) for name, result in results.items()}
+    }
+
+
+def save_report(report: dict, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved results to {path}")
+
+
+def compare_reports(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """
+    Print per-scenario deltas against a baseline
+
+    Returns the scenarios whose p95 latency grew or throughput dropped by more
+    than `threshold` (a fraction, e.g. 0.10).
+    """
+    regressions = []
+    print(f"\nCompared with baseline from {baseline['meta'].get('timestamp', '?')}:")
+    print(f"  {'scenario':<18} {'req/s':>10} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base:
+            print(f"  {name:<18} (not in baseline)")
+            continue
+
+        def delta(key):
+            return (result[key] - base[key]) / base[key] if base[key] else 0.0
+
+        rps, p50, p95, p99 = delta("rps"), delta("p50_ms"), delta("p95_ms"), delta("p99_ms")
+        regressed = p95 > threshold or rps < -threshold
+        flag = "  REGRESSION" if regressed else ""
+        print(f"  {name:<18} {rps:>+10.1%} {p50:>+9.1%} {p95:>+9.1%} {p99:>+9.1%}{flag}")
+        if regressed:
+            regressions.append(name)
+    return regressions
@@ -0,0 +1,152 @@
+"""
+Benchmark: MongoDB connection pool sizing for one worker process
+
+Replays the list/detail query mix of the public endpoints at a fixed
+concurrency against the benchmark database, once per maxPoolSize, and
+reports throughput, query latency, time spent waiting for a connection and
+wait-queue timeouts. The smallest pool whose throughput and p99 are within
+a few percent of the largest one is the right per-worker default.
+
+Usage (from backend/, after `python -m benchmarks.run seed`):
+    python -m benchmarks.pool --sizes 5 10 20 50 100 --concurrency 64
+"""
+import argparse
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import List
+
+os.environ["DATABASE_NAME"] = os.getenv("BENCH_DATABASE_NAME", "news_analyzer_bench")
+
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+from pymongo import monitoring  # noqa: E402
+from pymongo.errors import PyMongoError  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from benchmarks.harness import percentile  # noqa: E402
+
+
+class PoolProbe(monitoring.ConnectionPoolListener):
+    """Records checkout waits and peak checked-out connections"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.waits: List[float] = []
+        self.checked_out = 0
+        self.peak = 0
+        self.opened = 0
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        wait = time.perf_counter() - getattr(self._local, "started", time.perf_counter())
+        with self._lock:
+            self.waits.append(wait * 1000)
+            self.checked_out += 1
+            self.peak = max(self.peak, self.checked_out)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def connection_created(self, event):
+        self.opened += 1
+
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_ready(self, event): pass
+    def connection_closed(self, event): pass
+    def connection_check_out_failed(self, event): pass
+
+
+async def run_size(pool_size: int, concurrency: int, operations: int, wait_timeout_ms: int, seed: int) -> dict:
+    probe = PoolProbe()
+    client = AsyncIOMotorClient(
+        settings.mongodb_url,
+        maxPoolSize=pool_size,
+        minPoolSize=0,
+        waitQueueTimeoutMS=wait_timeout_ms,
+        event_listeners=[probe]
+    )
+    database = client[settings.database_name]
+    rng = random.Random(seed)
+
+    ids = [doc["_id"] async for doc in database.news.find({"status": "published"}, {"_id": 1}).limit(200)]
+    if not ids:
+        client.close()
+        raise RuntimeError("No published news found; run `python -m benchmarks.run seed` first")
+
+    async def list_page():
+        skip = rng.randint(0, 50) * 20
+        await database.news.find({"status": "published"}).sort("published_date", -1).skip(skip).limit(20).to_list(20)
+
+    async def detail():
+        await database.news.find_one({"_id": rng.choice(ids)})
+
+    async def count():
+        await database.intelligence_cards.count_documents({"status": "published"})
+
+    mix = [list_page] * 5 + [detail] * 4 + [count]
+    latencies: List[float] = []
+    timeouts = 0
+    remaining = iter(range(operations))
+
+    async def worker():
+        nonlocal timeouts
+        for _ in remaining:
+            op = rng.choice(mix)
+            start = time.perf_counter()
+            try:
+                await op()
+            except PyMongoError:
+                timeouts += 1
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    client.close()
+
+    latencies.sort()
+    waits = sorted(probe.waits)
+    return {
+        "pool": pool_size,
+        "ops_per_s": operations / elapsed,
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+        "wait_p99": percentile(waits, 99),
+        "peak": probe.peak,
+        "opened": probe.opened,
+        "timeouts": timeouts,
+    }
+
+
+async def main(args):
+    print(
+        f"{settings.database_name}: {args.operations} ops per size, {args.concurrency} concurrent, "
+        f"waitQueueTimeoutMS={args.wait_timeout_ms}"
+    )
+    print(f"  {'pool':>5} {'ops/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'wait p99':>9} {'peak':>5} {'opened':>7} {'timeouts':>9}")
+    for size in args.sizes:
+        result = await run_size(size, args.concurrency, args.operations, args.wait_timeout_ms, args.seed)
+        print(
+            f"  {result['pool']:>5} {result['ops_per_s']:>9.1f} {result['p50']:>8.2f} {result['p99']:>8.2f} "
+            f"{result['wait_p99']:>9.2f} {result['peak']:>5} {result['opened']:>7} {result['timeouts']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark MongoDB pool sizes for one worker")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 20, 50, 100])
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent in-flight operations")
+    parser.add_argument("--operations", type=int, default=5000)
+    parser.add_argument("--wait-timeout-ms", type=int, default=settings.mongo_wait_queue_timeout_ms)
+    parser.add_argument("--seed", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
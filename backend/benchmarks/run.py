@@ -0,0 +1,128 @@
+"""
+Benchmark CLI for the public API
+
+Runs against a dedicated database (BENCH_DATABASE_NAME, default
+"news_analyzer_bench") so seeding never touches real data.
+
+Usage (from backend/):
+    python -m benchmarks.run seed --news 10000 --reports 10000 --cards 10000
+    python -m benchmarks.run bench --save benchmarks/results/baseline.json
+    python -m benchmarks.run bench --compare benchmarks/results/baseline.json
+    python -m benchmarks.run bench --url http://localhost:8000 --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+# Point the app at the benchmark database before app.config is imported
+os.environ["DATABASE_NAME"] = os.getenv("BENCH_DATABASE_NAME", "news_analyzer_bench")
+
+import httpx  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import close_mongo_connection, connect_to_mongo, get_database  # noqa: E402
+from benchmarks.corpus import seed_corpus  # noqa: E402
+from benchmarks.harness import (  # noqa: E402
+    SCENARIOS, SCENARIOS_BY_NAME, build_report, compare_reports, run_all, save_report
+)
+
+
+async def seed(args) -> int:
+    await connect_to_mongo()
+    try:
+        print(f"Seeding {settings.database_name} ...")
+        counts = await seed_corpus(
+            get_database(),
+            news=args.news,
+            reports=args.reports,
+            cards=args.cards,
+            seed=args.seed,
+            batch_size=args.batch_size
+        )
+    finally:
+        await close_mongo_connection()
+    print("Seeded " + ", ".join(f"{count:,} {name}" for name, count in counts.items()))
+    return 0
+
+
+async def bench(args) -> int:
+    scenarios = SCENARIOS
+    if args.only:
+        unknown = [name for name in args.only if name not in SCENARIOS_BY_NAME]
+        if unknown:
+            print(f"Unknown scenarios: {', '.join(unknown)}")
+            return 2
+        scenarios = [SCENARIOS_BY_NAME[name] for name in args.only]
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.url:
+        mode = "http"
+        print(f"Benchmarking {args.url} over HTTP ({args.concurrency} concurrent)")
+        async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60) as client:
+            results = await run_all(client, scenarios, args.requests, args.concurrency, args.warmup)
+    else:
+        from app.main import app
+
+        mode = "in-process"
+        print(f"Benchmarking in-process against {settings.database_name} ({args.concurrency} concurrent)")
+        await connect_to_mongo()
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+                results = await run_all(client, scenarios, args.requests, args.concurrency, args.warmup)
+        finally:
+            await close_mongo_connection()
+
+    report = build_report(mode, results, {
+        "url": args.url,
+        "database": settings.database_name,
+        "requests": args.requests,
+        "concurrency": args.concurrency
+    })
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        save_report(report, args.save)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_reports(report, baseline, args.threshold)
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a synthetic corpus and benchmark the public API")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="Generate and insert a synthetic corpus")
+    seed_parser.add_argument("--news", type=int, default=10000)
+    seed_parser.add_argument("--reports", type=int, default=10000)
+    seed_parser.add_argument("--cards", type=int, default=10000)
+    seed_parser.add_argument("--seed", type=int, default=42, help="Random seed (corpus is deterministic)")
+    seed_parser.add_argument("--batch-size", type=int, default=1000)
+
+    bench_parser = commands.add_parser("bench", help="Run the endpoint scenarios")
+    bench_parser.add_argument("--url", help="Benchmark a running server instead of the app in-process")
+    bench_parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    bench_parser.add_argument("--concurrency", type=int, default=16)
+    bench_parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario")
+    bench_parser.add_argument("--only", nargs="+", metavar="SCENARIO",
+                              help=f"Subset of: {', '.join(SCENARIOS_BY_NAME)}")
+    bench_parser.add_argument("--save", help="Write results JSON (e.g. a new baseline)")
+    bench_parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    bench_parser.add_argument("--threshold", type=float, default=0.10,
+                              help="Relative p95/throughput change counted as a regression")
+    bench_parser.add_argument("--fail-on-regression", action="store_true",
+                              help="Exit with status 1 if any scenario regressed")
+
+    args = parser.parse_args()
+    handler = seed if args.command == "seed" else bench
+    sys.exit(asyncio.run(handler(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Micro-benchmark: response serialization for a page of rich reports
+
+Compares the previous list-endpoint path (build ReportResponse per item, then
+FastAPI re-validates against response_model and encodes with json) with
+app.utils.serialization: validate once and encode in pydantic-core, and the
+trusted path used with raw_json_reads (no validation). No database is needed.
+
+Usage (from backend/):
+    python -m benchmarks.serialization --items 100 --rounds 200
+"""
+import argparse
+import asyncio
+import time
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.models.intelligence_card import IntelligenceCardModel
+from app.models.news import NewsModel
+from app.models.report import ReportModel
+from app.schemas.intelligence_card import IntelligenceCardListResponse
+from app.schemas.news import NewsListResponse
+from app.schemas.report import ReportListResponse, ReportResponse
+from app.utils.serialization import encode_trusted_json, json_response
+from benchmarks.corpus import CorpusGenerator
+from benchmarks.harness import percentile
+
+
+def build_page(items: int) -> list:
+    """Raw documents as they come out of MongoDB (all rich reports)"""
+    docs = list(CorpusGenerator(seed=1).reports(items, rich_ratio=1.0))
+    for doc in docs:
+        doc["_id"] = ObjectId()
+    return docs
+
+
+async def previous_path(field, docs: list) -> bytes:
+    report_list = [ReportModel.from_db(doc) for doc in docs]
+    content = ReportListResponse(
+        items=[ReportResponse(**r) for r in report_list],
+        total=len(docs), page=1, size=len(docs), pages=1
+    )
+    # What FastAPI does with a returned model: dump, re-validate, encode
+    value = await serialize_response(field=field, response_content=content, is_coroutine=True)
+    return JSONResponse(content=value).body
+
+
+async def single_pass(docs: list) -> bytes:
+    report_list = [ReportModel.from_db(doc) for doc in docs]
+    return json_response(ReportListResponse, {
+        "items": report_list,
+        "total": len(docs), "page": 1, "size": len(docs), "pages": 1
+    }).body
+
+
+async def trusted(docs: list) -> bytes:
+    report_list = [ReportModel.from_db(doc) for doc in docs]
+    return encode_trusted_json(ReportListResponse, {
+        "items": report_list,
+        "total": len(docs), "page": 1, "size": len(docs), "pages": 1
+    })
+
+
+def check_trusted_matches(items: int):
+    """The trusted encoder must be byte-identical to the validated one for every kind"""
+    generator = CorpusGenerator(seed=2)
+    for list_type, model, docs in (
+        (NewsListResponse, NewsModel, list(generator.news(items))),
+        (ReportListResponse, ReportModel, list(generator.reports(items))),
+        (IntelligenceCardListResponse, IntelligenceCardModel, list(generator.cards(items, ["r1"]))),
+    ):
+        for doc in docs:
+            doc.setdefault("_id", ObjectId())
+        page = {"items": [model.from_db(doc) for doc in docs], "total": items, "page": 1, "size": items, "pages": 1}
+        assert json_response(list_type, page).body == encode_trusted_json(list_type, page), list_type.__name__
+
+
+async def measure(fn, rounds: int) -> list:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings
+
+
+async def main(items: int, rounds: int):
+    docs = build_page(items)
+    field = create_response_field(name="Response_get_all_reports", type_=ReportListResponse)
+
+    previous_body = await previous_path(field, docs)
+    new_body = await single_pass(docs)
+    assert previous_body == new_body, "serializers disagree"
+    check_trusted_matches(items)
+    print(f"Page of {items} rich reports, {len(new_body):,} bytes, {rounds} rounds (output identical)")
+
+    results = {}
+    for name, fn in (
+        ("previous", lambda: previous_path(field, docs)),
+        ("single-pass", lambda: single_pass(docs)),
+        ("trusted", lambda: trusted(docs)),
+    ):
+        await measure(fn, max(5, rounds // 10))  # warm-up
+        timings = await measure(fn, rounds)
+        results[name] = timings
+        print(
+            f"  {name:<12} mean {sum(timings) / len(timings):8.2f} ms  "
+            f"p50 {percentile(timings, 50):8.2f}  p95 {percentile(timings, 95):8.2f}  "
+            f"p99 {percentile(timings, 99):8.2f} ms"
+        )
+
+    before = percentile(results["previous"], 50)
+    for name in ("single-pass", "trusted"):
+        print(f"  {name} speedup (p50): {before / percentile(results[name], 50):.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark list response serialization")
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.rounds))
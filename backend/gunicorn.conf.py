@@ -0,0 +1,45 @@
+"""
+Gunicorn configuration for production
+
+Runs settings.workers uvicorn worker processes (WORKERS env var). With
+uvicorn[standard] installed the workers use uvloop and httptools.
+
+Each worker has its own MongoDB pool of up to MONGO_MAX_POOL_SIZE
+connections, so the total is workers x pool size; keep it under the
+cluster's connection limit. Workers share their metrics through
+METRICS_DIR (a temp directory by default, cleared at startup), so a
+/metrics scrape covers every worker whichever one answers it.
+
+Usage (from backend/):
+    gunicorn -c gunicorn.conf.py app.main:app
+"""
+import os
+import tempfile
+
+# Before settings are loaded, so the forked workers see it
+os.environ.setdefault("METRICS_DIR", os.path.join(tempfile.gettempdir(), "news-analyzer-metrics"))
+
+from app.config import settings
+from app.services.metrics import prepare_shared_dir
+
+bind = f"{settings.host}:{os.getenv('PORT', settings.port)}"
+workers = settings.workers
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Seconds without a worker heartbeat before it is restarted
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
+
+# Restart workers periodically to bound memory growth
+max_requests = 10000
+max_requests_jitter = 1000
+
+accesslog = None
+errorlog = "-"
+forwarded_allow_ips = "*"
+
+
+def on_starting(server):
+    """Drop metrics files left by a previous run"""
+    prepare_shared_dir(settings.metrics_dir)
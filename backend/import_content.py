@@ -0,0 +1,65 @@
+"""
+Bulk import CLI for reports and intelligence cards.
+
+Streams an NDJSON file (or a JSON array) through the same validation and
+slug-keyed upsert pipeline as POST /api/import/{kind}. Content events are
+handled in this process, so the public feed, facet counts and related
+lists are updated before it exits, and the changed documents are published
+on the cache invalidation bus for running API workers.
+
+Usage:
+    python import_content.py reports reports.ndjson
+    python import_content.py intelligence-cards cards.json --dry-run
+"""
+import argparse
+import asyncio
+import sys
+
+from app.database import connect_to_mongo, close_mongo_connection
+from app.services import related
+from app.services.invalidation_bus import invalidation_bus
+from app.services.import_service import ImportService, IMPORT_KINDS, iter_file_chunks
+
+
+async def run(kind: str, path: str, dry_run: bool, batch_size: int):
+    await connect_to_mongo()
+    invalidation_bus.start(receive=False)
+    try:
+        report = await ImportService.import_stream(
+            kind,
+            iter_file_chunks(path),
+            dry_run=dry_run,
+            batch_size=batch_size
+        )
+        await related.wait_for_refresh()
+    finally:
+        await invalidation_bus.stop()
+        await close_mongo_connection()
+
+    mode = " (dry run)" if report.dry_run else ""
+    print(f"Imported {kind}{mode}: {report.processed} records")
+    print(f"  inserted: {report.inserted}")
+    print(f"  updated:  {report.updated}")
+    print(f"  failed:   {report.failed}")
+    for failure in report.failures:
+        slug = f" [{failure.slug}]" if failure.slug else ""
+        print(f"  line {failure.line}{slug}: {failure.error}")
+    if report.failures_truncated:
+        print("  ... more failures not shown")
+
+    return 1 if report.failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import reports or intelligence cards")
+    parser.add_argument("kind", choices=sorted(IMPORT_KINDS))
+    parser.add_argument("path", help="NDJSON file or JSON array file")
+    parser.add_argument("--dry-run", action="store_true", help="Validate only, do not write")
+    parser.add_argument("--batch-size", type=int, default=None, help="Records per bulk_write")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(run(args.kind, args.path, args.dry_run, args.batch_size)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Maintenance CLI for derived data.
+
+Derived collections are kept current from content events while the API
+runs; rebuild them after restoring a backup, editing documents directly in
+MongoDB, or when they look out of sync.
+
+Usage:
+    python maintenance.py facets                 # all content collections
+    python maintenance.py facets --collection news
+    python maintenance.py related                # related-items lists
+    python maintenance.py feed                   # rebuild the public_feed read model
+    python maintenance.py feed --check [--repair] --collection news
+    python maintenance.py snapshot               # rewrite the published-content snapshot file
+    python maintenance.py slugs                  # give reports and cards missing a slug their import key
+"""
+import argparse
+import asyncio
+
+from app.database import connect_to_mongo, close_mongo_connection
+from app.services import facets, import_service, public_feed, related
+from app.services.snapshot import snapshot_store
+
+
+async def rebuild_facets(collections):
+    for collection in collections:
+        written = await facets.rebuild(collection)
+        print(f"Rebuilt facet counts for {collection}: {written} entries")
+
+
+async def rebuild_related():
+    written = await related.rebuild()
+    print(f"Rebuilt related items: {written} lists")
+
+
+async def rebuild_feed(collections):
+    for collection in collections:
+        written = await public_feed.rebuild(collection)
+        print(f"Rebuilt public feed for {collection}: {written} entries")
+
+
+async def check_feed(collections, repair):
+    for collection in collections:
+        result = await public_feed.check(collection, repair=repair)
+        state = "consistent" if result["consistent"] else "INCONSISTENT"
+        print(
+            f"Public feed for {collection}: {state} "
+            f"(missing {result['missing']}, stale {result['stale']}, orphaned {result['orphaned']})"
+        )
+        for problem, ids in result["sample"].items():
+            if ids:
+                print(f"  {problem}: {', '.join(ids)}")
+        if result["repaired"]:
+            print("  repaired")
+
+
+async def rebuild_snapshot():
+    count = await snapshot_store.build()
+    print(f"Wrote {snapshot_store.path} with {count} published items")
+
+
+async def backfill_slugs(kinds):
+    for kind in kinds:
+        updated, skipped = await import_service.backfill_slugs(kind)
+        print(f"Backfilled slugs for {kind}: {updated} set, {skipped} skipped (empty or already taken)")
+
+
+async def run(args):
+    await connect_to_mongo()
+    try:
+        if args.command == "facets":
+            await rebuild_facets([args.collection] if args.collection else list(facets.FACET_FIELDS))
+        elif args.command == "related":
+            await rebuild_related()
+        elif args.command == "feed":
+            collections = [args.collection] if args.collection else list(public_feed.FEED_SOURCES)
+            if args.check:
+                await check_feed(collections, args.repair)
+            else:
+                await rebuild_feed(collections)
+        elif args.command == "snapshot":
+            await rebuild_snapshot()
+        elif args.command == "slugs":
+            await backfill_slugs([args.kind] if args.kind else list(import_service.IMPORT_KINDS))
+    finally:
+        await close_mongo_connection()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild or check derived collections")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    facets_parser = subcommands.add_parser("facets", help="Recount facet_counts from published content")
+    facets_parser.add_argument("--collection", choices=list(facets.FACET_FIELDS))
+
+    subcommands.add_parser("related", help="Recompute related_items for every published item")
+
+    feed_parser = subcommands.add_parser("feed", help="Rebuild (or check) the public_feed read model")
+    feed_parser.add_argument("--collection", choices=list(public_feed.FEED_SOURCES))
+    feed_parser.add_argument("--check", action="store_true", help="Compare with the source collections instead")
+    feed_parser.add_argument("--repair", action="store_true", help="With --check, fix any differences found")
+
+    subcommands.add_parser("snapshot", help="Rewrite the published-content snapshot shared by the workers")
+
+    slugs_parser = subcommands.add_parser("slugs", help="Set the import slug on reports and cards created without one")
+    slugs_parser.add_argument("--kind", choices=list(import_service.IMPORT_KINDS))
+
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Batch sub-request path validation (run from backend/: python -m unittest discover tests)
+"""
+import unittest
+from app.services.batch import validate_path
+
+
+class ValidatePathTests(unittest.TestCase):
+    def test_plain_paths_are_allowed(self):
+        self.assertIsNone(validate_path("/api/news?page=2"))
+        self.assertIsNone(validate_path("/api/related/news/abc"))
+
+    def test_blocked_endpoints_are_rejected(self):
+        for path in ("/api/stream", "/api/batch", "/api/export/news", "/api/stream?collections=news"):
+            self.assertIsNotNone(validate_path(path), path)
+
+    def test_encoded_blocked_endpoints_are_rejected(self):
+        for path in ("/api/%73tream", "/api/%65xport/news", "/api/%62atch", "/api/stream%2F", "/api/news/../stream", "/api/news/%2e%2e/export/news"):
+            self.assertIsNotNone(validate_path(path), path)
+
+    def test_paths_outside_the_api_are_rejected(self):
+        for path in ("http://example.com/api/news", "/health", "/api/../metrics", "/%61pi/news/../../metrics"):
+            self.assertIsNotNone(validate_path(path), path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Facet count deltas under concurrent writes (run from backend/: python -m unittest discover tests)
+"""
+import asyncio
+import unittest
+from collections import Counter
+from unittest import mock
+from bson import ObjectId
+from app.services import events
+from app.services.events import update_and_emit
+from app.services.facets import facet_contributions
+
+
+class _Cards:
+    """find_one_and_update over one document; yields first so concurrent calls interleave"""
+
+    name = "intelligence_cards"
+
+    def __init__(self, document):
+        self.document = document
+
+    async def find_one_and_update(self, query, update, return_document=None):
+        await asyncio.sleep(0)
+        before = dict(self.document)
+        self.document.update(update["$set"])
+        return before
+
+
+class OverlappingUpdateTests(unittest.IsolatedAsyncioTestCase):
+    async def test_two_overlapping_updates_leave_exact_counts(self):
+        initial = {"_id": ObjectId(), "status": "published", "company": "openai", "tier": "tier_1", "category": "ai", "industry": "tech"}
+        cards = _Cards(dict(initial))
+        emitted = []
+        with mock.patch.object(events.content_events, "emit", new=mock.AsyncMock(side_effect=emitted.append)):
+            # Both handlers read the same document before either writes
+            await asyncio.gather(
+                update_and_emit(cards, initial["_id"], {"tier": "tier_2"}),
+                update_and_emit(cards, initial["_id"], {"company": "anthropic"}),
+            )
+
+        delta = Counter()
+        for event in emitted:
+            delta.update(facet_contributions("intelligence_cards", event.document))
+            delta.subtract(facet_contributions("intelligence_cards", event.previous))
+        expected = Counter(facet_contributions("intelligence_cards", cards.document))
+        expected.subtract(facet_contributions("intelligence_cards", initial))
+        self.assertEqual(cards.document["tier"], "tier_2")
+        self.assertEqual(cards.document["company"], "anthropic")
+        self.assertEqual(+delta, +expected)
+        self.assertEqual(-delta, -expected)
+        # The second event's previous image is the first one's result
+        self.assertEqual(emitted[1].previous, emitted[0].document)
+
+    async def test_missing_document_emits_nothing(self):
+        cards = mock.Mock(name="cards")
+        cards.find_one_and_update = mock.AsyncMock(return_value=None)
+        with mock.patch.object(events.content_events, "emit", new=mock.AsyncMock()) as emit:
+            self.assertIsNone(await update_and_emit(cards, ObjectId(), {"tier": "tier_2"}))
+        emit.assert_not_awaited()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Content events emitted by bulk imports (run from backend/: python -m unittest discover tests)
+"""
+import json
+import unittest
+from unittest import mock
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+from pymongo.results import BulkWriteResult
+from app.services import import_service
+from app.services.events import PUBLISH, UPDATE
+from app.services.import_service import ImportService
+
+
+class _Cursor:
+    def __init__(self, documents):
+        self._documents = documents
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self._documents:
+            yield document
+
+
+class _Reports:
+    """find() by slug and bulk_write() of slug-keyed upserts, over a list"""
+
+    name = "reports"
+
+    def __init__(self, documents=None):
+        self.documents = documents or []
+
+    def find(self, query, projection=None):
+        slugs = query["slug"]["$in"]
+        return _Cursor([dict(document) for document in self.documents if document["slug"] in slugs])
+
+    async def bulk_write(self, requests, ordered=True):
+        upserted = matched = 0
+        for request in requests:
+            update = request._doc
+            existing = next((d for d in self.documents if d["slug"] == request._filter["slug"]), None)
+            if existing is None:
+                self.documents.append({"_id": ObjectId(), **update["$setOnInsert"], **update["$set"]})
+                upserted += 1
+            else:
+                existing.update(update["$set"])
+                matched += 1
+        return BulkWriteResult({"nUpserted": upserted, "nMatched": matched}, True)
+
+
+async def _chunks(records):
+    yield "\n".join(json.dumps(record) for record in records).encode()
+
+
+class ImportEventTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.existing = {"_id": ObjectId(), "slug": "old", "title": "Old", "summary": "s", "status": "published"}
+        self.reports = _Reports([dict(self.existing)])
+        patches = [
+            mock.patch.dict(import_service.IMPORT_KINDS["reports"], collection=lambda: self.reports),
+            mock.patch.object(import_service.content_events, "emit_many", new_callable=mock.AsyncMock),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.emit_many = import_service.content_events.emit_many
+
+    async def test_each_batch_is_emitted_with_previous_documents(self):
+        records = [
+            {"slug": "old", "title": "Old", "summary": "changed", "status": "published"},
+            {"slug": "new", "title": "New", "summary": "s", "status": "published"},
+        ]
+        report = await ImportService.import_stream("reports", _chunks(records))
+
+        self.assertEqual((report.inserted, report.updated), (1, 1))
+        self.emit_many.assert_awaited_once()
+        events = {event.document["slug"]: event for event in self.emit_many.await_args.args[0]}
+        self.assertEqual(events["old"].action, UPDATE)
+        self.assertEqual(events["old"].id, str(self.existing["_id"]))
+        self.assertEqual(events["old"].previous["summary"], "s")
+        self.assertEqual(events["new"].action, PUBLISH)
+        self.assertIsNone(events["new"].previous)
+        self.assertEqual({event.collection for event in events.values()}, {"reports"})
+
+    async def test_one_batch_per_flush(self):
+        records = [{"slug": f"r{i}", "title": f"R{i}", "summary": "s"} for i in range(5)]
+        await ImportService.import_stream("reports", _chunks(records), batch_size=2)
+        self.assertEqual([len(call.args[0]) for call in self.emit_many.await_args_list], [2, 2, 1])
+
+    async def test_dry_run_emits_nothing(self):
+        records = [{"slug": "new", "title": "New", "summary": "s"}]
+        await ImportService.import_stream("reports", _chunks(records), dry_run=True)
+        self.emit_many.assert_not_awaited()
+
+
+class InsertWithSlugTests(unittest.IsolatedAsyncioTestCase):
+    async def test_created_items_get_the_slug_imports_match_on(self):
+        reports = mock.Mock(insert_one=mock.AsyncMock())
+        document = {"title": "AI Jobs Outlook 2026", "summary": "s"}
+
+        await import_service.insert_with_slug("reports", reports, document)
+
+        self.assertEqual(document["slug"], "ai-jobs-outlook-2026")
+        self.assertEqual(reports.insert_one.await_args.args[0]["slug"], "ai-jobs-outlook-2026")
+
+    async def test_taken_slug_is_left_unset(self):
+        inserted = []
+
+        async def insert_one(document):
+            if "slug" in document:
+                raise DuplicateKeyError("E11000 duplicate key error")
+            inserted.append(dict(document))
+
+        document = {"company": "OpenAI", "title": "Launch"}
+        await import_service.insert_with_slug("intelligence-cards", mock.Mock(insert_one=insert_one), document)
+
+        self.assertEqual(inserted, [{"company": "OpenAI", "title": "Launch"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
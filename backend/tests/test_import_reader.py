@@ -0,0 +1,61 @@
+"""
+JSONRecordReader parsing (run from backend/: python -m unittest discover tests)
+"""
+import unittest
+from app.services.import_service import JSONRecordReader, RecordStreamError
+
+
+async def _chunks(data: bytes, size: int = 4):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def _read(data: bytes, max_record_bytes: int = 1024):
+    reader = JSONRecordReader(_chunks(data), max_record_bytes)
+    return [item async for item in reader.records()]
+
+
+class JSONRecordReaderTests(unittest.IsolatedAsyncioTestCase):
+    async def test_array(self):
+        records = await _read(b'[{"a": 1},\n {"a": 2}]')
+        self.assertEqual(records, [(1, {"a": 1}), (2, {"a": 2})])
+
+    async def test_empty_array(self):
+        self.assertEqual(await _read(b"[ ]"), [])
+
+    async def test_trailing_comma_in_array_is_rejected(self):
+        with self.assertRaises(RecordStreamError) as raised:
+            await _read(b'[{"a": 1},\n]')
+        self.assertIn("Trailing comma", str(raised.exception))
+        self.assertEqual(raised.exception.line, 2)
+
+    async def test_leading_comma_in_array_is_rejected(self):
+        with self.assertRaises(RecordStreamError):
+            await _read(b'[,{"a": 1}]')
+
+    async def test_bom_before_array_is_skipped(self):
+        records = await _read(b'\xef\xbb\xbf[{"a": 1}]')
+        self.assertEqual(records, [(1, {"a": 1})])
+
+    async def test_bom_before_ndjson_is_skipped(self):
+        records = await _read(b'\xef\xbb\xbf{"a": 1}\n{"a": 2}\n')
+        self.assertEqual(records, [(1, {"a": 1}), (2, {"a": 2})])
+
+    async def test_malformed_ndjson_line_is_reported_and_skipped(self):
+        records = await _read(b'{"a": 1}\n{"a": \n{"a": 3}\n')
+        self.assertEqual(records[0], (1, {"a": 1}))
+        self.assertIsInstance(records[1][1], RecordStreamError)
+        self.assertEqual(records[2], (3, {"a": 3}))
+
+    async def test_record_limit_counts_bytes_not_characters(self):
+        record = '{"t": "' + "\u00e9" * 20 + '"}'  # 29 characters, 49 bytes
+        for data in ((record + "\n").encode(), ("[" + record + "]").encode()):
+            records = await _read(data, max_record_bytes=40)
+            self.assertEqual(len(records), 1)
+            self.assertIsInstance(records[0][1], RecordStreamError)
+            self.assertIn("exceeds 40 bytes", str(records[0][1]))
+        self.assertEqual(await _read((record + "\n").encode(), max_record_bytes=49), [(1, {"t": "\u00e9" * 20})])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Per-worker cache of the public feed's built state (run from backend/: python -m unittest discover tests)
+"""
+import unittest
+from unittest import mock
+from app.config import settings
+from app.services import invalidation_bus, public_feed
+
+
+class _Feed:
+    """Meta documents only: find_one() and the update_one() _mark_dirty sends"""
+
+    def __init__(self, state):
+        self.state = state
+        self.reads = 0
+
+    async def find_one(self, query, projection=None):
+        self.reads += 1
+        return {"_id": query["_id"], "state": self.state}
+
+    async def update_one(self, query, update, upsert=False):
+        self.state = update["$set"]["state"]
+
+
+class BuiltStateCacheTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.feed = _Feed(public_feed.BUILT)
+        patches = [
+            mock.patch.object(public_feed, "get_database", return_value={public_feed.FEED_COLLECTION: self.feed}),
+            mock.patch.object(settings, "public_feed_state_ttl_seconds", 60.0),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        public_feed.forget_state()
+        self.addCleanup(public_feed.forget_state)
+
+    async def test_reads_within_the_ttl_share_one_lookup(self):
+        for _ in range(5):
+            self.assertTrue(await public_feed.is_built("news"))
+        self.assertEqual(self.feed.reads, 1)
+
+    async def test_marking_dirty_is_seen_by_the_next_read(self):
+        self.assertTrue(await public_feed.is_built("news"))
+        await public_feed._mark_dirty("news")
+        self.assertFalse(await public_feed.is_built("news"))
+
+    async def test_bus_message_drops_the_state_of_its_collections(self):
+        self.assertTrue(await public_feed.is_built("news"))
+        self.assertTrue(await public_feed.is_built("reports"))
+        self.feed.state = public_feed.DIRTY  # Marked dirty by another worker
+
+        with mock.patch.object(invalidation_bus.related, "mark_stale"):
+            invalidation_bus.apply_invalidation([("news", "abc")])
+
+        self.assertFalse(await public_feed.is_built("news"))
+        self.assertTrue(await public_feed.is_built("reports"))  # Still cached
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Incremental related-list updates (run from backend/: python -m unittest discover tests)
+"""
+import random
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+from bson import ObjectId
+from app.config import settings
+from app.services.related import RelatedModel, _updated_lists
+
+COMPANIES = ["openai", "anthropic", "google", "meta", "nvidia", "mistral"]
+TAGS = ["llm", "chips", "policy", "funding", "safety", "agents", "robotics"]
+WORDS = ["model", "launch", "training", "cluster", "regulation", "benchmark", "startup", "inference"]
+
+
+def _corpus(rng: random.Random, size: int) -> dict:
+    documents = {}
+    for index in range(size):
+        collection = rng.choice(["news", "reports", "intelligence_cards"])
+        document = {
+            "_id": ObjectId(),
+            "status": "published",
+            "title": " ".join(rng.sample(WORDS, 3)),
+            "tags": rng.sample(TAGS, 2),
+            "published_date": datetime(2026, 1, 1) + timedelta(hours=index),
+        }
+        if collection == "intelligence_cards":
+            document["company"] = rng.choice(COMPANIES)
+        else:
+            document["companies"] = rng.sample(COMPANIES, 1)
+        documents[(collection, str(document["_id"]))] = document
+    return documents
+
+
+class UpdatedListsTests(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            mock.patch.object(settings, "related_top_k", 3),
+            mock.patch.object(settings, "related_max_feature_df", 1.0),
+            mock.patch.object(settings, "related_max_candidates_per_feature", 10_000),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_patched_lists_match_a_full_recompute(self):
+        rng = random.Random(7)
+        model = RelatedModel(_corpus(rng, 120))
+        stored = {key: model.neighbors(key, 3) for key in model.vectors}
+
+        keys = sorted(model.vectors)
+        edited, unpublished = rng.sample(keys, 4), rng.sample(keys, 2)
+        changes = {}
+        for key in edited:
+            document = dict(model.documents[key], title="new " + " ".join(rng.sample(WORDS, 3)), tags=rng.sample(TAGS, 2))
+            changes[key] = document
+        for key in unpublished:
+            changes[key] = dict(model.documents[key], status="draft")
+        created = ("news", str(ObjectId()))
+        changes[created] = {"_id": ObjectId(created[1]), "status": "published", "title": "model launch", "tags": ["llm"], "companies": ["openai"]}
+
+        model.patch(changes)
+        changed = set(changes)
+        # What refresh() reads: the changed items' lists, lists they may enter and lists that listed them
+        affected = set(changed)
+        for key in changed:
+            if key in model.vectors:
+                affected |= model.candidates(key)
+        mentioned = {key for key, neighbors in stored.items() if any((item["kind"], item["id"]) in changed for item in neighbors)}
+        subset = {key: stored[key] for key in (affected | mentioned) if key in stored}
+
+        lists = _updated_lists(model, changed, subset)
+
+        for key in unpublished:
+            self.assertIsNone(lists[key])
+        self.assertIsNotNone(lists[created])
+        for key, neighbors in lists.items():
+            if neighbors is not None:
+                self.assertEqual(neighbors, model.neighbors(key, 3), key)
+        # Lists outside the affected set do not change
+        for key in set(stored) - set(lists):
+            if key in model.vectors:
+                self.assertEqual(stored[key], model.neighbors(key, 3), key)
+
+    def test_common_features_do_not_generate_candidates(self):
+        documents = _corpus(random.Random(3), 40)
+        for document in documents.values():
+            document["tags"] = ["llm"]
+        with mock.patch.object(settings, "related_max_feature_df", 0.5):
+            model = RelatedModel(documents)
+            key = next(iter(model.vectors))
+            rare = {
+                other for feature in model.features[key] if model.document_frequency[feature] <= 20
+                for other in model.postings[feature]
+            } - {key}
+            self.assertEqual(model.candidates(key), rare or set(model.vectors) - {key})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+PublishScheduler batching (run from backend/: python -m unittest discover tests)
+"""
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+from bson import ObjectId
+from fastapi import HTTPException
+from pymongo.errors import AutoReconnect, BulkWriteError
+from app.config import settings
+from app.services import scheduler
+from app.services.scheduler import PUBLISHED_STATUS, SCHEDULED_STATUS, PublishScheduler, require_publish_date
+
+
+def _matches(document: dict, query: dict) -> bool:
+    for field, condition in query.items():
+        value = document.get(field)
+        if isinstance(condition, dict):
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+            if "$lte" in condition and not (value is not None and value <= condition["$lte"]):
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class _Cursor:
+    def __init__(self, documents):
+        self._documents = documents
+
+    async def to_list(self, length=None):
+        return self._documents
+
+
+class _Collection:
+    """The handful of collection methods the scheduler uses, over a list"""
+
+    def __init__(self, documents=None):
+        self.documents = documents or []
+
+    def find(self, query, projection=None):
+        return _Cursor([dict(document) for document in self.documents if _matches(document, query)])
+
+    async def update_many(self, query, update):
+        for document in self.documents:
+            if _matches(document, query):
+                document.update(update["$set"])
+
+    async def insert_many(self, documents, ordered=True):
+        existing = {document["_id"] for document in self.documents}
+        errors = [{"index": i} for i, document in enumerate(documents) if document["_id"] in existing]
+        self.documents += [document for document in documents if document["_id"] not in existing]
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+    async def delete_many(self, query):
+        self.documents = [document for document in self.documents if not _matches(document, query)]
+
+
+class _Database(dict):
+    def __getattr__(self, name):
+        return self[name]
+
+
+class CoalescedFireTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.now = datetime.utcnow()
+        self.card = {"_id": ObjectId(), "status": SCHEDULED_STATUS}
+        self.database = _Database(intelligence_cards=_Collection([self.card]), scheduler_locks=_Collection())
+        patcher = mock.patch.object(scheduler, "get_database", return_value=self.database)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.scheduler = PublishScheduler()
+
+    async def test_job_due_inside_the_coalescing_window_is_published(self):
+        due = self.now + timedelta(milliseconds=5)
+        self.assertLess(5, settings.scheduler_coalesce_ms)
+        self.card["published_date"] = due
+        self.scheduler.schedule("intelligence_cards", str(self.card["_id"]), due)
+
+        await self.scheduler._fire(self.scheduler._pop_due(self.now))
+
+        self.assertEqual(self.card["status"], PUBLISHED_STATUS)
+        self.assertEqual(self.scheduler.fired, 1)
+
+    async def test_job_moved_later_releases_its_lock(self):
+        due = self.now + timedelta(milliseconds=5)
+        self.scheduler.schedule("intelligence_cards", str(self.card["_id"]), due)
+        self.card["published_date"] = due + timedelta(hours=1)  # Rescheduled by another worker
+
+        await self.scheduler._fire(self.scheduler._pop_due(self.now))
+
+        self.assertEqual(self.card["status"], SCHEDULED_STATUS)
+        self.assertEqual(self.database.scheduler_locks.documents, [])
+
+    async def test_failed_publish_releases_locks_and_requeues_with_backoff(self):
+        due = self.now
+        self.card["published_date"] = due
+        self.scheduler.schedule("intelligence_cards", str(self.card["_id"]), due)
+        failing = mock.AsyncMock(side_effect=AutoReconnect("primary stepped down"))
+
+        with mock.patch.object(self.database.intelligence_cards, "update_many", failing):
+            await self.scheduler._fire(self.scheduler._pop_due(self.now))
+
+        self.assertEqual(self.card["status"], SCHEDULED_STATUS)
+        self.assertEqual(self.database.scheduler_locks.documents, [])
+        self.assertEqual(self.scheduler.pending, 1)
+        self.assertGreater(self.scheduler._next_delay(), 0)
+
+        # The retry claims a fresh lock and publishes
+        await self.scheduler._fire(self.scheduler._pop_due(datetime.utcnow() + timedelta(seconds=settings.scheduler_retry_seconds)))
+        self.assertEqual(self.card["status"], PUBLISHED_STATUS)
+
+
+class RequirePublishDateTests(unittest.TestCase):
+    def test_scheduled_without_date_is_rejected(self):
+        with self.assertRaises(HTTPException) as raised:
+            require_publish_date(SCHEDULED_STATUS, None)
+        self.assertEqual(raised.exception.status_code, 400)
+
+    def test_other_statuses_and_dated_items_pass(self):
+        require_publish_date("draft", None)
+        require_publish_date(SCHEDULED_STATUS, datetime.utcnow())
+
+
+if __name__ == "__main__":
+    unittest.main()
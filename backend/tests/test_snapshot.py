@@ -0,0 +1,69 @@
+"""
+Snapshot file swaps and fallback headers (run from backend/: python -m unittest discover tests)
+"""
+import asyncio
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+from app.config import settings
+from app.services import cdn
+from app.services.snapshot import Snapshot, SnapshotWriter, read_built_at, write_snapshot
+
+
+class OutOfOrderCommitTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "catalog.bin")
+
+    def test_older_build_finishing_last_does_not_replace_a_newer_one(self):
+        started = datetime(2026, 5, 1, 12, 0, 0)
+        older = SnapshotWriter(self.path)
+        older.write_items("news", [("a", b'{"v":1}')])
+
+        self.assertTrue(write_snapshot(self.path, {"news": [("a", b'{"v":2}')]}, started + timedelta(seconds=5)))
+        self.assertFalse(older.commit(started))
+
+        snapshot = Snapshot.open(self.path)
+        self.addCleanup(snapshot.close)
+        self.assertEqual(snapshot.item("news", "a"), b'{"v":2}')
+        self.assertEqual(read_built_at(self.path), started + timedelta(seconds=5))
+        self.assertEqual([name for name in os.listdir(os.path.dirname(self.path)) if name.endswith(".tmp")], [])
+
+    def test_newer_build_replaces_the_file(self):
+        started = datetime(2026, 5, 1, 12, 0, 0)
+        write_snapshot(self.path, {"news": [("a", b'{"v":1}')]}, started)
+        self.assertTrue(write_snapshot(self.path, {"news": [("a", b'{"v":2}')]}, started + timedelta(seconds=1)))
+        self.assertEqual(read_built_at(self.path), started + timedelta(seconds=1))
+
+
+class NoStoreResponseTests(unittest.TestCase):
+    def _send_through_middleware(self, headers):
+        async def app(scope, receive, send):
+            cdn.add_surrogate_keys("news")
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "GET", "headers": []}
+        with mock.patch.object(settings, "cdn_s_maxage_seconds", 60):
+            asyncio.run(cdn.SurrogateKeyMiddleware(app)(scope, None, send))
+        return dict(sent[0]["headers"])
+
+    def test_no_store_responses_are_not_made_public(self):
+        headers = self._send_through_middleware([(b"cache-control", b"no-store")])
+        self.assertEqual(headers[b"cache-control"], b"no-store")
+        self.assertNotIn(b"surrogate-key", headers)
+
+    def test_tagged_responses_still_get_cdn_headers(self):
+        headers = self._send_through_middleware([])
+        self.assertIn(b"s-maxage=60", headers[b"cache-control"])
+
+
+if __name__ == "__main__":
+    unittest.main()
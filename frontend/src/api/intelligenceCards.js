@@ -20,6 +20,14 @@ export const intelligenceCardsAPI = {
     return response.data;
   },
 
+  // Stats, landing cards, featured card and latest news in one call
+  getLandingBundle: async (cardsLimit = 8, newsLimit = 6) => {
+    const response = await api.get("/landing", {
+      params: { cards_limit: cardsLimit, news_limit: newsLimit },
+    });
+    return response.data;
+  },
+
   getFeaturedCard: async () => {
     const response = await api.get("/intelligence-cards/featured");
     return response.data;
@@ -35,6 +43,14 @@ export const intelligenceCardsAPI = {
     return response.data;
   },
 
+  // Several items in one request: { items (in order), missing }
+  getByIds: async (ids) => {
+    const response = await api.get("/intelligence-cards/by-ids", {
+      params: { ids: ids.join(",") },
+    });
+    return response.data;
+  },
+
   // Admin endpoints
   create: async (data) => {
     const response = await api.post("/intelligence-cards", data);
@@ -0,0 +1,78 @@
+// API Base URL (same as axios instance)
+const API_BASE_URL =
+  import.meta.env.VITE_API_URL || "http://localhost:8000/api";
+
+const EVENT_TYPES = [
+  "create",
+  "update",
+  "delete",
+  "publish",
+  "unpublish",
+  "feature",
+  "unfeature",
+];
+
+/**
+ * Subscribe to live content updates over Server-Sent Events.
+ * The browser reconnects automatically if the stream drops.
+ *
+ * @param {string[]} collections - e.g. ["intelligence_cards"]
+ * @param {(event: object) => void} onEvent - called with the parsed event data
+ * @returns {() => void} unsubscribe function
+ */
+export const subscribeToLiveUpdates = (collections, onEvent) => {
+  if (typeof EventSource === "undefined") {
+    return () => {};
+  }
+
+  const query = collections?.length
+    ? `?collections=${encodeURIComponent(collections.join(","))}`
+    : "";
+  const source = new EventSource(`${API_BASE_URL}/stream${query}`);
+
+  const handler = (message) => {
+    try {
+      onEvent(JSON.parse(message.data));
+    } catch (err) {
+      console.error("Invalid live update:", err);
+    }
+  };
+  EVENT_TYPES.forEach((type) => source.addEventListener(type, handler));
+
+  return () => source.close();
+};
+
+/**
+ * Call `onChange` once per burst of public changes to `collections`.
+ * Events for other collections and draft-only edits are ignored, and the
+ * call is delayed by `delayMs` plus a random `jitterMs` so every connected
+ * browser does not refetch at the same instant.
+ *
+ * @param {string[]} collections - e.g. ["intelligence_cards"]
+ * @param {() => void} onChange - refetch callback
+ * @returns {() => void} unsubscribe function
+ */
+export const subscribeToPublicChanges = (
+  collections,
+  onChange,
+  { delayMs = 1000, jitterMs = 4000 } = {}
+) => {
+  let timer = null;
+  const unsubscribe = subscribeToLiveUpdates(collections, (event) => {
+    if (!collections.includes(event.collection) || event.is_public === false) {
+      return;
+    }
+    if (timer) {
+      return; // A refetch is already pending and will see this change too
+    }
+    timer = setTimeout(() => {
+      timer = null;
+      onChange();
+    }, delayMs + Math.random() * jitterMs);
+  });
+
+  return () => {
+    clearTimeout(timer);
+    unsubscribe();
+  };
+};
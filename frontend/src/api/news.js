@@ -13,6 +13,14 @@ export const newsAPI = {
     return response.data;
   },
 
+  // Several items in one request: { items (in order), missing }
+  getByIds: async (ids) => {
+    const response = await api.get("/news/by-ids", {
+      params: { ids: ids.join(",") },
+    });
+    return response.data;
+  },
+
   // Create news (admin only)
   create: async (newsData) => {
     const response = await api.post("/news", newsData);
@@ -13,6 +13,14 @@ export const reportsAPI = {
     return response.data;
   },
 
+  // Several items in one request: { items (in order), missing }
+  getByIds: async (ids) => {
+    const response = await api.get("/reports/by-ids", {
+      params: { ids: ids.join(",") },
+    });
+    return response.data;
+  },
+
   // Create report (admin only)
   create: async (reportData) => {
     const response = await api.post("/reports", reportData);
@@ -1,6 +1,7 @@
 import { useState, useEffect } from "react";
 import { Link, useNavigate } from "react-router-dom";
 import { intelligenceCardsAPI } from "../api/intelligenceCards";
+import { subscribeToPublicChanges } from "../api/liveUpdates";
 import { Search, Grid, List, ChevronRight, X } from "lucide-react";
 
 const Archive = () => {
@@ -33,6 +34,14 @@ const Archive = () => {
     fetchFeaturedCard();
   }, [page, filters]);
 
+  // Refresh when cards are published, unpublished, featured or edited
+  useEffect(() => {
+    return subscribeToPublicChanges(["intelligence_cards"], () => {
+      fetchCards();
+      fetchFeaturedCard();
+    });
+  }, [page, filters]);
+
   useEffect(() => {
     // Build active filters array for display
     const active = [];
@@ -1,6 +1,7 @@
 import { useState, useEffect, useRef } from "react";
 import { Link, useNavigate } from "react-router-dom";
 import { intelligenceCardsAPI } from "../api/intelligenceCards";
+import { subscribeToPublicChanges } from "../api/liveUpdates";
 import { ChevronLeft, ChevronRight, Check } from "lucide-react";
 import toast from "react-hot-toast";
 import axios from "../api/axios";
@@ -37,15 +38,13 @@ const Landing = () => {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [cardsData, statsData] = await Promise.all([
-          intelligenceCardsAPI.getLandingCards(8),
-          intelligenceCardsAPI.getStats(),
-        ]);
-        setCards(cardsData);
-        setStats(statsData);
+        // Stats and cards arrive in one request
+        const landing = await intelligenceCardsAPI.getLandingBundle(8);
+        setCards(landing.cards);
+        setStats(landing.stats);
 
         // Animate counters
-        animateCounters(statsData);
+        animateCounters(landing.stats);
       } catch (err) {
         console.error("Failed to fetch landing data:", err);
       } finally {
@@ -56,6 +55,17 @@ const Landing = () => {
     fetchData();
   }, []);
 
+  // Refresh the scroller when published cards change instead of polling
+  useEffect(() => {
+    return subscribeToPublicChanges(["intelligence_cards"], async () => {
+      try {
+        setCards(await intelligenceCardsAPI.getLandingCards(8));
+      } catch (err) {
+        console.error("Failed to refresh landing cards:", err);
+      }
+    });
+  }, []);
+
   const animateCounters = (data) => {
     const duration = 2000;
     const startTime = performance.now();
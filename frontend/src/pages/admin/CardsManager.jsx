@@ -28,6 +28,14 @@ import {
 } from "lucide-react";
 import "../../styles/admin-cards.css";
 
+// API dates are naive UTC; convert to the local "YYYY-MM-DDTHH:mm" format
+const toLocalInputValue = (isoDate) => {
+  const utc = isoDate.endsWith("Z") ? isoDate : `${isoDate}Z`;
+  const date = new Date(utc);
+  const offset = date.getTimezoneOffset() * 60000;
+  return new Date(date.getTime() - offset).toISOString().slice(0, 16);
+};
+
 const CardsManager = () => {
   const { user } = useAuth();
   const [cards, setCards] = useState([]);
@@ -97,6 +105,7 @@ const CardsManager = () => {
       industry: "",
       tags: [],
       status: "draft",
+      published_date: "",
     };
   }
 
@@ -169,6 +178,11 @@ const CardsManager = () => {
       industry: card.industry || "",
       tags: card.tags || [],
       status: card.status || "draft",
+      // datetime-local input expects "YYYY-MM-DDTHH:mm" in local time
+      published_date:
+        card.status === "scheduled" && card.published_date
+          ? toLocalInputValue(card.published_date)
+          : "",
     });
     setShowModal(true);
   };
@@ -255,6 +269,18 @@ const CardsManager = () => {
         analysis_url: formData.analysis_url || null,
       };
 
+      // Scheduled cards are published automatically at this time
+      if (formData.status === "scheduled") {
+        if (!formData.published_date) {
+          setError("Choose a publish time for scheduled cards");
+          setSaving(false);
+          return;
+        }
+        cleanedData.published_date = new Date(
+          formData.published_date,
+        ).toISOString();
+      }
+
       console.log("Sending card data:", cleanedData);
 
       if (editingCard) {
@@ -298,6 +324,8 @@ const CardsManager = () => {
         return "status-published";
       case "draft":
         return "status-draft";
+      case "scheduled":
+        return "status-draft";
       case "archived":
         return "status-archived";
       default:
@@ -389,6 +417,7 @@ const CardsManager = () => {
             >
               <option value="">All Status</option>
               <option value="published">Published</option>
+              <option value="scheduled">Scheduled</option>
               <option value="draft">Draft</option>
               <option value="archived">Archived</option>
             </select>
@@ -868,10 +897,23 @@ const CardsManager = () => {
                       }
                     >
                       <option value="draft">Draft</option>
+                      <option value="scheduled">Scheduled</option>
                       <option value="published">Published</option>
                       <option value="archived">Archived</option>
                     </select>
                   </div>
+                  {formData.status === "scheduled" && (
+                    <div className="form-group">
+                      <label>Publish At</label>
+                      <input
+                        type="datetime-local"
+                        value={formData.published_date}
+                        onChange={(e) =>
+                          handleFormChange("published_date", e.target.value)
+                        }
+                      />
+                    </div>
+                  )}
                   <div className="form-group">
                     <label>Display Order</label>
                     <input